@@ -1,3 +1,3 @@
-from . import keywords, papers, subscribers
+from . import keywords, llm, papers, subscribers
 
-__all__ = ["papers", "keywords", "subscribers"]
\ No newline at end of file
+__all__ = ["papers", "keywords", "subscribers", "llm"]
\ No newline at end of file
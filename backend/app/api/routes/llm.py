@@ -0,0 +1,67 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import Session, select
+
+from app.api.deps import get_db
+from app.api.schemas import LLMUsageSchema
+from app.models import LLMCall
+from app.services.llm_usage import percentile
+
+router = APIRouter(prefix="/llm", tags=["llm"])
+
+
+@router.get("/usage", response_model=List[LLMUsageSchema])
+def llm_usage(
+    *,
+    db: Session = Depends(get_db),
+    days: int = Query(30, ge=1, le=365),
+) -> List[LLMUsageSchema]:
+    """Per-day, per-model, per-prompt-layout LLM token totals and latency percentiles (UTC days, newest first)."""
+    since = datetime.utcnow() - timedelta(days=days)
+    statement = select(
+        LLMCall.created_at,
+        LLMCall.model,
+        LLMCall.prompt_layout,
+        LLMCall.cache_hit,
+        LLMCall.parse_ok,
+        LLMCall.retries,
+        LLMCall.prompt_tokens,
+        LLMCall.completion_tokens,
+        LLMCall.cached_tokens,
+        LLMCall.latency_ms,
+    ).where(LLMCall.created_at >= since)
+    groups: Dict[Tuple[str, str, Optional[str]], LLMUsageSchema] = {}
+    latencies: Dict[Tuple[str, str, Optional[str]], List[float]] = defaultdict(list)
+    rows = db.exec(statement)
+    for created_at, model, layout, cache_hit, parse_ok, retries, prompt, completion, cached, latency in rows:
+        key = (created_at.date().isoformat(), model, layout)
+        usage = groups.get(key)
+        if usage is None:
+            usage = groups[key] = LLMUsageSchema(
+                day=key[0],
+                model=model,
+                prompt_layout=layout,
+                calls=0,
+                cache_hits=0,
+                failures=0,
+                retries=0,
+                prompt_tokens=0,
+                completion_tokens=0,
+                cached_tokens=0,
+            )
+        usage.calls += 1
+        usage.cache_hits += int(cache_hit)
+        usage.failures += int(not parse_ok)
+        usage.retries += retries
+        usage.prompt_tokens += prompt
+        usage.completion_tokens += completion
+        usage.cached_tokens += cached
+        if latency is not None:
+            latencies[key].append(latency)
+    for key, usage in groups.items():
+        usage.latency_p50_ms = percentile(latencies[key], 0.5)
+        usage.latency_p95_ms = percentile(latencies[key], 0.95)
+    return sorted(groups.values(), key=lambda usage: (usage.day, usage.model, usage.prompt_layout or ""), reverse=True)
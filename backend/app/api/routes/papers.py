@@ -1,16 +1,109 @@
-from typing import List, Optional
+import base64
+import binascii
+import json
+from collections import defaultdict
+from typing import Dict, Iterable, List, Literal, Optional, Sequence, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import tuple_
 from sqlmodel import Session, select
 
 from app.api.deps import get_db
-from app.api.schemas import FindingSchema, PaperSummarySchema
-from app.models import Paper
+from app.api.schemas import FindingSchema, PaperSearchResultSchema, PaperSummarySchema
+from app.models import Finding, Paper
+from app.services.paper_search import search
+from app.services.vector_index import embed, embed_paper, get_vector_index
 
 router = APIRouter(tags=["papers"])
 
+# only what PaperSummarySchema needs, so listings never pull blob keys, paths or timestamps
+SUMMARY_COLUMNS = (
+    Paper.id,
+    Paper.arxiv_id,
+    Paper.title,
+    Paper.authors,
+    Paper.institutions,
+    Paper.published_at,
+    Paper.hf_listing_date,
+    Paper.abstract,
+    Paper.problem_summary,
+    Paper.solution_summary,
+    Paper.effect_summary,
+    Paper.keywords,
+    Paper.breakthrough_score,
+    Paper.breakthrough_label,
+    Paper.breakthrough_reason,
+)
+FINDING_COLUMNS = (
+    Finding.id,
+    Finding.paper_id,
+    Finding.claim_text,
+    Finding.experiment_design,
+    Finding.evidence_snippet,
+    Finding.metrics,
+)
 
-def serialize_paper(paper: Paper) -> PaperSummarySchema:
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(row) -> str:
+    """Opaque cursor for the page after ``row``: its (hf_listing_date, id) sort key."""
+    raw = json.dumps([row.hf_listing_date, row.id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[str], int]:
+    try:
+        listing_date, paper_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if (listing_date is not None and not isinstance(listing_date, str)) or not isinstance(paper_id, int):
+            raise ValueError(cursor)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+    return listing_date, paper_id
+
+
+def page_rows(db: Session, statement, cursor: Optional[str], size: int) -> List:
+    """Up to ``size`` rows after ``cursor`` in ``hf_listing_date DESC, id DESC`` order.
+
+    Each branch is a range seek on the listing index. Papers without a listing date sort
+    after every dated one; an OR over both would make SQLite scan from the top instead.
+    """
+    ordered = statement.order_by(Paper.hf_listing_date.desc(), Paper.id.desc())
+    if not cursor:
+        return db.exec(ordered.limit(size)).all()
+    listing_date, paper_id = decode_cursor(cursor)
+    undated = ordered.where(Paper.hf_listing_date.is_(None))
+    if listing_date is None:
+        return db.exec(undated.where(Paper.id < paper_id).limit(size)).all()
+    rows = db.exec(ordered.where(tuple_(Paper.hf_listing_date, Paper.id) < (listing_date, paper_id)).limit(size)).all()
+    if len(rows) < size:
+        rows += db.exec(undated.limit(size - len(rows))).all()
+    return rows
+
+
+def load_findings(db: Session, paper_ids: Iterable[int]) -> Dict[int, List[FindingSchema]]:
+    """Findings of several papers in one query, grouped by paper id."""
+    grouped: Dict[int, List[FindingSchema]] = defaultdict(list)
+    ids = list(paper_ids)
+    if not ids:
+        return grouped
+    statement = select(*FINDING_COLUMNS).where(Finding.paper_id.in_(ids)).order_by(Finding.paper_id, Finding.id)
+    for row in db.exec(statement):
+        grouped[row.paper_id].append(
+            FindingSchema(
+                id=row.id,
+                claim_text=row.claim_text,
+                experiment_design=row.experiment_design,
+                evidence_snippet=row.evidence_snippet,
+                metrics=row.metrics,
+            )
+        )
+    return grouped
+
+
+def serialize_paper(paper, findings: List[FindingSchema]) -> PaperSummarySchema:
+    """Build the schema from a ``Paper`` or a row of :data:`SUMMARY_COLUMNS`."""
     return PaperSummarySchema(
         id=paper.id,
         arxiv_id=paper.arxiv_id,
@@ -27,19 +120,15 @@ def serialize_paper(paper: Paper) -> PaperSummarySchema:
         breakthrough_score=paper.breakthrough_score,
         breakthrough_label=paper.breakthrough_label,
         breakthrough_reason=paper.breakthrough_reason,
-        findings=[
-            FindingSchema(
-                id=finding.id,
-                claim_text=finding.claim_text,
-                experiment_design=finding.experiment_design,
-                evidence_snippet=finding.evidence_snippet,
-                metrics=finding.metrics,
-            )
-            for finding in paper.findings
-        ],
+        findings=findings,
     )
 
 
+def serialize_papers(db: Session, rows: List) -> List[PaperSummarySchema]:
+    findings = load_findings(db, (row.id for row in rows))
+    return [serialize_paper(row, findings.get(row.id, [])) for row in rows]
+
+
 @router.get("/papers/calendar", response_model=List[str])
 def list_available_dates(db: Session = Depends(get_db)) -> List[str]:
     """获取所有有数据的日期列表 (必须在 /papers/{paper_id} 之前定义)"""
@@ -67,30 +156,115 @@ def list_available_dates(db: Session = Depends(get_db)) -> List[str]:
     return deduped
 
 
+def ranked_results(
+    db: Session, scored: Sequence[Tuple[int, float, Optional[str]]]
+) -> List[PaperSearchResultSchema]:
+    """Serialize ``(paper id, score, snippet)`` hits in order, skipping ids no longer stored."""
+    if not scored:
+        return []
+    rows = db.exec(select(*SUMMARY_COLUMNS).where(Paper.id.in_([paper_id for paper_id, _, _ in scored]))).all()
+    papers = {paper.id: paper for paper in serialize_papers(db, rows)}
+    return [
+        PaperSearchResultSchema(**papers[paper_id].model_dump(), score=score, snippet=snippet)
+        for paper_id, score, snippet in scored
+        if paper_id in papers
+    ]
+
+
+def stored_nearest(
+    db: Session, query, count: int, exclude: Sequence[int] = ()
+) -> List[Tuple[int, float]]:
+    """The ``count`` nearest papers that are still stored, best first.
+
+    The index can hold ids whose row is gone (force-updated papers, uncommitted stores), so
+    candidates are filtered before counting, fetching more until enough remain.
+    """
+    index = get_vector_index()
+    fetch = count
+    while True:
+        nearest = index.nearest(query, fetch, exclude=exclude)
+        ids = [paper_id for paper_id, _ in nearest]
+        stored = set(db.exec(select(Paper.id).where(Paper.id.in_(ids))).all()) if ids else set()
+        live = [(paper_id, score) for paper_id, score in nearest if paper_id in stored]
+        if len(live) >= count or len(nearest) < fetch:
+            return live[:count]
+        fetch *= 2
+
+
+@router.get("/papers/search", response_model=List[PaperSearchResultSchema])
+def search_papers(
+    *,
+    db: Session = Depends(get_db),
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find; in keyword mode every word must match"),
+    mode: Literal["keyword", "semantic"] = Query("keyword"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+) -> List[PaperSearchResultSchema]:
+    """Full-text search over titles, abstracts, summaries and findings, best BM25 match first.
+
+    ``mode=semantic`` instead ranks every paper by vector similarity to the query, so papers
+    sharing only some of its words are found too; those results carry no snippet.
+    """
+    if mode == "semantic":
+        nearest = stored_nearest(db, embed(q), limit + offset)[offset:]
+        return ranked_results(db, [(paper_id, score, None) for paper_id, score in nearest])
+    hits = search(db, q, limit=limit, offset=offset)
+    return ranked_results(db, [(hit.paper_id, hit.score, hit.snippet) for hit in hits])
+
+
 @router.get("/papers", response_model=List[PaperSummarySchema])
 def list_papers(
     *,
     db: Session = Depends(get_db),
+    response: Response,
     target_date: Optional[str] = Query(None, description="Filter by ingest date (YYYY-MM-DD)"),
     breakthrough_only: bool = Query(False),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
 ) -> List[PaperSummarySchema]:
-    statement = select(Paper).order_by(Paper.hf_listing_date.desc(), Paper.id.desc())
+    """One page of papers, newest listing date first.
+
+    Pages are keyset-paginated: when more papers follow, the ``X-Next-Cursor`` response
+    header holds the cursor for the next page, and every page costs the same however deep.
+    """
+    statement = select(*SUMMARY_COLUMNS)
     if target_date:
         # 标准化日期格式,只取前10个字符 YYYY-MM-DD
         normalized_date = target_date[:10] if len(target_date) >= 10 else target_date
         statement = statement.where(Paper.hf_listing_date == normalized_date)
     if breakthrough_only:
         statement = statement.where(Paper.breakthrough_label.is_(True))
-    papers = db.exec(statement.limit(limit)).all()
-    return [serialize_paper(paper) for paper in papers]
+    # one extra row tells whether another page exists
+    rows = page_rows(db, statement, cursor, limit + 1)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1])
+    return serialize_papers(db, rows)
 
 
 @router.get("/papers/{paper_id}", response_model=PaperSummarySchema)
 def get_paper(paper_id: int, db: Session = Depends(get_db)) -> PaperSummarySchema:
-    paper = db.get(Paper, paper_id)
-    if not paper:
+    row = db.exec(select(*SUMMARY_COLUMNS).where(Paper.id == paper_id)).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Paper not found")
+    [paper] = serialize_papers(db, [row])
+    return paper
+
+
+@router.get("/papers/{paper_id}/similar", response_model=List[PaperSearchResultSchema])
+def similar_papers(
+    paper_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+) -> List[PaperSearchResultSchema]:
+    """Papers closest to ``paper_id`` in the local vector index, most similar first."""
+    # the index may still hold a deleted or force-updated id; the paper row decides
+    row = db.exec(select(*SUMMARY_COLUMNS).where(Paper.id == paper_id)).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Paper not found")
-    # load findings relationship explicitly if lazy
-    _ = paper.findings  # type: ignore[attr-defined]
-    return serialize_paper(paper)
\ No newline at end of file
+    vector = get_vector_index().vector(paper_id)
+    if vector is None:
+        # not indexed yet (stored before the index existed): embed it on the fly
+        vector = embed_paper(row)
+    nearest = stored_nearest(db, vector, limit, exclude=[paper_id])
+    return ranked_results(db, [(other_id, score, None) for other_id, score in nearest])
@@ -41,6 +41,12 @@ class PaperSummarySchema(BaseModel):
     findings: List[FindingSchema] = []
 
 
+class PaperSearchResultSchema(PaperSummarySchema):
+    score: float
+    # keyword search: HTML-escaped text around the best match, hits wrapped in <mark>
+    snippet: Optional[str] = None
+
+
 class KeywordStatSchema(BaseModel):
     keyword: str
     paper_count: int
@@ -54,4 +60,19 @@ class SubscriberCreateSchema(BaseModel):
 class SubscriberResponseSchema(BaseModel):
     email: EmailStr
     verified: bool
-    created_at: datetime
\ No newline at end of file
+    created_at: datetime
+
+
+class LLMUsageSchema(BaseModel):
+    day: str
+    model: str
+    prompt_layout: Optional[str] = None
+    calls: int
+    cache_hits: int
+    failures: int
+    retries: int
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    latency_p50_ms: Optional[float] = None
+    latency_p95_ms: Optional[float] = None
@@ -1,6 +1,8 @@
 import os
 from functools import lru_cache
 from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
 
 from dotenv import load_dotenv
 
@@ -9,6 +11,27 @@ if ENV_PATH.exists():
     load_dotenv(ENV_PATH)
 
 
+def _parse_rate_limits(raw: str) -> Dict[str, float]:
+    limits: Dict[str, float] = {}
+    for item in raw.split(","):
+        host, _, rate = item.partition("=")
+        if host.strip() and rate.strip():
+            limits[host.strip().lower()] = float(rate)
+    return limits
+
+
+def _parse_llm_endpoints(raw: str, default_api_key: Optional[str]) -> List[Dict[str, Optional[str]]]:
+    # "base_url|model|API_KEY_ENV,..."; the key is read from the named variable (default: DEEPSEEK_API_KEY)
+    endpoints: List[Dict[str, Optional[str]]] = []
+    for item in raw.split(","):
+        base_url, _, rest = item.strip().partition("|")
+        model, _, key_env = rest.partition("|")
+        if base_url.strip() and model.strip():
+            api_key = os.getenv(key_env.strip()) if key_env.strip() else default_api_key
+            endpoints.append({"base_url": base_url.strip(), "model": model.strip(), "api_key": api_key})
+    return endpoints
+
+
 class Settings:
     def __init__(self) -> None:
         # Default database path: project_root/papers.db
@@ -21,6 +44,23 @@ class Settings:
             "HF_DAILY_URL", "https://huggingface.co/papers/date/"
         )
         self.request_timeout = float(os.getenv("REQUEST_TIMEOUT", "20"))
+        self.http_max_connections_per_host = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "8"))
+        self.storage_dir = Path(os.getenv("STORAGE_DIR", "storage"))
+        # On-disk cache for arXiv HTML/PDF downloads (under STORAGE_DIR/http_cache)
+        self.http_cache_enabled = os.getenv("HTTP_CACHE_ENABLED", "1") == "1"
+        self.http_cache_max_mb = int(os.getenv("HTTP_CACHE_MAX_MB", "2048"))
+        self.http_cache_ttl = float(os.getenv("HTTP_CACHE_TTL", "86400"))  # seconds before revalidating
+        # Per-worker LRU of dashboard API responses, invalidated by the ingest's data-version bump (0 = off)
+        self.response_cache_entries = int(os.getenv("RESPONSE_CACHE_ENTRIES", "512"))
+        self.response_cache_max_mb = float(os.getenv("RESPONSE_CACHE_MAX_MB", "64"))  # body bytes per worker
+        # Hashed bag-of-words paper vectors (STORAGE_DIR/vectors) for similar papers and semantic search
+        self.vector_index_enabled = os.getenv("VECTOR_INDEX_ENABLED", "1") == "1"
+        self.vector_dim = int(os.getenv("VECTOR_DIM", "1024"))
+        # PDF fallback: text extraction runs in a process pool, capped in seconds (and optionally pages)
+        # per paper; PDF_MAX_PAGES=0 extracts every page
+        self.pdf_workers = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self.pdf_max_pages = int(os.getenv("PDF_MAX_PAGES", "0"))
+        self.pdf_extract_timeout = float(os.getenv("PDF_EXTRACT_TIMEOUT", "60"))
         self.user_agent = os.getenv(
             "REQUEST_USER_AGENT",
             "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0 Safari/537.36",
@@ -28,6 +68,61 @@ class Settings:
         self.deepseek_api_key = os.getenv("DEEPSEEK_API_KEY")
         self.deepseek_model = os.getenv("DEEPSEEK_MODEL", "deepseek-chat")
         self.deepseek_base_url = os.getenv("DEEPSEEK_BASE_URL", "https://api.deepseek.com")
+        # Async LLM client: parallel requests plus local requests/tokens-per-minute budgets (0 = unlimited)
+        self.llm_max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+        self.llm_requests_per_minute = float(os.getenv("LLM_RPM", "120"))
+        self.llm_tokens_per_minute = float(os.getenv("LLM_TPM", "0"))
+        self.llm_request_timeout = float(os.getenv("LLM_REQUEST_TIMEOUT", "180"))
+        # OpenAI-compatible fallbacks behind DeepSeek ("base_url|model|API_KEY_ENV,..."). A request still
+        # unanswered after the primary's p95 latency (LLM_HEDGE_DELAY until enough samples, never less
+        # than LLM_HEDGE_MIN_DELAY) is also sent to the next endpoint and the first valid answer wins; LLM_BREAKER_FAILURES consecutive errors
+        # take an endpoint out of rotation for LLM_BREAKER_COOLDOWN seconds
+        self.llm_endpoints = _parse_llm_endpoints(os.getenv("LLM_ENDPOINTS", ""), self.deepseek_api_key)
+        self.llm_hedge_enabled = os.getenv("LLM_HEDGE", "1") == "1"
+        self.llm_hedge_delay = float(os.getenv("LLM_HEDGE_DELAY", "60"))
+        self.llm_hedge_min_delay = float(os.getenv("LLM_HEDGE_MIN_DELAY", "10"))
+        self.llm_breaker_failures = int(os.getenv("LLM_BREAKER_FAILURES", "3"))
+        self.llm_breaker_cooldown = float(os.getenv("LLM_BREAKER_COOLDOWN", "60"))
+        # Offline batch analysis (daily_ingest --llm-batch) against an OpenAI-compatible batch API
+        self.llm_batch_base_url = os.getenv("LLM_BATCH_BASE_URL", self.deepseek_base_url)
+        self.llm_batch_api_key = os.getenv("LLM_BATCH_API_KEY", self.deepseek_api_key)
+        self.llm_batch_model = os.getenv("LLM_BATCH_MODEL", self.deepseek_model)
+        self.llm_batch_poll_interval = float(os.getenv("LLM_BATCH_POLL_INTERVAL", "30"))
+        self.llm_batch_timeout = float(os.getenv("LLM_BATCH_TIMEOUT", str(24 * 3600)))
+        # Durable cache of raw DeepSeek responses (STORAGE_DIR/llm_cache.sqlite)
+        self.llm_cache_enabled = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+        self.llm_cache_max_mb = int(os.getenv("LLM_CACHE_MAX_MB", "256"))
+        self.llm_cache_ttl = float(os.getenv("LLM_CACHE_TTL", str(30 * 86400)))  # seconds
+        # Estimated tokens of paper text (sections) packed into each analysis prompt
+        self.llm_prompt_token_budget = int(os.getenv("LLM_PROMPT_TOKEN_BUDGET", "6000"))
+        # "legacy" keeps the original paper-first prompt; "prefix" (opt-in) puts the static task
+        # instructions first so providers can reuse their prefix cache. Switching changes every
+        # prompt, so cached LLM answers are not reused across layouts
+        self.llm_prompt_layout = os.getenv("LLM_PROMPT_LAYOUT", "legacy").strip().lower()
+        # Stream JSON-mode answers and validate them field by field; invalid fields get a short
+        # repair request and valid ones are kept instead of falling back to the heuristic analysis
+        self.llm_structured_output = os.getenv("LLM_STRUCTURED_OUTPUT", "0") == "1"
+        # Map-reduce for papers whose sections exceed LLM_PROMPT_TOKEN_BUDGET: chunks of about
+        # LLM_MAP_CHUNK_TOKENS are analysed in parallel (at most LLM_MAP_MAX_CHUNKS), then merged
+        self.llm_map_reduce = os.getenv("LLM_MAP_REDUCE", "0") == "1"
+        self.llm_map_chunk_tokens = int(os.getenv("LLM_MAP_CHUNK_TOKENS", "4000"))
+        self.llm_map_max_chunks = int(os.getenv("LLM_MAP_MAX_CHUNKS", "8"))
+        # Optional triage (daily_ingest --triage): only papers scoring >= TRIAGE_CUTOFF, at most
+        # TRIAGE_TOP_K per run (0 = no cap), get the full-section prompt; the rest an abstract-only one
+        self.triage_enabled = os.getenv("TRIAGE_ENABLED", "0") == "1"
+        self.triage_cutoff = float(os.getenv("TRIAGE_CUTOFF", "0.5"))
+        self.triage_top_k = int(os.getenv("TRIAGE_TOP_K", "0"))
+        # Requests per second per host, e.g. "export.arxiv.org=0.34,arxiv.org=4"; unlisted hosts are unthrottled
+        deepseek_host = urlsplit(self.deepseek_base_url).hostname or "api.deepseek.com"
+        self.rate_limits = _parse_rate_limits(
+            os.getenv(
+                "RATE_LIMITS",
+                f"export.arxiv.org=0.34,arxiv.org=4,huggingface.co=2,{deepseek_host}=10",
+            )
+        )
+        self.retry_max_attempts = int(os.getenv("RETRY_MAX_ATTEMPTS", "4"))
+        self.retry_base_delay = float(os.getenv("RETRY_BASE_DELAY", "1"))
+        self.retry_max_delay = float(os.getenv("RETRY_MAX_DELAY", "60"))
         self.breakthrough_threshold = float(os.getenv("BREAKTHROUGH_THRESHOLD", "0.7"))
         self.tracked_institutions = {
             item.strip().lower()
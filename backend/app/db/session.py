@@ -1,6 +1,9 @@
+import threading
 from contextlib import contextmanager
 from typing import Generator
 
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError
 from sqlmodel import Session, SQLModel, create_engine
 
 from app.core.config import settings
@@ -13,9 +16,75 @@ engine = create_engine(
     else {},
 )
 
+# SQLite allows a single writer; threads that write (ingest pipeline, journal) share this lock
+write_lock = threading.Lock()
+
+
+def _already_applied(exc: OperationalError) -> bool:
+    # every API worker runs init_db() at startup; another one may have made the same change
+    # between our check and our statement
+    message = str(exc.orig).lower()
+    return "duplicate column name" in message or "already exists" in message
+
+
+def _create_tables() -> None:
+    try:
+        SQLModel.metadata.create_all(engine)
+    except OperationalError as exc:
+        if not _already_applied(exc):
+            raise
+        SQLModel.metadata.create_all(engine)
+
+
+def _add_missing_columns() -> None:
+    # create_all() never alters existing tables; add new nullable columns so older databases keep working
+    inspector = inspect(engine)
+    for table in SQLModel.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            try:
+                with engine.begin() as connection:
+                    connection.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'))
+            except OperationalError as exc:
+                # re-inspect rather than trust the error text alone
+                added = {info["name"] for info in inspect(engine).get_columns(table.name)}
+                if not _already_applied(exc) or column.name not in added:
+                    raise
+
+
+def _add_missing_indexes() -> None:
+    # likewise create_all() only builds indexes together with new tables
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                with engine.begin() as connection:
+                    index.create(bind=connection, checkfirst=True)
+            except OperationalError as exc:
+                if not _already_applied(exc):
+                    raise
+
+
+def _create_search_table() -> None:
+    # the FTS5 index is a virtual table outside the SQLModel metadata; fill it with scripts/build_search_index.py
+    if engine.dialect.name != "sqlite":
+        return
+    from app.services.paper_search import create_search_table  # app.services imports this module
+
+    with engine.begin() as connection:
+        create_search_table(connection)
+
 
 def init_db() -> None:
-    SQLModel.metadata.create_all(engine)
+    """Create and migrate the schema; safe to run from several processes at once."""
+    _create_tables()
+    _add_missing_columns()
+    _add_missing_indexes()
+    _create_search_table()
 
 
 @contextmanager
@@ -5,18 +5,22 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
 
-from app.api.routes import keywords, papers, subscribers
+from app.api.routes import keywords, llm, papers, subscribers
 from app.db.session import init_db
 from app.scheduler import start_scheduler, stop_scheduler
+from app.services.response_cache import ResponseCacheMiddleware
 
 app = FastAPI(title="Daily Paper Insights API", version="0.1.0")
 
+# added first so CORS wraps it and also decorates cached and 304 responses
+app.add_middleware(ResponseCacheMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 
@@ -39,6 +43,7 @@ def health_check() -> dict[str, str]:
 app.include_router(papers.router, prefix="/api")
 app.include_router(keywords.router, prefix="/api")
 app.include_router(subscribers.router, prefix="/api")
+app.include_router(llm.router, prefix="/api")
 
 frontend_path = Path(__file__).resolve().parents[2] / "frontend"
 if frontend_path.exists():
@@ -1,3 +1,3 @@
-from .entities import Finding, KeywordStat, Paper, Subscriber
+from .entities import DataVersion, Finding, IngestCheckpoint, IngestRun, KeywordStat, LLMCall, Paper, Subscriber
 
-__all__ = ["Paper", "Finding", "KeywordStat", "Subscriber"]
\ No newline at end of file
+__all__ = ["Paper", "Finding", "KeywordStat", "Subscriber", "IngestRun", "IngestCheckpoint", "LLMCall", "DataVersion"]
@@ -10,7 +10,7 @@
 from sqlmodel import SQLModel, Session, create_engine, select
 from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import Column, JSON
+from sqlalchemy import Column, Index, JSON, UniqueConstraint
 from sqlmodel import Field, Relationship
 # # from sqlalchemy.orm import Mapped
 # from datetime import datetime
@@ -24,6 +24,8 @@ from sqlmodel import Field, Relationship
 
 class Paper(SQLModel, table=True):
     __tablename__ = "paper"
+    # matches the /api/papers ordering, so keyset pages are index range scans
+    __table_args__ = (Index("ix_paper_listing_order", "hf_listing_date", "id"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     arxiv_id: str = Field(index=True, unique=True)
@@ -34,7 +36,8 @@ class Paper(SQLModel, table=True):
     source_url: Optional[str] = None
     published_at: Optional[datetime] = Field(default=None, index=True)
     hf_listing_date: Optional[str] = Field(default=None, index=True)
-    html_source: Optional[str] = None
+    # raw HTML lives in the compressed blob store (app.services.blob_store), not in this table
+    html_blob_key: Optional[str] = None
     pdf_source_path: Optional[str] = None
     problem_summary: Optional[str] = None
     solution_summary: Optional[str] = None
@@ -81,4 +84,66 @@ class Subscriber(SQLModel, table=True):
     email: str = Field(index=True, unique=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     verified: bool = Field(default=False, index=True)
-    verify_token: Optional[str] = Field(default=None, index=True)
\ No newline at end of file
+    verify_token: Optional[str] = Field(default=None, index=True)
+
+
+class IngestRun(SQLModel, table=True):
+    __tablename__ = "ingestrun"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    listing_date: str = Field(index=True)
+    status: str = Field(default="running", index=True)  # running / completed / partial
+    started_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+    finished_at: Optional[datetime] = None
+
+
+class IngestCheckpoint(SQLModel, table=True):
+    """Per-paper stage journal so an interrupted run can resume without redoing work."""
+
+    __tablename__ = "ingestcheckpoint"
+    __table_args__ = (UniqueConstraint("run_id", "arxiv_id"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    run_id: int = Field(foreign_key="ingestrun.id", index=True)
+    arxiv_id: str = Field(index=True)
+    stage: str  # pending / fetched / analyzed / stored
+    paper_payload: Optional[dict] = Field(default=None, sa_column=Column(JSON, nullable=True))
+    analysis_payload: Optional[dict] = Field(default=None, sa_column=Column(JSON, nullable=True))
+    error: Optional[str] = None
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
+class LLMCall(SQLModel, table=True):
+    """Token usage, latency and outcome of one LLM analysis, keyed by arXiv id so it survives re-ingests."""
+
+    __tablename__ = "llmcall"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    arxiv_id: str = Field(index=True)
+    model: str
+    llm_version: Optional[str] = None
+    mode: str = Field(default="sync")  # sync / async / batch
+    tier: Optional[str] = Field(default="full")  # triage tier: full / lite
+    step: Optional[str] = Field(default="single")  # single / map / reduce / repair
+    prompt_layout: Optional[str] = None  # prefix / legacy
+    endpoint: Optional[str] = None  # host/model that answered
+    hedged: Optional[bool] = Field(default=False)  # a hedge request was sent to a second endpoint
+    prompt_tokens: int = Field(default=0)
+    completion_tokens: int = Field(default=0)
+    cached_tokens: int = Field(default=0)
+    latency_ms: Optional[float] = None
+    retries: int = Field(default=0)
+    cache_hit: bool = Field(default=False)
+    parse_ok: bool = Field(default=False)
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False, index=True)
+
+
+class DataVersion(SQLModel, table=True):
+    """Single-row counter bumped in every transaction that changes what the read API serves."""
+
+    __tablename__ = "dataversion"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    version: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
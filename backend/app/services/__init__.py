@@ -1,13 +1,16 @@
-from .arxiv_fetcher import ArxivFetcher, fetch_arxiv_paper
-from .hf_client import fetch_daily_identifiers
+from .arxiv_fetcher import ArxivFetcher, AsyncArxivFetcher, fetch_arxiv_paper
+from .hf_client import fetch_daily_identifiers, fetch_daily_identifiers_async
 from .llm_client import analyze_paper_with_llm
-from .types import ArxivPaper, FindingSummary, LLMAnalysis, Metric, Section
+from .types import ArxivDownload, ArxivPaper, FindingSummary, LLMAnalysis, Metric, Section
 
 __all__ = [
     "ArxivFetcher",
+    "AsyncArxivFetcher",
     "fetch_arxiv_paper",
     "fetch_daily_identifiers",
+    "fetch_daily_identifiers_async",
     "analyze_paper_with_llm",
+    "ArxivDownload",
     "ArxivPaper",
     "FindingSummary",
     "LLMAnalysis",
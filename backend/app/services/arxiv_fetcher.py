@@ -1,52 +1,66 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
+import tempfile
 from datetime import datetime
-from typing import List, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import feedparser
 import httpx
-import fitz
-from selectolax.parser import HTMLParser
-from tenacity import retry, stop_after_attempt, wait_fixed
 
 from app.core.config import settings
-from app.services.types import ArxivPaper, Section
+from app.services.async_http import AsyncHttpPool
+from app.services.html_extractor import HtmlExtraction, extract_arxiv_html
+from app.services.http_cache import (
+    BodyWriter,
+    HttpCache,
+    astream_to_file,
+    file_response,
+    get_http_cache,
+    stream_to_file,
+)
+from app.services.pdf_extractor import PdfExtractor, get_pdf_extractor
+from app.services.rate_limit import acall_with_retry, call_with_retry, get_rate_limiter
+from app.services.types import ArxivDownload, ArxivPaper, Section
 
 ARXIV_ABS_API = "https://export.arxiv.org/api/query?search_query=id:{}&max_results=1"
+ARXIV_ID_LIST_API = "https://export.arxiv.org/api/query?id_list={}&max_results={}"
 ARXIV_HTML_URL = "https://arxiv.org/html/{}"
 ARXIV_PDF_URL = "https://arxiv.org/pdf/{}"
+# id_list queries are capped well below arXiv's page limit; pacing between calls comes from
+# the export.arxiv.org budget in settings.rate_limits
+METADATA_BATCH_SIZE = 100
+# PDFs are streamed here when the HTTP cache is disabled (otherwise straight into the cache)
+PDF_TEMP_DIR = Path(tempfile.gettempdir())
+
+ENTRY_ID_PATTERN = re.compile(r"abs/(?P<identifier>.+?)(?:v\d+)?$")
+
+# title, authors, summary, published, categories
+ArxivMetadata = Tuple[str, List[str], str, Optional[datetime], List[str]]
 
 
 class ArxivFetchError(Exception):
     pass
 
 
-class ArxivFetcher:
-    def __init__(self) -> None:
-        self.client = httpx.Client(
-            timeout=settings.request_timeout,
-            headers={"User-Agent": settings.user_agent},
-            # proxy 参数留空，让 httpx 自动读取系统环境变量 HTTP_PROXY/HTTPS_PROXY
-        )
-        self.logger = logging.getLogger("arxiv_fetcher")
+class ArxivParser:
+    """Network-free half of the fetchers: URLs and Atom/HTML/PDF parsing shared by sync and async clients.
 
-    def close(self) -> None:
-        self.client.close()
+    Subclasses only add transport: how a URL is sent (with retries and the HTTP cache).
+    """
 
-    @retry(wait=wait_fixed(2), stop=stop_after_attempt(3))
-    def _get(self, url: str) -> httpx.Response:
-        response = self.client.get(url)
-        response.raise_for_status()
-        return response
+    cache: Optional[HttpCache] = None
 
-    def fetch_metadata(self, arxiv_id: str) -> tuple[str, List[str], str, Optional[datetime], List[str]]:
-        response = self._get(ARXIV_ABS_API.format(arxiv_id))
-        feed = feedparser.parse(response.text)
-        if not feed.entries:
-            raise ArxivFetchError(f"No metadata found for {arxiv_id}")
-        entry = feed.entries[0]
+    def __init__(self, pdf_extractor: Optional[PdfExtractor] = None) -> None:
+        self.logger = logging.getLogger("arxiv_fetcher")
+        self.pdf_extractor = pdf_extractor or get_pdf_extractor()
+
+    @staticmethod
+    def _parse_entry(entry) -> ArxivMetadata:
         title = entry.title.strip()
         authors = [author.name.strip() for author in entry.authors]
         summary = entry.summary.strip()
@@ -56,9 +70,36 @@ class ArxivFetcher:
             published = datetime(*entry.published_parsed[:6])
         return title, authors, summary, published, categories
 
-    def fetch_html(self, arxiv_id: str) -> Optional[str]:
+    def _parse_single_feed(self, arxiv_id: str, text: str) -> ArxivMetadata:
+        feed = feedparser.parse(text)
+        if not feed.entries:
+            raise ArxivFetchError(f"No metadata found for {arxiv_id}")
+        return self._parse_entry(feed.entries[0])
+
+    @staticmethod
+    def _metadata_batches(arxiv_ids: Iterable[str]) -> Tuple[int, List[Tuple[List[str], str]]]:
+        """Deduplicated identifiers split into ``id_list`` queries: (total, [(chunk, url), ...])."""
+        pending = list(dict.fromkeys(arxiv_ids))
+        chunks = [pending[start : start + METADATA_BATCH_SIZE] for start in range(0, len(pending), METADATA_BATCH_SIZE)]
+        return len(pending), [(chunk, ARXIV_ID_LIST_API.format(",".join(chunk), len(chunk))) for chunk in chunks]
+
+    def _merge_batch(self, results: Dict[str, ArxivMetadata], chunk: List[str], text: str, total: int) -> None:
+        results.update(self._parse_batch_feed(chunk, text))
+        self.logger.info("Batched metadata for %d/%d identifiers", len(results), total)
+
+    def _parse_batch_feed(self, chunk: List[str], text: str) -> Dict[str, ArxivMetadata]:
+        feed = feedparser.parse(text)
+        wanted = set(chunk)
+        results: Dict[str, ArxivMetadata] = {}
+        for entry in feed.entries:
+            match = ENTRY_ID_PATTERN.search(getattr(entry, "id", ""))
+            if not match or match.group("identifier") not in wanted:
+                continue  # arXiv reports unknown ids as an "Error" entry
+            results[match.group("identifier")] = self._parse_entry(entry)
+        return results
+
+    def _html_or_none(self, arxiv_id: str, response: httpx.Response) -> Optional[str]:
         url = ARXIV_HTML_URL.format(arxiv_id)
-        response = self.client.get(url)
         if response.status_code == 200 and "<html" in response.text.lower():
             self.logger.info("Loaded HTML for %s (%s)", arxiv_id, url)
             self.logger.debug(
@@ -70,15 +111,52 @@ class ArxivFetcher:
         self.logger.warning("HTML unavailable for %s (%s) status=%s", arxiv_id, url, response.status_code)
         return None
 
-    def fetch_pdf_text(self, arxiv_id: str) -> str:
-        url = ARXIV_PDF_URL.format(arxiv_id)
-        response = self._get(url)
-        doc = fitz.open(stream=response.content, filetype="pdf")
-        text = "\n".join(page.get_text("text") for page in doc)
-        doc.close()
+    @staticmethod
+    def _temp_pdf_response(url: str, response: httpx.Response, writer: Optional[BodyWriter]) -> httpx.Response:
+        # without the HTTP cache the streamed PDF stays in a temp file the caller deletes
+        if writer is None:
+            return response
+        writer.finish()
+        return file_response(url, writer.path, response.headers)
+
+    @staticmethod
+    def _download(
+        arxiv_id: str, metadata: ArxivMetadata, html: Optional[str], pdf: Tuple[Optional[Path], bool]
+    ) -> ArxivDownload:
+        title, authors, summary, published, categories = metadata
+        pdf_path, pdf_temporary = pdf
+        return ArxivDownload(
+            arxiv_id=arxiv_id,
+            title=title,
+            authors=authors,
+            abstract=summary,
+            published_at=published,
+            categories=categories,
+            html=html,
+            pdf_path=pdf_path,
+            pdf_temporary=pdf_temporary,
+        )
+
+    def release_pdf(self, pdf_path: Path, temporary: bool) -> None:
+        """Done with a downloaded PDF: delete the temp file, or unpin the cached object."""
+        if temporary:
+            pdf_path.unlink(missing_ok=True)
+        elif self.cache is not None:
+            self.cache.release(pdf_path)
+
+    def extract_pdf_text(self, arxiv_id: str, pdf_path: Path) -> str:
+        result = self.pdf_extractor.extract(pdf_path)
+        text = result.text
         if not text.strip():
             raise ArxivFetchError(f"Unable to extract text from PDF {arxiv_id}")
-        self.logger.info("Extracted PDF text for %s (%s)", arxiv_id, url)
+        self.logger.info(
+            "Extracted PDF text for %s (%s): %d/%d pages%s",
+            arxiv_id,
+            ARXIV_PDF_URL.format(arxiv_id),
+            result.pages,
+            result.total_pages,
+            " (timed out)" if result.timed_out else "",
+        )
         self.logger.debug(
             "PDF text preview for %s: %s",
             arxiv_id,
@@ -88,72 +166,206 @@ class ArxivFetcher:
 
     @staticmethod
     def parse_sections_from_html(html: str) -> List[Section]:
-        parser = HTMLParser(html)
-        sections: List[Section] = []
-        # arXiv HTML uses div.ltx_section containing headings and paragraphs
-        for section in parser.css("div.ltx_section"):
-            heading_node = section.css_first("h2, h3, h4, h5, h6")
-            heading = heading_node.text(strip=True) if heading_node else ""
-            paragraphs = [p.text(strip=True) for p in section.css("p") if p.text(strip=True)]
-            content = "\n".join(paragraphs)
-            if heading or content:
-                sections.append(Section(heading=heading, content=content))
-        if not sections:
-            # fallback: grab paragraphs in body
-            paragraphs = [p.text(strip=True) for p in parser.css("p") if p.text(strip=True)]
-            if paragraphs:
-                sections.append(Section(heading="Body", content="\n".join(paragraphs)))
-        return sections
+        return extract_arxiv_html(html).sections
 
     def extract_institutions(self, html: Optional[str], authors: List[str]) -> List[str]:
         if not html:
             return []
-        parser = HTMLParser(html)
-        institutions: List[str] = []
-        for node in parser.css("span.ltx_role_affiliation, span.ltx_affiliation"):  # best-effort match
-            text = node.text(strip=True)
-            if text:
-                institutions.append(text)
-        if institutions:
-            return sorted(set(institutions))
-        # fallback heuristic: search for parentheses after author names
-        raw_text = parser.text(separator="\n")
-        pattern = re.compile(r"\(([^)]+University[^)]*)\)")
-        guesses = pattern.findall(raw_text)
-        return sorted(set(guesses)) if guesses else []
+        return extract_arxiv_html(html).institutions
 
-    def fetch(self, arxiv_id: str) -> ArxivPaper:
-        title, authors, summary, published, categories = self.fetch_metadata(arxiv_id)
-        html = self.fetch_html(arxiv_id)
-        sections: List[Section]
+    def parse(self, download: ArxivDownload) -> ArxivPaper:
+        """CPU half of :meth:`fetch`: section/institution extraction, no network access."""
+        arxiv_id = download.arxiv_id
+        html = download.html
         raw_text: Optional[str] = None
         if html:
-            sections = self.parse_sections_from_html(html)
+            extraction = extract_arxiv_html(html)
             source = ARXIV_HTML_URL.format(arxiv_id)
+        elif download.pdf_path is None:
+            raise ArxivFetchError(f"No HTML or PDF downloaded for {arxiv_id}")
         else:
-            raw_text = self.fetch_pdf_text(arxiv_id)
-            sections = [Section(heading="Extracted", content=raw_text)]
+            try:
+                raw_text = self.extract_pdf_text(arxiv_id, download.pdf_path)
+            finally:
+                self.release_pdf(download.pdf_path, download.pdf_temporary)
+            extraction = HtmlExtraction(sections=[Section(heading="Extracted", content=raw_text)])
             source = ARXIV_PDF_URL.format(arxiv_id)
 
-        institutions = self.extract_institutions(html, authors) if html else []
         return ArxivPaper(
             arxiv_id=arxiv_id,
-            title=title,
-            authors=authors,
-            institutions=institutions,
-            abstract=summary,
-            published_at=published,
-            categories=categories,
-            sections=sections,
+            title=download.title,
+            authors=download.authors,
+            institutions=extraction.institutions,
+            abstract=download.abstract,
+            published_at=download.published_at,
+            categories=download.categories,
+            sections=extraction.sections,
             raw_html=html,
             raw_text=raw_text,
             source=source,
+            table_captions=extraction.table_captions,
+            bibliography=extraction.bibliography,
         )
 
 
+class ArxivFetcher(ArxivParser):
+    def __init__(self, cache: Optional[HttpCache] = None, pdf_extractor: Optional[PdfExtractor] = None) -> None:
+        super().__init__(pdf_extractor)
+        self.cache = cache if cache is not None else get_http_cache()
+        self.client = httpx.Client(
+            timeout=settings.request_timeout,
+            headers={"User-Agent": settings.user_agent},
+            event_hooks={"request": [get_rate_limiter().throttle_request]},
+            # proxy 参数留空，让 httpx 自动读取系统环境变量 HTTP_PROXY/HTTPS_PROXY
+        )
+
+    def close(self) -> None:
+        self.client.close()
+
+    def _fetch(self, url: str, cached: bool = False) -> httpx.Response:
+        def send() -> httpx.Response:
+            if cached and self.cache:
+                return self.cache.get(self.client, url)
+            return self.client.get(url)
+
+        return call_with_retry(send, url)
+
+    def _get(self, url: str, cached: bool = False) -> httpx.Response:
+        response = self._fetch(url, cached=cached)
+        response.raise_for_status()
+        return response
+
+    def fetch_metadata(self, arxiv_id: str) -> ArxivMetadata:
+        response = self._get(ARXIV_ABS_API.format(arxiv_id))
+        return self._parse_single_feed(arxiv_id, response.text)
+
+    def fetch_metadata_batch(self, arxiv_ids: Iterable[str]) -> Dict[str, ArxivMetadata]:
+        """Resolve many identifiers with ``id_list`` queries (one request per 100 papers).
+
+        Identifiers arXiv does not return are simply absent from the result, so callers can
+        fall back to :meth:`fetch_metadata` for them.
+        """
+        total, batches = self._metadata_batches(arxiv_ids)
+        results: Dict[str, ArxivMetadata] = {}
+        for chunk, url in batches:
+            self._merge_batch(results, chunk, self._get(url).text, total)
+        return results
+
+    def fetch_html(self, arxiv_id: str) -> Optional[str]:
+        return self._html_or_none(arxiv_id, self._fetch(ARXIV_HTML_URL.format(arxiv_id), cached=True))
+
+    def fetch_pdf_file(self, arxiv_id: str) -> Tuple[Path, bool]:
+        """Stream the PDF to disk; returns (path, is_temporary).
+
+        With the HTTP cache enabled the path is the cached object itself, pinned against
+        eviction, otherwise a temp file; either way the caller passes it to :meth:`release_pdf`.
+        """
+        url = ARXIV_PDF_URL.format(arxiv_id)
+
+        def send() -> httpx.Response:
+            if self.cache:
+                return self.cache.get_file(self.client, url)
+            return self._temp_pdf_response(url, *stream_to_file(self.client, url, PDF_TEMP_DIR))
+
+        response = call_with_retry(send, url)
+        response.raise_for_status()
+        return response.extensions["path"], self.cache is None
+
+    def fetch_pdf_text(self, arxiv_id: str) -> str:
+        path, temporary = self.fetch_pdf_file(arxiv_id)
+        try:
+            return self.extract_pdf_text(arxiv_id, path)
+        finally:
+            self.release_pdf(path, temporary)
+
+    def download(self, arxiv_id: str, metadata: Optional[ArxivMetadata] = None) -> ArxivDownload:
+        """Network half of :meth:`fetch`: metadata plus HTML, or the PDF when HTML is missing.
+
+        ``metadata`` can come from :meth:`fetch_metadata_batch` to skip the per-paper API call.
+        """
+        metadata = metadata or self.fetch_metadata(arxiv_id)
+        html = self.fetch_html(arxiv_id)
+        return self._download(arxiv_id, metadata, html, (None, False) if html else self.fetch_pdf_file(arxiv_id))
+
+    def fetch(self, arxiv_id: str) -> ArxivPaper:
+        return self.parse(self.download(arxiv_id))
+
+
+class AsyncArxivFetcher(ArxivParser):
+    """Async counterpart of :class:`ArxivFetcher` on a shared, long-lived :class:`AsyncHttpPool`."""
+
+    def __init__(
+        self,
+        pool: Optional[AsyncHttpPool] = None,
+        cache: Optional[HttpCache] = None,
+        pdf_extractor: Optional[PdfExtractor] = None,
+    ) -> None:
+        super().__init__(pdf_extractor)
+        self.cache = cache if cache is not None else get_http_cache()
+        self._owns_pool = pool is None
+        self.pool = pool or AsyncHttpPool()
+
+    async def aclose(self) -> None:
+        if self._owns_pool:
+            await self.pool.aclose()
+
+    async def _fetch(self, url: str, cached: bool = False) -> httpx.Response:
+        async def send() -> httpx.Response:
+            if cached and self.cache:
+                return await self.cache.aget(self.pool, url)
+            return await self.pool.get(url)
+
+        return await acall_with_retry(send, url)
+
+    async def _get(self, url: str, cached: bool = False) -> httpx.Response:
+        response = await self._fetch(url, cached=cached)
+        response.raise_for_status()
+        return response
+
+    async def fetch_metadata(self, arxiv_id: str) -> ArxivMetadata:
+        response = await self._get(ARXIV_ABS_API.format(arxiv_id))
+        return self._parse_single_feed(arxiv_id, response.text)
+
+    async def fetch_metadata_batch(self, arxiv_ids: Iterable[str]) -> Dict[str, ArxivMetadata]:
+        total, batches = self._metadata_batches(arxiv_ids)
+        results: Dict[str, ArxivMetadata] = {}
+        for chunk, url in batches:
+            self._merge_batch(results, chunk, (await self._get(url)).text, total)
+        return results
+
+    async def fetch_html(self, arxiv_id: str) -> Optional[str]:
+        response = await self._fetch(ARXIV_HTML_URL.format(arxiv_id), cached=True)
+        return self._html_or_none(arxiv_id, response)
+
+    async def fetch_pdf_file(self, arxiv_id: str) -> Tuple[Path, bool]:
+        url = ARXIV_PDF_URL.format(arxiv_id)
+
+        async def send() -> httpx.Response:
+            if self.cache:
+                return await self.cache.aget_file(self.pool, url)
+            return self._temp_pdf_response(url, *(await astream_to_file(self.pool, url, PDF_TEMP_DIR)))
+
+        response = await acall_with_retry(send, url)
+        response.raise_for_status()
+        return response.extensions["path"], self.cache is None
+
+    async def download(self, arxiv_id: str, metadata: Optional[ArxivMetadata] = None) -> ArxivDownload:
+        """Metadata and HTML are requested concurrently; the PDF only when HTML is missing."""
+        if metadata is None:
+            metadata, html = await asyncio.gather(self.fetch_metadata(arxiv_id), self.fetch_html(arxiv_id))
+        else:
+            html = await self.fetch_html(arxiv_id)
+        return self._download(arxiv_id, metadata, html, (None, False) if html else await self.fetch_pdf_file(arxiv_id))
+
+    async def fetch(self, arxiv_id: str) -> ArxivPaper:
+        return self.parse(await self.download(arxiv_id))
+
+
+@lru_cache(maxsize=1)
+def _shared_fetcher() -> ArxivFetcher:
+    return ArxivFetcher()
+
+
 def fetch_arxiv_paper(arxiv_id: str) -> ArxivPaper:
-    fetcher = ArxivFetcher()
-    try:
-        return fetcher.fetch(arxiv_id)
-    finally:
-        fetcher.close()
\ No newline at end of file
+    # reuse one fetcher so repeated calls share a connection pool
+    return _shared_fetcher().fetch(arxiv_id)
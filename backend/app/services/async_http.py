@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import threading
+from typing import Any, AsyncContextManager, Coroutine, Dict, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+from app.services.rate_limit import get_rate_limiter
+
+T = TypeVar("T")
+
+# HTTP/2 needs the optional ``h2`` package (``pip install httpx[http2]``); fall back to HTTP/1.1
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+logger = logging.getLogger("async_http")
+
+
+class AsyncHttpPool:
+    """Long-lived ``httpx.AsyncClient`` per host.
+
+    One client per host gives every host its own connection limit, and reusing the
+    clients keeps TLS sessions and HTTP/2 connections warm across papers. HTTP/2 is
+    negotiated via ALPN, so hosts without it transparently stay on HTTP/1.1.
+    """
+
+    def __init__(self, max_connections_per_host: Optional[int] = None) -> None:
+        self.max_connections = max_connections_per_host or settings.http_max_connections_per_host
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        host = urlsplit(url).netloc
+        client = self._clients.get(host)
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=settings.request_timeout,
+                headers={"User-Agent": settings.user_agent},
+                follow_redirects=True,
+                http2=HTTP2_AVAILABLE,
+                event_hooks={"request": [get_rate_limiter().athrottle_request]},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                # proxy 参数留空，让 httpx 自动读取系统环境变量 HTTP_PROXY/HTTPS_PROXY
+            )
+            self._clients[host] = client
+            logger.debug("Opened async pool for %s (http2=%s)", host, HTTP2_AVAILABLE)
+        return client
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.client_for(url).get(url, **kwargs)
+
+    def stream(self, method: str, url: str, **kwargs) -> AsyncContextManager[httpx.Response]:
+        return self.client_for(url).stream(method, url, **kwargs)
+
+    async def aclose(self) -> None:
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
+
+
+class BackgroundLoop:
+    """Event loop on a daemon thread so the threaded ingest pipeline can share async clients."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="async-io", daemon=True)
+        self._thread.start()
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run ``coro`` on the background loop and block the calling thread for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def close(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
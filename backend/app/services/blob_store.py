@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger("blob_store")
+
+
+class BlobStore:
+    """Gzip-compressed text blobs on disk, addressed by the SHA-256 of their content.
+
+    Large raw sources (arXiv HTML) live here instead of in the ``paper`` table, so list
+    queries and database backups do not drag megabytes of markup along with every row.
+    """
+
+    def __init__(self, root: Path, compresslevel: int = 6) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.compresslevel = compresslevel
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.gz"
+
+    def put(self, text: str) -> str:
+        data = text.encode("utf-8")
+        key = hashlib.sha256(data).hexdigest()
+        path = self.path_for(key)
+        if path.exists():
+            return key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write-then-rename so readers never see a partial blob
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".part")
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(gzip.compress(data, compresslevel=self.compresslevel))
+        os.replace(tmp_name, path)
+        logger.debug("Stored blob %s (%d bytes raw)", key, len(data))
+        return key
+
+    def get(self, key: Optional[str]) -> Optional[str]:
+        if not key:
+            return None
+        path = self.path_for(key)
+        if not path.exists():
+            logger.warning("Blob %s is missing from %s", key, self.root)
+            return None
+        return gzip.decompress(path.read_bytes()).decode("utf-8")
+
+    def keys(self) -> Iterable[str]:
+        for path in self.root.glob("*/*.gz"):
+            yield path.name[: -len(".gz")]
+
+    def delete(self, key: str) -> None:
+        self.path_for(key).unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=1)
+def get_blob_store() -> BlobStore:
+    return BlobStore(settings.storage_dir / "blobs")
+
+
+def load_html_source(paper) -> Optional[str]:
+    """Lazily load a paper's raw arXiv HTML, which is kept out of the ``paper`` table."""
+    return get_blob_store().get(paper.html_blob_key)
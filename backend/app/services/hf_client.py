@@ -9,25 +9,23 @@ import httpx
 from selectolax.parser import HTMLParser
 
 from app.core.config import settings
+from app.services.async_http import AsyncHttpPool
+from app.services.rate_limit import acall_with_retry, call_with_retry, get_rate_limiter
 
 PAPER_HREF_PATTERN = re.compile(r"/papers/(?P<identifier>\d{4}\.\d{4,5})(?:v\d+)?")
 
 
-class HuggingFaceDailyClient:
+class HuggingFaceDailyParser:
+    """URL building and HTML parsing shared by the sync and async daily-page clients."""
+
     def __init__(self) -> None:
         self.base_url = settings.hf_daily_url.rstrip("/") + "/"
-        self.session = httpx.Client(
-            timeout=settings.request_timeout,
-            headers={"User-Agent": settings.user_agent},
-            follow_redirects=True,
-            # proxy 参数留空，让 httpx 自动读取系统环境变量 HTTP_PROXY/HTTPS_PROXY
-        )
         self.logger = logging.getLogger("hf")
 
-    def fetch_identifiers(self, target_date: date) -> List[str]:
-        url = f"{self.base_url}{target_date.isoformat()}"
-        response = self.session.get(url)
-        response.raise_for_status()
+    def _day_url(self, target_date: date) -> str:
+        return f"{self.base_url}{target_date.isoformat()}"
+
+    def _parse_identifiers(self, url: str, response: httpx.Response) -> List[str]:
         final_url = str(response.request.url)
         if final_url.rstrip("/") != url.rstrip("/"):
             self.logger.info("Hugging Face redirected %s -> %s", url, final_url)
@@ -42,24 +40,82 @@ class HuggingFaceDailyClient:
                 identifiers.append(match.group("identifier"))
         return sorted(set(identifiers))
 
+
+class HuggingFaceDailyClient(HuggingFaceDailyParser):
+    def __init__(self) -> None:
+        super().__init__()
+        self.session = httpx.Client(
+            timeout=settings.request_timeout,
+            headers={"User-Agent": settings.user_agent},
+            follow_redirects=True,
+            event_hooks={"request": [get_rate_limiter().throttle_request]},
+            # proxy 参数留空，让 httpx 自动读取系统环境变量 HTTP_PROXY/HTTPS_PROXY
+        )
+
+    def fetch_identifiers(self, target_date: date) -> List[str]:
+        url = self._day_url(target_date)
+        response = call_with_retry(lambda: self.session.get(url), url)
+        response.raise_for_status()
+        return self._parse_identifiers(url, response)
+
     def close(self) -> None:
         self.session.close()
 
 
+class AsyncHuggingFaceDailyClient(HuggingFaceDailyParser):
+    """Async variant sharing an :class:`AsyncHttpPool` (and its huggingface.co connections)."""
+
+    def __init__(self, pool: Optional[AsyncHttpPool] = None) -> None:
+        super().__init__()
+        self._owns_pool = pool is None
+        self.pool = pool or AsyncHttpPool()
+
+    async def fetch_identifiers(self, target_date: date) -> List[str]:
+        url = self._day_url(target_date)
+        response = await acall_with_retry(lambda: self.pool.get(url), url)
+        response.raise_for_status()
+        return self._parse_identifiers(url, response)
+
+    async def aclose(self) -> None:
+        if self._owns_pool:
+            await self.pool.aclose()
+
+
+def _default_date(target_date: Optional[date]) -> date:
+    return target_date or (datetime.utcnow() - timedelta(days=1)).date()
+
+
+def _handle_missing_day(client: HuggingFaceDailyParser, target_date: date, exc: httpx.HTTPStatusError) -> List[str]:
+    if exc.response.status_code == 404:
+        client.logger.warning(
+            "Hugging Face returned 404 for %s; no daily page available yet",
+            target_date.isoformat(),
+        )
+        return []
+    raise exc
+
+
 def fetch_daily_identifiers(target_date: Optional[date] = None) -> List[str]:
     client = HuggingFaceDailyClient()
     try:
-        if target_date is None:
-            target_date = (datetime.utcnow() - timedelta(days=1)).date()
+        target_date = _default_date(target_date)
         try:
             return client.fetch_identifiers(target_date)
-        except httpx.HTTPStatusError as exc:  # pragma: no cover - network dependent
-            if exc.response.status_code == 404:
-                client.logger.warning(
-                    "Hugging Face returned 404 for %s; no daily page available yet",
-                    target_date.isoformat(),
-                )
-                return []
-            raise
+        except httpx.HTTPStatusError as exc:
+            return _handle_missing_day(client, target_date, exc)
+    finally:
+        client.close()
+
+
+async def fetch_daily_identifiers_async(
+    target_date: Optional[date] = None, pool: Optional[AsyncHttpPool] = None
+) -> List[str]:
+    client = AsyncHuggingFaceDailyClient(pool)
+    try:
+        target_date = _default_date(target_date)
+        try:
+            return await client.fetch_identifiers(target_date)
+        except httpx.HTTPStatusError as exc:
+            return _handle_missing_day(client, target_date, exc)
     finally:
-        client.close()
\ No newline at end of file
+        await client.aclose()
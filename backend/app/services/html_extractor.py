@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import List
+
+from selectolax.parser import HTMLParser, Node
+
+from app.services.types import Section
+
+SECTION_SELECTOR = "div.ltx_section"
+HEADING_SELECTOR = "h2, h3, h4, h5, h6"
+AFFILIATION_SELECTOR = "span.ltx_role_affiliation, span.ltx_affiliation"
+TABLE_CAPTION_SELECTOR = "figure.ltx_table figcaption"
+BIBLIOGRAPHY_SELECTOR = "li.ltx_bibitem"
+
+UNIVERSITY_PATTERN = re.compile(r"\(([^)]+University[^)]*)\)")
+
+
+@dataclass
+class HtmlExtraction:
+    sections: List[Section] = field(default_factory=list)
+    institutions: List[str] = field(default_factory=list)
+    table_captions: List[str] = field(default_factory=list)
+    bibliography: List[str] = field(default_factory=list)
+
+
+def _texts(nodes: List[Node]) -> List[str]:
+    # one text() call per node; the old code stripped every paragraph twice
+    return [text for text in (node.text(strip=True) for node in nodes) if text]
+
+
+def _sections(parser: HTMLParser) -> List[Section]:
+    sections: List[Section] = []
+    # arXiv HTML uses div.ltx_section containing headings and paragraphs
+    for section in parser.css(SECTION_SELECTOR):
+        heading_node = section.css_first(HEADING_SELECTOR)
+        heading = heading_node.text(strip=True) if heading_node else ""
+        content = "\n".join(_texts(section.css("p")))
+        if heading or content:
+            sections.append(Section(heading=heading, content=content))
+    if not sections:
+        # fallback: grab paragraphs in body
+        paragraphs = _texts(parser.css("p"))
+        if paragraphs:
+            sections.append(Section(heading="Body", content="\n".join(paragraphs)))
+    return sections
+
+
+def _institutions(parser: HTMLParser) -> List[str]:
+    institutions = _texts(parser.css(AFFILIATION_SELECTOR))  # best-effort match
+    if institutions:
+        return sorted(set(institutions))
+    # fallback heuristic: search for parentheses after author names; pages without an author
+    # block put them anywhere, so the whole document is searched
+    return sorted(set(UNIVERSITY_PATTERN.findall(parser.text(separator="\n"))))
+
+
+def extract_arxiv_html(html: str) -> HtmlExtraction:
+    """Parse an arXiv HTML page once and pull everything the pipeline needs from that tree.
+
+    Sections and affiliations previously each paid for their own ``HTMLParser`` over the same
+    multi-megabyte document; table captions and bibliography entries reuse that tree too.
+    """
+    parser = HTMLParser(html)
+    return HtmlExtraction(
+        sections=_sections(parser),
+        institutions=_institutions(parser),
+        table_captions=_texts(parser.css(TABLE_CAPTION_SELECTOR)),
+        # an entry is many spans; collapse the whitespace between them into single spaces
+        bibliography=[
+            text
+            for text in (" ".join(node.text(separator=" ").split()) for node in parser.css(BIBLIOGRAPHY_SELECTOR))
+            if text
+        ],
+    )
@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger("http_cache")
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    digest: str
+    size: int
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_type: Optional[str]
+    fetched_at: float
+    last_access: float
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0  # served without touching the network (within TTL)
+    revalidated: int = 0  # 304 Not Modified, body served from disk
+    misses: int = 0
+    evictions: int = 0
+    bytes_served: int = 0
+    bytes_downloaded: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.revalidated + self.misses
+        return (self.hits + self.revalidated) / total if total else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"hits={self.hits} revalidated={self.revalidated} misses={self.misses} "
+            f"hit_rate={self.hit_rate:.0%} served={self.bytes_served / 1e6:.1f}MB "
+            f"downloaded={self.bytes_downloaded / 1e6:.1f}MB evictions={self.evictions}"
+        )
+
+
+class BodyWriter:
+    """Streams a response body to a temp file while hashing it, so large PDFs never sit in memory."""
+
+    def __init__(self, directory: Path) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(dir=directory, suffix=".part")
+        self.path = Path(name)
+        self.size = 0
+        self._handle = os.fdopen(fd, "wb")
+        self._hash = hashlib.sha256()
+
+    def write(self, chunk: bytes) -> None:
+        self._handle.write(chunk)
+        self._hash.update(chunk)
+        self.size += len(chunk)
+
+    def finish(self) -> str:
+        """Close the file and return the SHA-256 of everything written."""
+        self._handle.close()
+        return self._hash.hexdigest()
+
+    def discard(self) -> None:
+        self._handle.close()
+        self.path.unlink(missing_ok=True)
+
+
+def file_response(url: str, path: Path, headers: Mapping[str, str]) -> httpx.Response:
+    """A body-less 200 response whose payload lives on disk at ``extensions["path"]``."""
+    response = httpx.Response(200, headers=headers, request=httpx.Request("GET", url))
+    response.extensions["path"] = path
+    return response
+
+
+def stream_to_file(
+    client: httpx.Client, url: str, directory: Path, headers: Optional[Mapping[str, str]] = None
+) -> Tuple[httpx.Response, Optional[BodyWriter]]:
+    """GET ``url`` and stream a 200 body into ``directory``; other statuses are read into memory."""
+    with client.stream("GET", url, headers=headers) as response:
+        if response.status_code != 200:
+            response.read()
+            return response, None
+        writer = BodyWriter(directory)
+        try:
+            for chunk in response.iter_bytes():
+                writer.write(chunk)
+        except BaseException:
+            writer.discard()
+            raise
+    return response, writer
+
+
+async def astream_to_file(
+    client: Any, url: str, directory: Path, headers: Optional[Mapping[str, str]] = None
+) -> Tuple[httpx.Response, Optional[BodyWriter]]:
+    """Async variant of :func:`stream_to_file`; ``client`` is an ``httpx.AsyncClient`` or ``AsyncHttpPool``."""
+    async with client.stream("GET", url, headers=headers) as response:
+        if response.status_code != 200:
+            await response.aread()
+            return response, None
+        writer = BodyWriter(directory)
+        try:
+            async for chunk in response.aiter_bytes():
+                writer.write(chunk)
+        except BaseException:
+            writer.discard()
+            raise
+    return response, writer
+
+
+class HttpCache:
+    """On-disk HTTP cache: URL index in SQLite, bodies stored once per content hash.
+
+    Entries younger than ``ttl_seconds`` are served straight from disk; older ones are
+    revalidated with ``If-None-Match`` / ``If-Modified-Since``. The store is trimmed to
+    ``max_bytes`` by evicting the least recently used URLs; objects handed out as paths by
+    :meth:`get_file` are pinned and skipped until the consumer calls :meth:`release`.
+    """
+
+    def __init__(self, root: Path, max_bytes: int, ttl_seconds: float) -> None:
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._pins: Dict[str, int] = {}  # digest -> paths handed out and not yet released
+        self._db = sqlite3.connect(self.root / "index.sqlite", check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                content_type TEXT,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_entries_last_access ON entries (last_access)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_entries_digest ON entries (digest)")
+        self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, digest, size, etag, last_modified, content_type, fetched_at, last_access "
+                "FROM entries WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if not row:
+            return None
+        entry = CacheEntry(*row)
+        if not self.object_path(entry.digest).exists():
+            self._forget(url)
+            return None
+        return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.fetched_at < self.ttl_seconds
+
+    @staticmethod
+    def conditional_headers(entry: CacheEntry) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def read(self, entry: CacheEntry) -> bytes:
+        return self.object_path(entry.digest).read_bytes()
+
+    def as_response(self, entry: CacheEntry) -> httpx.Response:
+        content = self.read(entry)
+        headers = {"Content-Type": entry.content_type} if entry.content_type else {}
+        with self._lock:
+            self.stats.bytes_served += len(content)
+            self._db.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), entry.url))
+            self._db.commit()
+        return httpx.Response(200, content=content, headers=headers, request=httpx.Request("GET", entry.url))
+
+    def store(self, url: str, content: bytes, headers: Mapping[str, str]) -> CacheEntry:
+        writer = BodyWriter(self.objects_dir)
+        writer.write(content)
+        return self.adopt(url, writer, headers)
+
+    def adopt(self, url: str, writer: BodyWriter, headers: Mapping[str, str], pin: bool = False) -> CacheEntry:
+        """Index a body already streamed to disk by ``writer``, moving it into the object store.
+
+        ``pin`` protects the object from the eviction this triggers, even when it alone is over
+        the budget; the caller then owns a :meth:`release`.
+        """
+        digest = writer.finish()
+        path = self.object_path(digest)
+        if path.exists():
+            writer.path.unlink(missing_ok=True)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # write-then-rename so concurrent readers never see a partial object
+            os.replace(writer.path, path)
+        now = time.time()
+        entry = CacheEntry(
+            url=url,
+            digest=digest,
+            size=writer.size,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            content_type=headers.get("Content-Type"),
+            fetched_at=now,
+            last_access=now,
+        )
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    entry.url,
+                    entry.digest,
+                    entry.size,
+                    entry.etag,
+                    entry.last_modified,
+                    entry.content_type,
+                    entry.fetched_at,
+                    entry.last_access,
+                ),
+            )
+            self._db.commit()
+            if pin:
+                self._pin(digest)
+        self.evict()
+        return entry
+
+    def mark_revalidated(self, entry: CacheEntry, headers: Mapping[str, str]) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE entries SET fetched_at = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                (time.time(), headers.get("ETag"), headers.get("Last-Modified"), entry.url),
+            )
+            self._db.commit()
+
+    def _pin(self, digest: str) -> None:
+        # caller holds the lock
+        self._pins[digest] = self._pins.get(digest, 0) + 1
+
+    def release(self, path: Path) -> None:
+        """Give back a path returned by :meth:`get_file` once it has been read; eviction may delete it again."""
+        digest = Path(path).name
+        with self._lock:
+            count = self._pins.get(digest, 0) - 1
+            if count > 0:
+                self._pins[digest] = count
+                return
+            self._pins.pop(digest, None)
+        self.evict()  # anything skipped while pinned
+
+    def _forget(self, url: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._db.commit()
+
+    def evict(self) -> None:
+        with self._lock:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            rows = self._db.execute("SELECT url, digest, size FROM entries ORDER BY last_access ASC").fetchall()
+            for url, digest, size in rows:
+                if total <= self.max_bytes:
+                    break
+                if digest in self._pins:
+                    continue  # its path is still queued for, or being read by, a consumer
+                self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+                still_used = self._db.execute("SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)).fetchone()
+                if not still_used:
+                    self.object_path(digest).unlink(missing_ok=True)
+                total -= size
+                self.stats.evictions += 1
+                logger.debug("Evicted %s (%d bytes) from HTTP cache", url, size)
+            self._db.commit()
+
+    def _bump(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + amount)
+
+    def _serve_cached(self, url: str) -> tuple[Optional[CacheEntry], Optional[httpx.Response]]:
+        entry = self.lookup(url)
+        if entry and self.is_fresh(entry):
+            self._bump("hits")
+            return entry, self.as_response(entry)
+        return entry, None
+
+    def _handle_response(self, entry: Optional[CacheEntry], url: str, response: httpx.Response) -> httpx.Response:
+        if entry and response.status_code == 304:
+            self._bump("revalidated")
+            self.mark_revalidated(entry, response.headers)
+            return self.as_response(entry)
+        self._bump("misses")
+        self._bump("bytes_downloaded", len(response.content))
+        if response.status_code == 200:
+            self.store(url, response.content, response.headers)
+        return response
+
+    def get(self, client: httpx.Client, url: str) -> httpx.Response:
+        """GET ``url`` through the cache. Only 200 responses are stored."""
+        entry, cached = self._serve_cached(url)
+        if cached is not None:
+            return cached
+        response = client.get(url, headers=self.conditional_headers(entry) if entry else None)
+        return self._handle_response(entry, url, response)
+
+    async def aget(self, client: Any, url: str) -> httpx.Response:
+        """Async variant of :meth:`get`; ``client`` is an ``httpx.AsyncClient`` or ``AsyncHttpPool``."""
+        entry, cached = self._serve_cached(url)
+        if cached is not None:
+            return cached
+        response = await client.get(url, headers=self.conditional_headers(entry) if entry else None)
+        return self._handle_response(entry, url, response)
+
+    def as_file_response(self, entry: CacheEntry) -> httpx.Response:
+        headers = {"Content-Type": entry.content_type} if entry.content_type else {}
+        with self._lock:
+            self._pin(entry.digest)
+            self.stats.bytes_served += entry.size
+            self._db.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), entry.url))
+            self._db.commit()
+        return file_response(entry.url, self.object_path(entry.digest), headers)
+
+    def _serve_cached_file(self, url: str) -> tuple[Optional[CacheEntry], Optional[httpx.Response]]:
+        entry = self.lookup(url)
+        if entry and self.is_fresh(entry):
+            response = self.as_file_response(entry)
+            path = response.extensions["path"]
+            if path.exists():
+                self._bump("hits")
+                return entry, response
+            # evicted between the lookup and the pin: download it again
+            self.release(path)
+            return None, None
+        return entry, None
+
+    def _handle_file_response(
+        self, entry: Optional[CacheEntry], url: str, response: httpx.Response, writer: Optional[BodyWriter]
+    ) -> httpx.Response:
+        if entry and response.status_code == 304:
+            self._bump("revalidated")
+            self.mark_revalidated(entry, response.headers)
+            return self.as_file_response(entry)
+        self._bump("misses")
+        if writer is None:
+            return response
+        self._bump("bytes_downloaded", writer.size)
+        stored = self.adopt(url, writer, response.headers, pin=True)
+        return file_response(url, self.object_path(stored.digest), response.headers)
+
+    def get_file(self, client: httpx.Client, url: str) -> httpx.Response:
+        """Like :meth:`get`, but the 200 body is streamed into the store and returned as a path.
+
+        The returned response carries no content; read ``response.extensions["path"]`` instead.
+        A 200 path is pinned against eviction: pass it to :meth:`release` when done with it.
+        """
+        entry, cached = self._serve_cached_file(url)
+        if cached is not None:
+            return cached
+        response, writer = stream_to_file(
+            client, url, self.objects_dir, self.conditional_headers(entry) if entry else None
+        )
+        return self._handle_file_response(entry, url, response, writer)
+
+    async def aget_file(self, client: Any, url: str) -> httpx.Response:
+        """Async variant of :meth:`get_file`; ``client`` is an ``httpx.AsyncClient`` or ``AsyncHttpPool``."""
+        entry, cached = self._serve_cached_file(url)
+        if cached is not None:
+            return cached
+        response, writer = await astream_to_file(
+            client, url, self.objects_dir, self.conditional_headers(entry) if entry else None
+        )
+        return self._handle_file_response(entry, url, response, writer)
+
+
+@lru_cache(maxsize=1)
+def get_http_cache() -> Optional[HttpCache]:
+    """Process-wide cache shared by all fetchers, or None when disabled."""
+    if not settings.http_cache_enabled:
+        return None
+    return HttpCache(
+        settings.storage_dir / "http_cache",
+        max_bytes=settings.http_cache_max_mb * 1024 * 1024,
+        ttl_seconds=settings.http_cache_ttl,
+    )
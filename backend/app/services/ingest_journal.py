@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Optional
+
+from sqlmodel import select
+
+from app.db.session import session_scope, write_lock
+from app.models import IngestCheckpoint, IngestRun
+from app.services.blob_store import get_blob_store
+from app.services.types import (
+    ArxivPaper,
+    LLMAnalysis,
+    analysis_from_dict,
+    analysis_to_dict,
+    paper_from_dict,
+    paper_to_dict,
+)
+
+STAGE_PENDING = "pending"
+STAGE_FETCHED = "fetched"
+STAGE_ANALYZED = "analyzed"
+STAGE_STORED = "stored"
+
+logger = logging.getLogger("pipeline")
+
+
+def _checkpoint_paper(paper: ArxivPaper) -> dict:
+    # raw HTML goes to the blob store (where store_paper puts it too) rather than into the JSON column
+    payload = paper_to_dict(paper)
+    html = payload.pop("raw_html")
+    payload["html_blob_key"] = get_blob_store().put(html) if html else None
+    return payload
+
+
+def _restore_paper(payload: dict) -> ArxivPaper:
+    values = dict(payload)
+    if "html_blob_key" in values:  # older checkpoints still carry raw_html inline
+        values["raw_html"] = get_blob_store().get(values.pop("html_blob_key"))
+    return paper_from_dict(values)
+
+
+@dataclass
+class Checkpoint:
+    """Work already completed for one paper in a run."""
+
+    arxiv_id: str
+    stage: str
+    paper: Optional[ArxivPaper] = None
+    analysis: Optional[LLMAnalysis] = None
+
+
+class IngestJournal:
+    """Persistent per-run, per-paper stage journal backing ``daily_ingest --resume``."""
+
+    def __init__(self, run_id: int) -> None:
+        self.run_id = run_id
+
+    @classmethod
+    def start(cls, listing_date: date, resume: bool = False) -> "IngestJournal":
+        """Open the latest unfinished run for ``listing_date`` when resuming, else a new run."""
+        with write_lock, session_scope() as session:
+            if resume:
+                run = session.exec(
+                    select(IngestRun)
+                    .where(IngestRun.listing_date == listing_date.isoformat())
+                    .where(IngestRun.status != "completed")
+                    .order_by(IngestRun.id.desc())
+                ).first()
+                if run:
+                    run.status = "running"
+                    run.finished_at = None
+                    logger.info("Resuming ingest run %s for %s", run.id, listing_date.isoformat())
+                    return cls(run.id)
+                logger.info("No unfinished run for %s; starting a new one", listing_date.isoformat())
+            run = IngestRun(listing_date=listing_date.isoformat())
+            session.add(run)
+            session.flush()
+            return cls(run.id)
+
+    def load(self) -> Dict[str, Checkpoint]:
+        with session_scope() as session:
+            rows = session.exec(
+                select(IngestCheckpoint).where(IngestCheckpoint.run_id == self.run_id)
+            ).all()
+            return {
+                row.arxiv_id: Checkpoint(
+                    arxiv_id=row.arxiv_id,
+                    stage=row.stage,
+                    paper=_restore_paper(row.paper_payload) if row.paper_payload else None,
+                    analysis=analysis_from_dict(row.analysis_payload) if row.analysis_payload else None,
+                )
+                for row in rows
+            }
+
+    def _write(self, arxiv_id: str, **values) -> None:
+        with write_lock, session_scope() as session:
+            row = session.exec(
+                select(IngestCheckpoint)
+                .where(IngestCheckpoint.run_id == self.run_id)
+                .where(IngestCheckpoint.arxiv_id == arxiv_id)
+            ).first()
+            if row is None:
+                row = IngestCheckpoint(
+                    run_id=self.run_id,
+                    arxiv_id=arxiv_id,
+                    stage=values.get("stage", STAGE_PENDING),
+                )
+                session.add(row)
+            for key, value in values.items():
+                setattr(row, key, value)
+            row.updated_at = datetime.utcnow()
+
+    def record_fetched(self, paper: ArxivPaper) -> None:
+        self._write(paper.arxiv_id, stage=STAGE_FETCHED, paper_payload=_checkpoint_paper(paper), error=None)
+
+    def record_analyzed(self, arxiv_id: str, analysis: LLMAnalysis) -> None:
+        self._write(arxiv_id, stage=STAGE_ANALYZED, analysis_payload=analysis_to_dict(analysis), error=None)
+
+    def record_stored(self, arxiv_id: str) -> None:
+        # intermediates are no longer needed once the paper row exists
+        self._write(arxiv_id, stage=STAGE_STORED, paper_payload=None, analysis_payload=None, error=None)
+
+    def record_error(self, arxiv_id: str, error: str) -> None:
+        self._write(arxiv_id, error=error[:2000])
+
+    def finish(self, failed: int) -> None:
+        with write_lock, session_scope() as session:
+            run = session.get(IngestRun, self.run_id)
+            if run:
+                run.status = "completed" if failed == 0 else "partial"
+                run.finished_at = datetime.utcnow()
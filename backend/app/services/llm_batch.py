@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from openai import OpenAI
+from openai.types.chat import ChatCompletion
+
+from app.core.config import settings
+from app.services.llm_cache import cache_key
+from app.services.llm_client import (
+    LLM_TEMPERATURE,
+    SYSTEM_PROMPT,
+    analysis_from_payload,
+    build_chat_request,
+    build_prompt,
+    cached_payload,
+    decode_completion,
+    prompt_layout,
+)
+from app.services.llm_usage import LLMCallRecord, save_llm_calls
+from app.services.triage import TIER_FULL
+from app.services.types import ArxivPaper, LLMAnalysis
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+# OpenAI-compatible providers cap a batch input file at 50k requests
+MAX_BATCH_REQUESTS = 50_000
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+logger = logging.getLogger("llm_batch")
+
+
+class BatchError(Exception):
+    pass
+
+
+@dataclass
+class BatchRequest:
+    custom_id: str  # arXiv id
+    prompt: str
+    cache_key: str
+    call: Optional[LLMCallRecord] = field(default=None, compare=False)
+
+    def to_line(self, model: str) -> str:
+        return json.dumps(
+            {
+                "custom_id": self.custom_id,
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": build_chat_request(self.prompt, model=model),
+            },
+            ensure_ascii=False,
+        )
+
+
+class BatchAnalyzer:
+    """Analyse many papers through an OpenAI-compatible batch API.
+
+    Prompts are written to a JSONL file, uploaded, submitted as one batch per
+    :data:`MAX_BATCH_REQUESTS` papers, polled until finished, and the results go through the
+    same decoding (and LLM cache) as interactive calls. Papers whose prompt is already cached,
+    or whose batch line failed, never block the rest; failures fall back to the heuristic.
+    """
+
+    def __init__(
+        self,
+        client: Optional[OpenAI] = None,
+        model: Optional[str] = None,
+        workdir: Optional[Path] = None,
+        poll_interval: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.client = client or OpenAI(
+            api_key=settings.llm_batch_api_key,
+            base_url=settings.llm_batch_base_url,
+            max_retries=settings.retry_max_attempts,
+        )
+        self.model = model or settings.llm_batch_model
+        self.workdir = Path(workdir or settings.storage_dir / "llm_batches")
+        self.poll_interval = settings.llm_batch_poll_interval if poll_interval is None else poll_interval
+        self.timeout = settings.llm_batch_timeout if timeout is None else timeout
+
+    def write_requests(self, requests: Sequence[BatchRequest], name: str) -> Path:
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        path = self.workdir / f"{name}.input.jsonl"
+        with path.open("w", encoding="utf-8") as handle:
+            for request in requests:
+                handle.write(request.to_line(self.model) + "\n")
+        return path
+
+    def submit(self, path: Path) -> str:
+        with path.open("rb") as handle:
+            uploaded = self.client.files.create(file=handle, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window="24h",
+            metadata={"source": "daily_ingest", "input": path.name},
+        )
+        logger.info("Submitted batch %s (%s, file %s)", batch.id, path.name, uploaded.id)
+        return batch.id
+
+    def wait(self, batch_id: str):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            counts = batch.request_counts
+            logger.info(
+                "Batch %s: %s (%s/%s done, %s failed)",
+                batch_id,
+                batch.status,
+                getattr(counts, "completed", "?"),
+                getattr(counts, "total", "?"),
+                getattr(counts, "failed", "?"),
+            )
+            if batch.status in TERMINAL_STATUSES:
+                return batch
+            if time.monotonic() >= deadline:
+                raise BatchError(f"Batch {batch_id} still {batch.status} after {self.timeout:.0f}s")
+            time.sleep(self.poll_interval)
+
+    def _read_lines(self, file_id: Optional[str], path: Path) -> List[dict]:
+        if not file_id:
+            return []
+        content = self.client.files.content(file_id).read()
+        path.write_bytes(content)
+        return [json.loads(line) for line in content.decode("utf-8").splitlines() if line.strip()]
+
+    def collect(self, batch, requests: Sequence[BatchRequest], name: str) -> Dict[str, Optional[dict]]:
+        """Map batch output lines back to decoded payloads by ``custom_id``."""
+        by_id = {request.custom_id: request for request in requests}
+        payloads: Dict[str, Optional[dict]] = {}
+        for line in self._read_lines(batch.output_file_id, self.workdir / f"{name}.output.jsonl"):
+            request = by_id.get(line.get("custom_id", ""))
+            response = line.get("response") or {}
+            if request is None:
+                continue
+            if response.get("status_code") != 200:
+                logger.warning(
+                    "Batch line for %s failed with status %s", request.custom_id, response.get("status_code")
+                )
+                if request.call is not None:
+                    request.call.error = f"batch line status {response.get('status_code')}"
+                continue
+            completion = ChatCompletion.model_validate(response.get("body") or {})
+            payloads[request.custom_id] = decode_completion(completion, request.cache_key, request.call)
+        for line in self._read_lines(getattr(batch, "error_file_id", None), self.workdir / f"{name}.errors.jsonl"):
+            logger.warning("Batch error for %s: %s", line.get("custom_id"), line.get("error"))
+            request = by_id.get(line.get("custom_id", ""))
+            if request is not None and request.call is not None:
+                request.call.error = str(line.get("error"))[:500]
+        if batch.status != "completed":
+            logger.error("Batch %s ended with status %s", batch.id, batch.status)
+        return payloads
+
+    def run(self, requests: Sequence[BatchRequest]) -> Dict[str, Optional[dict]]:
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        payloads: Dict[str, Optional[dict]] = {}
+        for offset in range(0, len(requests), MAX_BATCH_REQUESTS):
+            chunk = requests[offset : offset + MAX_BATCH_REQUESTS]
+            name = f"{stamp}-{offset // MAX_BATCH_REQUESTS}"
+            batch = self.wait(self.submit(self.write_requests(chunk, name)))
+            payloads.update(self.collect(batch, chunk, name))
+        return payloads
+
+    def analyze(
+        self,
+        papers: Iterable[ArxivPaper],
+        use_cache: bool = True,
+        tiers: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, LLMAnalysis]:
+        """``tiers`` maps arXiv id to a triage tier; papers not listed get the full prompt."""
+        papers = list(papers)
+        tiers = tiers or {}
+        payloads: Dict[str, Optional[dict]] = {}
+        calls: Dict[str, LLMCallRecord] = {}
+        requests: List[BatchRequest] = []
+        for paper in papers:
+            tier = tiers.get(paper.arxiv_id, TIER_FULL)
+            prompt = build_prompt(paper, tier=tier)
+            key = cache_key(self.model, SYSTEM_PROMPT, prompt, LLM_TEMPERATURE)
+            call = calls[paper.arxiv_id] = LLMCallRecord(
+                arxiv_id=paper.arxiv_id, model=self.model, mode="batch", tier=tier, prompt_layout=prompt_layout()
+            )
+            cached = cached_payload(key, use_cache, call)
+            if cached is not None:
+                payloads[paper.arxiv_id] = cached
+            else:
+                requests.append(BatchRequest(paper.arxiv_id, prompt, key, call))
+        logger.info("Batch analysis: %d papers, %d served from cache", len(papers), len(papers) - len(requests))
+        if requests:
+            payloads.update(self.run(requests))
+            for request in requests:
+                if request.custom_id not in payloads and not request.call.error:
+                    request.call.error = "missing from batch output"
+        analyses = {
+            paper.arxiv_id: analysis_from_payload(paper, payloads.get(paper.arxiv_id), calls[paper.arxiv_id])
+            for paper in papers
+        }
+        save_llm_calls(calls.values())
+        return analyses
+
+
+def analyze_papers_with_llm_batch(
+    papers: Iterable[ArxivPaper],
+    use_cache: bool = True,
+    analyzer: Optional[BatchAnalyzer] = None,
+    tiers: Optional[Dict[str, str]] = None,
+) -> Dict[str, LLMAnalysis]:
+    """Batch-mode counterpart of :func:`analyze_paper_with_llm` for backfills."""
+    if analyzer is None and not settings.llm_batch_api_key:
+        logger.warning("LLM_BATCH_API_KEY/DEEPSEEK_API_KEY not set; using heuristic analyses")
+        return {paper.arxiv_id: analysis_from_payload(paper, None) for paper in papers}
+    return (analyzer or BatchAnalyzer()).analyze(papers, use_cache=use_cache, tiers=tiers)
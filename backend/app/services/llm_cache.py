@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger("llm_cache")
+
+
+@dataclass
+class LLMCacheStats:
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0  # lookups skipped on request (--no-llm-cache)
+    stores: int = 0
+    evictions: int = 0
+    tokens_saved: int = 0  # prompt + completion tokens of the responses served from cache
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"hits={self.hits} misses={self.misses} bypassed={self.bypassed} hit_rate={self.hit_rate:.0%} "
+            f"stored={self.stores} evictions={self.evictions} tokens_saved={self.tokens_saved}"
+        )
+
+
+def cache_key(model: str, system_prompt: str, prompt: str, temperature: float) -> str:
+    material = json.dumps([model, system_prompt, prompt, temperature], ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Durable store of raw LLM responses keyed by (model, system prompt, prompt, temperature).
+
+    Entries expire after ``ttl_seconds``; once the stored responses exceed ``max_bytes`` the
+    least recently used ones are evicted.
+    """
+
+    def __init__(self, path: Path, max_bytes: int, ttl_seconds: float) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.stats = LLMCacheStats()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                content TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                tokens INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_responses_last_access ON responses (last_access)")
+        self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _bump(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + amount)
+
+    def get(self, key: str, bypass: bool = False) -> Optional[str]:
+        """Return the cached response, or None on a miss. ``bypass`` skips the lookup (counted separately)."""
+        entry = self.lookup(key, bypass=bypass)
+        return entry[0] if entry else None
+
+    def lookup(self, key: str, bypass: bool = False) -> Optional[Tuple[str, str]]:
+        """Like :meth:`get`, but returns ``(content, model)`` where model is the version that answered."""
+        if bypass:
+            self._bump("bypassed")
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT content, tokens, created_at, model FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row and now - row[2] >= self.ttl_seconds:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                row = None
+            if row:
+                self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                self._db.commit()
+        if not row:
+            self._bump("misses")
+            return None
+        self._bump("hits")
+        self._bump("tokens_saved", row[1])
+        return row[0], row[3]
+
+    def put(self, key: str, model: str, content: str, tokens: int = 0) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, content, len(content.encode("utf-8")), tokens, now, now),
+            )
+            self._db.commit()
+        self._bump("stores")
+        self.evict()
+
+    def evict(self) -> None:
+        with self._lock:
+            expired = self._db.execute(
+                "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            evicted = max(0, expired)
+            if total > self.max_bytes:
+                rows = self._db.execute("SELECT key, size FROM responses ORDER BY last_access ASC").fetchall()
+                for key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    total -= size
+                    evicted += 1
+            self._db.commit()
+            self.stats.evictions += evicted
+        if evicted:
+            logger.debug("Evicted %d LLM cache entries", evicted)
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> Optional[LLMCache]:
+    """Process-wide LLM response cache, or None when disabled."""
+    if not settings.llm_cache_enabled:
+        return None
+    return LLMCache(
+        settings.storage_dir / "llm_cache.sqlite",
+        max_bytes=settings.llm_cache_max_mb * 1024 * 1024,
+        ttl_seconds=settings.llm_cache_ttl,
+    )
@@ -1,17 +1,41 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-from typing import List, Optional
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
-from openai import OpenAI
+import httpx
+import openai
+from openai import AsyncOpenAI, OpenAI
 
 from app.core.config import settings
+from app.services.llm_cache import cache_key, get_llm_cache
+from app.services.llm_endpoints import EndpointHealth, EndpointUnavailable, LLMEndpoint, configured_endpoints
+from app.services.llm_structured import (
+    ANALYSIS_SCHEMA,
+    JSON_RESPONSE_FORMAT,
+    OutputSchema,
+    StructuredOutput,
+    aread_stream,
+    describe,
+    parse_structured,
+    read_stream,
+    repair_prompt,
+)
+from app.services.llm_usage import LLMCallRecord, cached_prompt_tokens, save_llm_calls, served_version
+from app.services.prompt_budget import estimate_tokens, select_sections
+from app.services.rate_limit import TokenBucket, acall_with_retry, call_with_retry, get_rate_limiter
+from app.services.triage import TIER_FULL
 from app.services.types import ArxivPaper, FindingSummary, LLMAnalysis, Metric
 
 SYSTEM_PROMPT = """你是一位面向科研工作者的中文助手，负责阅读并总结最新的学术论文。务必按照给定的 JSON 结构输出结果，全程使用简体中文，保持准确、专业、凝练。"""
 
-USER_PROMPT_TEMPLATE = """
+# Paper-specific part of the prompt
+PAPER_CONTEXT_TEMPLATE = """
 论文元数据：
 - arXiv ID：{arxiv_id}
 - 标题：{title}
@@ -23,7 +47,10 @@ USER_PROMPT_TEMPLATE = """
 正文片段（截取自 HTML/PDF）：
 {sections}
 
-任务要求（全部使用简体中文）：
+"""
+
+# Static task instructions and JSON schema (identical for every paper)
+TASK_TEMPLATE = """任务要求（全部使用简体中文）：
 1. 用 1-2 句话概述论文要解决的核心问题（problem 字段）。
 2. 用 1-2 句话提炼论文提出的主要方案或方法（solution 字段）。
 3. 描述论文的主要效果/成果，包含关键量化指标或相对提升（effect 字段，尽量列出数值）。
@@ -67,31 +94,61 @@ USER_PROMPT_TEMPLATE = """
 }}
 """
 
+# Original layout: paper first, instructions last
+USER_PROMPT_TEMPLATE = PAPER_CONTEXT_TEMPLATE + TASK_TEMPLATE
+
+# Prefix-cache layout: the static instructions open the prompt so every request shares the same
+# prefix (system prompt + task), which providers such as DeepSeek serve from their context cache
+PREFIX_CACHE_PROMPT_TEMPLATE = (
+    "请阅读文末给出的论文元数据与正文片段，并完成以下任务。\n\n" + TASK_TEMPLATE + "\n以下为待分析论文：\n" + PAPER_CONTEXT_TEMPLATE
+)
+
+PROMPT_LAYOUT_PREFIX = "prefix"
+PROMPT_LAYOUT_LEGACY = "legacy"
+
+
+def prompt_layout() -> str:
+    """The configured ``LLM_PROMPT_LAYOUT``; anything but ``prefix`` selects the original layout."""
+    return PROMPT_LAYOUT_PREFIX if settings.llm_prompt_layout == PROMPT_LAYOUT_PREFIX else PROMPT_LAYOUT_LEGACY
+
+
+NO_SECTIONS_NOTE = "（未提供正文，请仅依据以上元数据与摘要作答）"
+
 
 def _format_sections(sections: List[str]) -> str:
     return "\n".join(sections)
 
 
-def build_prompt(paper: ArxivPaper, context_sections: Optional[List[str]] = None) -> str:
-    section_texts = []
-    for section in paper.sections[:12]:  # keep prompt size manageable
-        heading = f"[{section.heading}]" if section.heading else ""
-        content = section.content.strip()
-        if not content:
-            continue
-        section_texts.append(f"{heading}\n{content}")
-    if not section_texts and paper.raw_text:
-        section_texts.append(paper.raw_text[:5000])
-    if context_sections:
-        section_texts.extend(context_sections)
-    return USER_PROMPT_TEMPLATE.format(
+def build_prompt(
+    paper: ArxivPaper,
+    context_sections: Optional[List[str]] = None,
+    tier: str = TIER_FULL,
+    layout: Optional[str] = None,
+) -> str:
+    # sections are ranked (intro, method, experiments, ...) and packed into a fixed token budget;
+    # the lite triage tier sends metadata and abstract only
+    extra = list(context_sections or [])
+    selection = select_sections(
+        paper.sections,
+        budget=settings.llm_prompt_token_budget if tier == TIER_FULL else 0,
+        raw_text=paper.raw_text,
+        reserved_tokens=sum(estimate_tokens(text) for text in extra),
+    )
+    logger.info("Prompt sections for %s: %s", paper.arxiv_id, selection.summary())
+    return render_prompt(paper, selection.texts + extra, layout)
+
+
+def render_prompt(paper: ArxivPaper, section_texts: List[str], layout: Optional[str] = None) -> str:
+    """Fill the analysis prompt with already selected (or summarised) section texts."""
+    template = USER_PROMPT_TEMPLATE if (layout or prompt_layout()) == PROMPT_LAYOUT_LEGACY else PREFIX_CACHE_PROMPT_TEMPLATE
+    return template.format(
         arxiv_id=paper.arxiv_id,
         title=paper.title,
         authors=", ".join(paper.authors),
         institutions=", ".join(paper.institutions) or "unknown",
         abstract=paper.abstract,
         categories=", ".join(paper.categories),
-        sections=_format_sections(section_texts),
+        sections=_format_sections(section_texts) or NO_SECTIONS_NOTE,
         threshold=settings.breakthrough_threshold,
     )
 
@@ -113,21 +170,60 @@ def _strip_code_fence(content: str) -> str:
 
 logger = logging.getLogger("llm")
 
+RETRYABLE_LLM_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
 
-def call_deepseek(prompt: str) -> Optional[dict]:
-    if not settings.deepseek_api_key:
-        logger.warning("DeepSeek API key not configured; using heuristic fallback.")
-        return None
-    logger.debug("DeepSeek prompt: %s", prompt)
-    client = OpenAI(api_key=settings.deepseek_api_key, base_url=settings.deepseek_base_url)
-    response = client.chat.completions.create(
-        model=settings.deepseek_model,
-        messages=[
+LLM_TEMPERATURE = 0.2
+# completion tokens reserved against the TPM budget before the real usage is known
+COMPLETION_TOKENS_ESTIMATE = 1500
+
+
+def build_chat_request(prompt: str, model: Optional[str] = None, structured: bool = False) -> dict:
+    """Chat-completions body for an analysis prompt (also the ``body`` of batch API lines).
+
+    ``structured`` asks for JSON mode and streams the answer, so it can be validated (and
+    abandoned) while it arrives; see :mod:`app.services.llm_structured`.
+    """
+    request = {
+        "model": model or settings.deepseek_model,
+        "messages": [
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": prompt},
         ],
-        temperature=0.2,
-    )
+        "temperature": LLM_TEMPERATURE,
+    }
+    if structured:
+        request.update(response_format=JSON_RESPONSE_FORMAT, stream=True, stream_options={"include_usage": True})
+    return request
+
+
+def build_repair_request(output: StructuredOutput) -> dict:
+    # short and unstreamed: only the broken fields are asked for, without the paper text
+    return {**build_chat_request(repair_prompt(output)), "response_format": JSON_RESPONSE_FORMAT}
+
+
+def cached_payload(key: str, use_cache: bool, call: Optional[LLMCallRecord] = None) -> Optional[dict]:
+    cache = get_llm_cache()
+    if cache is None:
+        return None
+    entry = cache.lookup(key, bypass=not use_cache)
+    if entry is None:
+        return None
+    cached, version = entry
+    try:
+        payload = json.loads(cached)
+    except json.JSONDecodeError:
+        logger.warning("Discarding undecodable cached DeepSeek response %s", key[:12])
+        return None
+    logger.info("DeepSeek response served from cache (%s)", key[:12])
+    if call is not None:
+        call.cache_hit = True
+        call.llm_version = version
+    return payload
+
+
+def decode_completion(response, key: str, call: Optional[LLMCallRecord] = None) -> Optional[dict]:
+    if call is not None and response:
+        call.observe(response)
     if not response or not response.choices:
         logger.error("DeepSeek returned no choices for prompt")
         return None
@@ -135,10 +231,507 @@ def call_deepseek(prompt: str) -> Optional[dict]:
     content = _strip_code_fence(content)
     logger.debug("DeepSeek raw response: %s", content)
     try:
-        return json.loads(content)
+        payload = json.loads(content)
     except json.JSONDecodeError:
         logger.exception("Failed to decode DeepSeek JSON response: %s", content[:1000])
         return None
+    cache = get_llm_cache()
+    if cache is not None:
+        usage = getattr(response, "usage", None)
+        version = served_version(response) or settings.deepseek_model
+        cache.put(key, version, content, tokens=getattr(usage, "total_tokens", 0) or 0)
+    return payload
+
+
+def analysis_cache_key(prompt: str, model: Optional[str] = None) -> str:
+    return cache_key(model or settings.deepseek_model, SYSTEM_PROMPT, prompt, LLM_TEMPERATURE)
+
+
+@lru_cache(maxsize=1)
+def _sync_client() -> OpenAI:
+    # one client (and connection pool) per process; retries are handled by call_with_retry
+    # so they show up in the rate-limit counters
+    return OpenAI(api_key=settings.deepseek_api_key, base_url=settings.deepseek_base_url, max_retries=0)
+
+
+def _timed_attempt(call: Optional[LLMCallRecord], attempt: int, started: float) -> None:
+    # latency counts from the first attempt: what the paper waited, retries and backoff included
+    if call is not None:
+        call.retries = attempt - 1
+        call.latency_ms = (time.perf_counter() - started) * 1000
+
+
+def repair_call_record(call: Optional[LLMCallRecord]) -> Optional[LLMCallRecord]:
+    if call is None:
+        return None
+    return LLMCallRecord(
+        arxiv_id=call.arxiv_id,
+        model=call.model,
+        mode=call.mode,
+        tier=call.tier,
+        step="repair",
+        prompt_layout=call.prompt_layout,
+    )
+
+
+def structured_payload(
+    output: StructuredOutput, key: str, call: Optional[LLMCallRecord] = None
+) -> Optional[dict]:
+    """The validated fields of a structured answer; only complete answers are cached."""
+    if not output.complete:
+        logger.warning("DeepSeek structured output still incomplete: %s", describe(output))
+        if not output.salvageable:
+            return None
+    else:
+        cache = get_llm_cache()
+        if cache is not None:
+            version = served_version(output) or settings.deepseek_model
+            content = json.dumps(output.payload, ensure_ascii=False)
+            cache.put(key, version, content, tokens=getattr(output.usage, "total_tokens", 0) or 0)
+    return dict(output.payload)
+
+
+def merge_repair(
+    output: StructuredOutput, response, repair_call: Optional[LLMCallRecord], schema: OutputSchema
+) -> None:
+    if repair_call is not None:
+        repair_call.observe(response)
+    content = response.choices[0].message.content if response and response.choices else None
+    repaired = parse_structured(content or "", schema)
+    if repair_call is not None:
+        repair_call.parse_ok = all(key in repaired.payload for key in output.invalid_fields)
+    output.merge(repaired)
+
+
+def _call_structured(
+    client: OpenAI, prompt: str, key: str, call: Optional[LLMCallRecord], schema: OutputSchema
+) -> Optional[dict]:
+    limiter = get_rate_limiter()
+
+    def send(request: dict, record: Optional[LLMCallRecord], consume=None):
+        attempts = 0
+        started = time.perf_counter()
+
+        def create():
+            nonlocal attempts
+            limiter.acquire(settings.deepseek_base_url)
+            attempts += 1
+            try:
+                response = client.chat.completions.create(**request)
+                return consume(response) if consume else response
+            finally:
+                _timed_attempt(record, attempts, started)
+
+        return call_with_retry(create, settings.deepseek_base_url, retry_exceptions=RETRYABLE_LLM_ERRORS)
+
+    output = send(build_chat_request(prompt, structured=True), call, lambda stream: read_stream(stream, schema))
+    if call is not None:
+        call.observe(output)
+    if not output.complete:
+        logger.info("Repairing DeepSeek structured output: %s", describe(output))
+        repair_call = repair_call_record(call)
+        try:
+            response = send(build_repair_request(output), repair_call)
+            merge_repair(output, response, repair_call, schema)
+        except Exception as exc:  # noqa: BLE001
+            # the fields that did validate are still worth keeping
+            logger.warning("DeepSeek repair request failed: %s", exc)
+            if repair_call is not None:
+                repair_call.error = f"{type(exc).__name__}: {exc}"
+        if repair_call is not None:
+            save_llm_calls([repair_call])
+    return structured_payload(output, key, call)
+
+
+def call_deepseek(
+    prompt: str,
+    use_cache: bool = True,
+    call: Optional[LLMCallRecord] = None,
+    schema: OutputSchema = ANALYSIS_SCHEMA,
+) -> Optional[dict]:
+    """Send ``prompt`` to DeepSeek and decode its JSON answer.
+
+    Decoded responses are kept in the LLM cache; ``use_cache=False`` skips the lookup but
+    still refreshes the cached entry. Token usage, latency and retries go into ``call``.
+    With ``LLM_STRUCTURED_OUTPUT`` the answer is streamed and validated against ``schema``;
+    invalid fields are asked for again in a short repair request and valid ones are kept.
+
+    This synchronous path always talks to ``DEEPSEEK_BASE_URL``: fallback endpoints, circuit
+    breakers and hedging (``LLM_ENDPOINTS``) only apply to :class:`AsyncLLMClient`.
+    """
+    if not settings.deepseek_api_key:
+        logger.warning("DeepSeek API key not configured; using heuristic fallback.")
+        return None
+    logger.debug("DeepSeek prompt: %s", prompt)
+    key = analysis_cache_key(prompt)
+    payload = cached_payload(key, use_cache, call)
+    if payload is not None:
+        return payload
+    client = _sync_client()
+    if settings.llm_structured_output:
+        return _call_structured(client, prompt, key, call, schema)
+    limiter = get_rate_limiter()
+    attempts = 0
+    started = time.perf_counter()
+
+    def create():
+        nonlocal attempts
+        limiter.acquire(settings.deepseek_base_url)
+        attempts += 1
+        try:
+            return client.chat.completions.create(**build_chat_request(prompt))
+        finally:
+            _timed_attempt(call, attempts, started)
+
+    response = call_with_retry(create, settings.deepseek_base_url, retry_exceptions=RETRYABLE_LLM_ERRORS)
+    return decode_completion(response, key, call)
+
+
+@dataclass
+class LLMClientStats:
+    requests: int = 0
+    max_in_flight: int = 0
+    rpm_wait: float = 0.0  # seconds spent waiting on the requests-per-minute budget
+    tpm_wait: float = 0.0  # seconds spent waiting on the tokens-per-minute budget
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0  # prompt tokens the provider served from its prefix cache
+    hedged: int = 0  # requests also sent to a fallback endpoint after the primary's p95
+    failovers: int = 0  # requests moved to a fallback endpoint after the previous one failed
+
+    def summary(self) -> str:
+        hit_rate = self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+        return (
+            f"requests={self.requests} max_in_flight={self.max_in_flight} "
+            f"rpm_wait={self.rpm_wait:.1f}s tpm_wait={self.tpm_wait:.1f}s "
+            f"prompt_tokens={self.prompt_tokens} completion_tokens={self.completion_tokens} "
+            f"prefix_cache_hit_tokens={self.cached_tokens} ({hit_rate:.0%}) "
+            f"hedged={self.hedged} failovers={self.failovers}"
+        )
+
+
+# errors that count against an endpoint's circuit breaker (not e.g. a 400 for one bad request)
+ENDPOINT_FAILURES = RETRYABLE_LLM_ERRORS + (httpx.TransportError,)
+
+
+@dataclass
+class _Answer:
+    index: int  # position in AsyncLLMClient.endpoints
+    model: str = ""  # model of the endpoint that answered
+    response: Any = None
+    attempts: int = 0
+    latency: float = 0.0  # seconds, final attempt
+    hedged: bool = False
+
+
+def _answered(response) -> bool:
+    if isinstance(response, StructuredOutput):
+        return response.complete
+    return bool(getattr(response, "choices", None))
+
+
+class AsyncLLMClient:
+    """Long-lived ``AsyncOpenAI`` client for analysing many papers at once.
+
+    One connection pool is reused for every request. Concurrency is capped by a semaphore,
+    and requests-per-minute / tokens-per-minute budgets are enforced with token buckets
+    before each attempt, so a burst of papers queues locally instead of drawing 429s.
+    With fallback endpoints (``LLM_ENDPOINTS``) a request the primary hasn't answered by
+    its p95 latency is hedged to the next endpoint, and endpoints whose circuit breaker is
+    open are skipped. Create it (and :meth:`aclose` it) on the event loop that will use it.
+
+    With ``LLM_PROMPT_LAYOUT=prefix`` the first request is a warm-up: concurrent callers
+    wait for its answer (retries included) before fanning out, so the provider has cached
+    the shared prefix. The legacy layout has no shared prefix and never waits.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+    ) -> None:
+        self.max_concurrency = max_concurrency or settings.llm_max_concurrency
+        rpm = settings.llm_requests_per_minute if requests_per_minute is None else requests_per_minute
+        tpm = settings.llm_tokens_per_minute if tokens_per_minute is None else tokens_per_minute
+        self._requests = TokenBucket(rpm / 60, capacity=max(1.0, rpm / 60)) if rpm > 0 else None
+        self._tokens = TokenBucket(tpm / 60, capacity=tpm) if tpm > 0 else None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._in_flight = 0
+        # with the prefix-cache layout the first request runs alone, so the provider has cached the
+        # shared prefix before the rest fan out; every other caller is held until it answers
+        self._warmed = asyncio.Event()
+        self._warming = False
+        if prompt_layout() != PROMPT_LAYOUT_PREFIX:
+            self._warmed.set()
+        self.stats = LLMClientStats()
+        self.endpoints = [EndpointHealth(endpoint) for endpoint in configured_endpoints()]
+        self.client = self._new_client(self.endpoints[0].endpoint)
+        self._fallback_clients: Dict[int, AsyncOpenAI] = {}
+
+    def _new_client(self, endpoint: LLMEndpoint) -> AsyncOpenAI:
+        return AsyncOpenAI(
+            api_key=endpoint.api_key,
+            base_url=endpoint.base_url,
+            max_retries=0,
+            http_client=httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.llm_request_timeout, connect=settings.request_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            ),
+        )
+
+    def _client_for(self, index: int) -> AsyncOpenAI:
+        if index == 0:
+            return self.client
+        if index not in self._fallback_clients:
+            self._fallback_clients[index] = self._new_client(self.endpoints[index].endpoint)
+        return self._fallback_clients[index]
+
+    async def aclose(self) -> None:
+        await self.client.close()
+        for client in self._fallback_clients.values():
+            await client.close()
+
+    def endpoint_summary(self) -> str:
+        return "; ".join(health.summary() for health in self.endpoints)
+
+    async def _wait_for_budget(self, estimated_tokens: int, base_url: str) -> None:
+        if self._requests is not None:
+            wait = self._requests.reserve()
+            if wait > 0:
+                self.stats.rpm_wait += wait
+                await asyncio.sleep(wait)
+        if self._tokens is not None:
+            wait = self._tokens.reserve(min(estimated_tokens, self._tokens.capacity))
+            if wait > 0:
+                self.stats.tpm_wait += wait
+                await asyncio.sleep(wait)
+        await get_rate_limiter().acquire_async(base_url)
+
+    def _record_usage(self, response, estimated_tokens: int) -> None:
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        self.stats.prompt_tokens += usage.prompt_tokens or 0
+        self.stats.completion_tokens += usage.completion_tokens or 0
+        self.stats.cached_tokens += cached_prompt_tokens(usage)
+        overshoot = (usage.total_tokens or 0) - estimated_tokens
+        if self._tokens is not None and overshoot > 0:
+            # charge what the estimate missed so the next requests wait for it
+            self._tokens.reserve(overshoot)
+
+    async def complete(self, prompt: str, call: Optional[LLMCallRecord] = None):
+        return await self.send(build_chat_request(prompt), call)
+
+    async def complete_structured(
+        self, prompt: str, schema: OutputSchema, call: Optional[LLMCallRecord] = None
+    ) -> StructuredOutput:
+        """Stream a JSON-mode completion through the schema validator."""
+        return await self.send(
+            build_chat_request(prompt, structured=True), call, consume=lambda stream: aread_stream(stream, schema)
+        )
+
+    async def _attempt(
+        self, index: int, request: dict, estimated_tokens: int, consume=None, guarded: bool = True
+    ) -> _Answer:
+        """Send ``request`` to one endpoint, with retries; feeds its latency window and breaker.
+
+        ``guarded`` stops retrying once the breaker opens, so the caller can fail over.
+        """
+        health = self.endpoints[index]
+        endpoint = health.endpoint
+        client = self._client_for(index)
+        body = {**request, "model": endpoint.model}
+        answer = _Answer(index=index, model=endpoint.model)
+
+        async def create():
+            trial = guarded and health.breaker.state == "half-open"
+            if guarded and not health.breaker.allow():
+                raise EndpointUnavailable(f"circuit open for {endpoint.name}")
+            try:
+                return await send()
+            finally:
+                if trial:
+                    # no-op after record_success/record_failure; otherwise the trial never ends
+                    health.breaker.release_trial()
+
+        async def send():
+            async with self._semaphore:
+                await self._wait_for_budget(estimated_tokens, endpoint.base_url)
+                self._in_flight += 1
+                self.stats.requests += 1
+                self.stats.max_in_flight = max(self.stats.max_in_flight, self._in_flight)
+                health.requests += 1
+                answer.attempts += 1
+                started = time.perf_counter()
+                try:
+                    response = await client.chat.completions.create(**body)
+                    if consume is not None:
+                        response = await consume(response)
+                except ENDPOINT_FAILURES:
+                    health.record_failure()
+                    raise
+                except asyncio.CancelledError:
+                    health.record_abandoned(time.perf_counter() - started)
+                    raise
+                finally:
+                    self._in_flight -= 1
+                    answer.latency = time.perf_counter() - started
+            health.record_success(answer.latency)
+            self._record_usage(response, estimated_tokens)
+            return response
+
+        answer.response = await acall_with_retry(create, endpoint.base_url, retry_exceptions=RETRYABLE_LLM_ERRORS)
+        return answer
+
+    async def _race(self, request: dict, estimated_tokens: int, consume=None) -> _Answer:
+        """Primary first; hedge to the next endpoint after the primary's p95, fail over on errors."""
+        order = [index for index, health in enumerate(self.endpoints) if health.breaker.state != "open"]
+        # with nowhere to route to, breakers are ignored rather than failing every request
+        guarded = len(order) > 1
+        order = order or list(range(len(self.endpoints)))
+        hedge = settings.llm_hedge_enabled and len(order) > 1
+        tasks: Dict[asyncio.Task, int] = {}
+        errors: List[BaseException] = []
+        fallback: Optional[_Answer] = None
+        hedged = False
+        launched = 0
+        started = time.perf_counter()
+
+        def launch() -> None:
+            nonlocal launched
+            index = order[launched]
+            launched += 1
+            tasks[asyncio.ensure_future(self._attempt(index, request, estimated_tokens, consume, guarded))] = index
+
+        launch()
+        try:
+            while tasks:
+                timeout = None
+                if hedge and launched == 1:
+                    timeout = max(0.0, self.endpoints[order[0]].hedge_delay() - (time.perf_counter() - started))
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # the primary is slower than its p95: send the same request to the next endpoint
+                    hedged = True
+                    self.stats.hedged += 1
+                    logger.info(
+                        "No answer from %s after %.1fs; hedging to %s",
+                        self.endpoints[order[0]].endpoint.name,
+                        time.perf_counter() - started,
+                        self.endpoints[order[1]].endpoint.name,
+                    )
+                    launch()
+                    continue
+                for task in done:
+                    index = tasks.pop(task)
+                    try:
+                        answer = task.result()
+                    except Exception as exc:  # noqa: BLE001
+                        logger.warning("LLM endpoint %s failed: %s", self.endpoints[index].endpoint.name, exc)
+                        errors.append(exc)
+                        continue
+                    answer.hedged = hedged
+                    if _answered(answer.response):
+                        self.endpoints[index].wins += 1
+                        return answer
+                    fallback = fallback or answer
+                if not tasks and fallback is None and launched < len(order):
+                    self.stats.failovers += 1
+                    logger.warning("Failing over to %s", self.endpoints[order[launched]].endpoint.name)
+                    launch()
+            if fallback is not None:
+                return fallback
+            raise errors[0]
+        finally:
+            # the slower request of a hedged pair is abandoned
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def send(self, request: dict, call: Optional[LLMCallRecord] = None, consume=None):
+        return (await self.answer(request, call, consume)).response
+
+    async def answer(self, request: dict, call: Optional[LLMCallRecord] = None, consume=None) -> _Answer:
+        """Like :meth:`send`, but also tells which endpoint answered."""
+        estimated_tokens = (
+            sum(estimate_tokens(message["content"]) for message in request["messages"]) + COMPLETION_TOKENS_ESTIMATE
+        )
+        leader = False
+        if not self._warmed.is_set():
+            if self._warming:
+                await self._warmed.wait()
+            else:
+                self._warming = leader = True
+        started = time.perf_counter()
+        try:
+            answer = await self._race(request, estimated_tokens, consume)
+        finally:
+            if leader:
+                self._warmed.set()
+        if call is not None:
+            endpoint = self.endpoints[answer.index].endpoint
+            call.model = endpoint.model
+            call.endpoint = endpoint.name if len(self.endpoints) > 1 else None
+            call.hedged = answer.hedged
+            call.retries = answer.attempts - 1
+            # what the paper waited, including a hedge delay or failed endpoints, not just the winner's time
+            call.latency_ms = (time.perf_counter() - started) * 1000
+        return answer
+
+
+async def _acall_structured(
+    client: AsyncLLMClient, prompt: str, call: Optional[LLMCallRecord], schema: OutputSchema
+) -> Optional[dict]:
+    answer = await client.answer(
+        build_chat_request(prompt, structured=True), call, consume=lambda stream: aread_stream(stream, schema)
+    )
+    output = answer.response
+    if call is not None:
+        call.observe(output)
+    if not output.complete:
+        logger.info("Repairing DeepSeek structured output: %s", describe(output))
+        repair_call = repair_call_record(call)
+        try:
+            response = await client.send(build_repair_request(output), repair_call)
+            merge_repair(output, response, repair_call, schema)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("DeepSeek repair request failed: %s", exc)
+            if repair_call is not None:
+                repair_call.error = f"{type(exc).__name__}: {exc}"
+        if repair_call is not None:
+            await asyncio.to_thread(save_llm_calls, [repair_call])
+    return structured_payload(output, analysis_cache_key(prompt, answer.model), call)
+
+
+async def acall_deepseek(
+    prompt: str,
+    client: Optional[AsyncLLMClient],
+    use_cache: bool = True,
+    call: Optional[LLMCallRecord] = None,
+    schema: OutputSchema = ANALYSIS_SCHEMA,
+) -> Optional[dict]:
+    """Async variant of :func:`call_deepseek` on a shared :class:`AsyncLLMClient`.
+
+    The cache is looked up under the primary model; an answer from a fallback endpoint is
+    stored under that endpoint's model, so it is never served later as the primary's output.
+    """
+    if not settings.deepseek_api_key or client is None:
+        logger.warning("DeepSeek API key not configured; using heuristic fallback.")
+        return None
+    logger.debug("DeepSeek prompt: %s", prompt)
+    key = analysis_cache_key(prompt)
+    payload = cached_payload(key, use_cache, call)
+    if payload is not None:
+        return payload
+    if settings.llm_structured_output:
+        return await _acall_structured(client, prompt, call, schema)
+    answer = await client.answer(build_chat_request(prompt), call)
+    return decode_completion(answer.response, analysis_cache_key(prompt, answer.model), call)
 
 
 def parse_metrics(raw_metrics: List[dict]) -> List[Metric]:
@@ -200,15 +793,20 @@ def heuristic_analysis(paper: ArxivPaper) -> LLMAnalysis:
     )
 
 
-def analyze_paper_with_llm(paper: ArxivPaper, context_sections: Optional[List[str]] = None) -> LLMAnalysis:
-    prompt = build_prompt(paper, context_sections)
+def _log_invocation(paper: ArxivPaper, prompt: str, tier: str = TIER_FULL) -> None:
     logger.info(
-        "Invoking DeepSeek for arXiv %s with model %s (prompt length=%d chars)",
+        "Invoking DeepSeek for arXiv %s with model %s, %s tier (prompt length=%d chars, ~%d tokens)",
         paper.arxiv_id,
         settings.deepseek_model,
+        tier,
         len(prompt),
+        estimate_tokens(prompt),
     )
-    payload = call_deepseek(prompt)
+
+
+def analysis_from_payload(
+    paper: ArxivPaper, payload: Optional[dict], call: Optional[LLMCallRecord] = None
+) -> LLMAnalysis:
     if payload:
         try:
             logger.debug(
@@ -216,9 +814,73 @@ def analyze_paper_with_llm(paper: ArxivPaper, context_sections: Optional[List[st
                 paper.arxiv_id,
                 json.dumps(payload, ensure_ascii=False)[:2000],
             )
-            return parse_llm_analysis(payload)
+            analysis = parse_llm_analysis(payload)
         except (ValueError, TypeError):
             logger.exception("Parsing DeepSeek payload failed; falling back to heuristic for %s", paper.arxiv_id)
             return heuristic_analysis(paper)
+        analysis.llm_model = call.model if call else settings.deepseek_model
+        analysis.llm_version = call.llm_version if call else None
+        if call is not None:
+            call.parse_ok = True
+        return analysis
     logger.warning("DeepSeek call yielded no payload for %s; using heuristic analysis", paper.arxiv_id)
-    return heuristic_analysis(paper)
\ No newline at end of file
+    return heuristic_analysis(paper)
+
+
+def new_call_record(paper: ArxivPaper, mode: str, tier: str, step: str = "single") -> LLMCallRecord:
+    return LLMCallRecord(
+        arxiv_id=paper.arxiv_id,
+        model=settings.deepseek_model,
+        mode=mode,
+        tier=tier,
+        step=step,
+        prompt_layout=prompt_layout(),
+    )
+
+
+def save_call_record(call: LLMCallRecord) -> None:
+    # nothing to account for when no request was attempted (no API key configured)
+    if call.cache_hit or call.latency_ms is not None or call.error:
+        save_llm_calls([call])
+
+
+def analyze_paper_with_llm(
+    paper: ArxivPaper,
+    context_sections: Optional[List[str]] = None,
+    use_cache: bool = True,
+    tier: str = TIER_FULL,
+) -> LLMAnalysis:
+    prompt = build_prompt(paper, context_sections, tier)
+    _log_invocation(paper, prompt, tier)
+    call = new_call_record(paper, "sync", tier)
+    try:
+        payload = call_deepseek(prompt, use_cache=use_cache, call=call)
+    except Exception as exc:
+        call.error = f"{type(exc).__name__}: {exc}"
+        save_call_record(call)
+        raise
+    analysis = analysis_from_payload(paper, payload, call)
+    save_call_record(call)
+    return analysis
+
+
+async def analyze_paper_with_llm_async(
+    paper: ArxivPaper,
+    client: Optional[AsyncLLMClient],
+    context_sections: Optional[List[str]] = None,
+    use_cache: bool = True,
+    tier: str = TIER_FULL,
+) -> LLMAnalysis:
+    prompt = build_prompt(paper, context_sections, tier)
+    _log_invocation(paper, prompt, tier)
+    call = new_call_record(paper, "async", tier)
+    try:
+        payload = await acall_deepseek(prompt, client, use_cache=use_cache, call=call)
+    except Exception as exc:
+        call.error = f"{type(exc).__name__}: {exc}"
+        await asyncio.to_thread(save_call_record, call)
+        raise
+    analysis = analysis_from_payload(paper, payload, call)
+    # SQLite writes block; keep them off the shared event loop
+    await asyncio.to_thread(save_call_record, call)
+    return analysis
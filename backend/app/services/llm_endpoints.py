@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, List, Optional
+from urllib.parse import urlsplit
+
+from app.core.config import settings
+from app.services.llm_usage import percentile
+
+HEDGE_PERCENTILE = 0.95
+LATENCY_WINDOW = 200  # recent successful request durations kept per endpoint
+MIN_LATENCY_SAMPLES = 20  # below this, LLM_HEDGE_DELAY stands in for the observed p95
+
+logger = logging.getLogger("llm")
+
+
+@dataclass(frozen=True)
+class LLMEndpoint:
+    base_url: str
+    model: str
+    api_key: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return f"{urlsplit(self.base_url).hostname or self.base_url}/{self.model}"
+
+
+def configured_endpoints() -> List[LLMEndpoint]:
+    """The DeepSeek endpoint first, then the ``LLM_ENDPOINTS`` fallbacks in order."""
+    primary = LLMEndpoint(settings.deepseek_base_url, settings.deepseek_model, settings.deepseek_api_key)
+    return [primary] + [LLMEndpoint(**item) for item in settings.llm_endpoints]
+
+
+class EndpointUnavailable(RuntimeError):
+    """Raised instead of sending a request to an endpoint whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Opens after ``failures`` consecutive errors; after ``cooldown`` seconds one trial request
+    is let through, and its outcome closes or re-opens the breaker."""
+
+    def __init__(
+        self,
+        name: str,
+        failures: Optional[int] = None,
+        cooldown: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failures = max(1, failures or settings.llm_breaker_failures)
+        self.cooldown = settings.llm_breaker_cooldown if cooldown is None else cooldown
+        self.clock = clock
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if self.clock() - self.opened_at >= self.cooldown else "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._trial:
+            self._trial = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info("LLM endpoint %s recovered; circuit closed", self.name)
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    def release_trial(self) -> None:
+        """End a half-open trial that gave no verdict (cancelled by a hedge, or a non-endpoint error),
+        so the next request may try again."""
+        self._trial = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self._trial or (self.opened_at is None and self.consecutive_failures >= self.failures):
+            logger.warning(
+                "LLM endpoint %s failed %d times in a row; circuit open for %.0fs",
+                self.name,
+                self.consecutive_failures,
+                self.cooldown,
+            )
+            self.opened_at = self.clock()
+        self._trial = False
+
+
+class EndpointHealth:
+    """Latency window and circuit breaker of one endpoint."""
+
+    def __init__(self, endpoint: LLMEndpoint) -> None:
+        self.endpoint = endpoint
+        self.breaker = CircuitBreaker(endpoint.name)
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.failures = 0
+        self.wins = 0  # races this endpoint answered first
+
+    def record_success(self, seconds: float) -> None:
+        self.latencies.append(seconds)
+        self.breaker.record_success()
+
+    def record_abandoned(self, seconds: float) -> None:
+        # a request cancelled because the hedge won took at least this long; leaving it out
+        # would keep only the fast answers and pull the p95 (and the hedge delay) ever lower
+        self.latencies.append(seconds)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.breaker.record_failure()
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait for this endpoint before hedging: its p95 latency, at least LLM_HEDGE_MIN_DELAY."""
+        if len(self.latencies) < MIN_LATENCY_SAMPLES:
+            return settings.llm_hedge_delay
+        p95 = percentile(list(self.latencies), HEDGE_PERCENTILE) or settings.llm_hedge_delay
+        return max(p95, settings.llm_hedge_min_delay)
+
+    def summary(self) -> str:
+        p95 = percentile(list(self.latencies), HEDGE_PERCENTILE)
+        latency = f"{p95:.1f}s" if p95 is not None else "n/a"
+        return (
+            f"{self.endpoint.name}: requests={self.requests} failures={self.failures} wins={self.wins} "
+            f"p95={latency} circuit={self.breaker.state}"
+        )
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.services.llm_client import (
+    AsyncLLMClient,
+    acall_deepseek,
+    analysis_from_payload,
+    call_deepseek,
+    new_call_record,
+    parse_llm_analysis,
+    render_prompt,
+    save_call_record,
+)
+from app.services.llm_structured import FINDINGS_FORMAT, OutputSchema
+from app.services.llm_usage import LLMCallRecord
+from app.services.prompt_budget import SectionChunk, chunk_sections, paper_tokens, truncate_to_tokens
+from app.services.triage import TIER_FULL
+from app.services.types import ArxivPaper, LLMAnalysis
+
+# Static instructions first, like the prefix-cache analysis prompt, so map calls share a cached prefix
+MAP_TASK_PROMPT = """整篇论文被拆成多个部分分别分析，你将看到其中一个部分。请仅依据这一部分的内容，用简体中文完成：
+1. summary：用 2-4 句话概括这一部分的要点（问题、方法细节、实验设置或结果），保留关键数值。
+2. findings：列出这一部分中有实验或数据支撑的结论，每条包含 claim_text、experiment_design、evidence_snippet、metrics（对象数组，字段包括 name/dataset/value/unit/baseline/delta/raw，缺失可置 null）；没有则返回空数组。
+3. keywords：3-5 个小写关键词。
+
+返回 JSON 结构如下：
+{"summary": "……", "findings": [], "keywords": ["…"]}
+"""
+
+MAP_CONTEXT_TEMPLATE = """
+论文：{title}（arXiv {arxiv_id}）
+第 {index}/{total} 部分，包含章节：{headings}
+
+{content}
+"""
+
+MAP_SCHEMA = OutputSchema(
+    required=("summary", "findings", "keywords"),
+    core=("summary",),
+    formats={
+        "summary": "字符串，用 2-4 句话概括这一部分的要点，保留关键数值",
+        "findings": FINDINGS_FORMAT + "，没有则为空数组",
+        "keywords": "3-5 个小写关键词组成的字符串数组",
+    },
+)
+
+REDUCE_NOTE = "（正文过长，已分为 {total} 个部分分别分析。以下为各部分的摘要与候选结论，请综合全部部分作答，保留有数据支撑的结论及其指标，合并重复项。）"
+
+# raw text kept in the reduce prompt for a chunk whose map call failed
+FAILED_CHUNK_TOKENS = 800
+
+logger = logging.getLogger("llm")
+
+
+@dataclass
+class ChunkResult:
+    chunk: SectionChunk
+    summary: str = ""
+    findings: List[dict] = field(default_factory=list)
+    ok: bool = False
+
+
+def needs_map_reduce(paper: ArxivPaper) -> bool:
+    """True when map-reduce is enabled and the paper would not fit the single-prompt budget."""
+    if not settings.llm_map_reduce or not settings.deepseek_api_key:
+        return False
+    return paper_tokens(paper.sections, paper.raw_text) > settings.llm_prompt_token_budget
+
+
+def map_prompts(paper: ArxivPaper) -> List[Tuple[SectionChunk, str]]:
+    chunks, skipped = chunk_sections(
+        paper.sections,
+        settings.llm_map_chunk_tokens,
+        raw_text=paper.raw_text,
+        max_chunks=settings.llm_map_max_chunks,
+    )
+    logger.info(
+        "Map-reduce for %s: %d chunks of %s tokens; skipped [%s]",
+        paper.arxiv_id,
+        len(chunks),
+        "/".join(str(chunk.tokens) for chunk in chunks),
+        ", ".join(skipped) or "none",
+    )
+    return [
+        (
+            chunk,
+            MAP_TASK_PROMPT
+            + MAP_CONTEXT_TEMPLATE.format(
+                title=paper.title,
+                arxiv_id=paper.arxiv_id,
+                index=index,
+                total=len(chunks),
+                headings=", ".join(chunk.headings),
+                content="\n".join(chunk.texts),
+            ),
+        )
+        for index, chunk in enumerate(chunks, 1)
+    ]
+
+
+def chunk_result(chunk: SectionChunk, payload: Optional[dict], call: LLMCallRecord) -> ChunkResult:
+    if not isinstance(payload, dict):
+        return ChunkResult(chunk)
+    findings = [item for item in payload.get("findings") or [] if isinstance(item, dict) and item.get("claim_text")]
+    call.parse_ok = True
+    return ChunkResult(chunk, summary=str(payload.get("summary") or ""), findings=findings, ok=True)
+
+
+def reduce_prompt(paper: ArxivPaper, results: Sequence[ChunkResult]) -> str:
+    parts = [REDUCE_NOTE.format(total=len(results))]
+    for index, result in enumerate(results, 1):
+        header = f"[第 {index} 部分：{', '.join(result.chunk.headings)}]"
+        if result.ok:
+            findings = json.dumps(result.findings, ensure_ascii=False)
+            parts.append(f"{header}\n摘要：{result.summary}\n候选结论：{findings}")
+        else:
+            # never drop a chunk silently: fall back to the start of its text
+            excerpt = truncate_to_tokens("\n".join(result.chunk.texts), FAILED_CHUNK_TOKENS)
+            parts.append(f"{header}\n（该部分分析失败，以下为原文节选）\n{excerpt}")
+    return render_prompt(paper, parts)
+
+
+def merge_analysis(
+    paper: ArxivPaper, payload: Optional[dict], results: Sequence[ChunkResult], call: LLMCallRecord
+) -> LLMAnalysis:
+    analysis = analysis_from_payload(paper, payload, call)
+    if not analysis.findings:
+        # the reduce call (or its heuristic fallback) kept no findings; use the mapped ones
+        # a section split across chunks can report the same claim twice
+        mapped = {}
+        for result in results:
+            for finding in result.findings:
+                mapped.setdefault(" ".join(str(finding["claim_text"]).lower().split()), finding)
+        analysis.findings = parse_llm_analysis({"findings": list(mapped.values())}).findings
+    return analysis
+
+
+def _log_done(paper: ArxivPaper, calls: Sequence[LLMCallRecord]) -> None:
+    latencies = [call.latency_ms for call in calls if call.latency_ms is not None]
+    logger.info(
+        "Map-reduce for %s done: %d/%d chunks parsed, slowest chunk %.0f ms",
+        paper.arxiv_id,
+        sum(1 for call in calls if call.parse_ok),
+        len(calls),
+        max(latencies, default=0.0),
+    )
+
+
+def _save_all(calls: Sequence[LLMCallRecord]) -> None:
+    for call in calls:
+        save_call_record(call)
+
+
+def analyze_long_paper_with_llm(paper: ArxivPaper, use_cache: bool = True) -> LLMAnalysis:
+    """Map each chunk of a long paper in parallel threads, then reduce into one :class:`LLMAnalysis`."""
+    prompts = map_prompts(paper)
+    calls = [new_call_record(paper, "sync", TIER_FULL, step="map") for _ in prompts]
+
+    def run_map(index: int) -> Optional[dict]:
+        try:
+            return call_deepseek(prompts[index][1], use_cache=use_cache, call=calls[index], schema=MAP_SCHEMA)
+        except Exception as exc:  # noqa: BLE001
+            calls[index].error = f"{type(exc).__name__}: {exc}"
+            logger.warning("Map call %d for %s failed: %s", index + 1, paper.arxiv_id, exc)
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, len(prompts)), thread_name_prefix="llm-map") as pool:
+        payloads = list(pool.map(run_map, range(len(prompts))))
+    results = [chunk_result(chunk, payload, call) for (chunk, _), payload, call in zip(prompts, payloads, calls)]
+    _log_done(paper, calls)
+    reduce_call = new_call_record(paper, "sync", TIER_FULL, step="reduce")
+    try:
+        payload = call_deepseek(reduce_prompt(paper, results), use_cache=use_cache, call=reduce_call)
+    except Exception as exc:
+        reduce_call.error = f"{type(exc).__name__}: {exc}"
+        _save_all([*calls, reduce_call])
+        raise
+    analysis = merge_analysis(paper, payload, results, reduce_call)
+    _save_all([*calls, reduce_call])
+    return analysis
+
+
+async def analyze_long_paper_with_llm_async(
+    paper: ArxivPaper, client: Optional[AsyncLLMClient], use_cache: bool = True
+) -> LLMAnalysis:
+    """Async :func:`analyze_long_paper_with_llm`: map calls share the client's concurrency and budgets."""
+    prompts = map_prompts(paper)
+    calls = [new_call_record(paper, "async", TIER_FULL, step="map") for _ in prompts]
+
+    async def run_map(index: int) -> Optional[dict]:
+        try:
+            return await acall_deepseek(
+                prompts[index][1], client, use_cache=use_cache, call=calls[index], schema=MAP_SCHEMA
+            )
+        except Exception as exc:  # noqa: BLE001
+            calls[index].error = f"{type(exc).__name__}: {exc}"
+            logger.warning("Map call %d for %s failed: %s", index + 1, paper.arxiv_id, exc)
+            return None
+
+    payloads = await asyncio.gather(*(run_map(index) for index in range(len(prompts))))
+    results = [chunk_result(chunk, payload, call) for (chunk, _), payload, call in zip(prompts, payloads, calls)]
+    _log_done(paper, calls)
+    reduce_call = new_call_record(paper, "async", TIER_FULL, step="reduce")
+    try:
+        payload = await acall_deepseek(reduce_prompt(paper, results), client, use_cache=use_cache, call=reduce_call)
+    except Exception as exc:
+        reduce_call.error = f"{type(exc).__name__}: {exc}"
+        await asyncio.to_thread(_save_all, [*calls, reduce_call])
+        raise
+    analysis = merge_analysis(paper, payload, results, reduce_call)
+    # SQLite writes block; keep them off the shared event loop
+    await asyncio.to_thread(_save_all, [*calls, reduce_call])
+    return analysis
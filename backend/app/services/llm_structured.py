@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger("llm")
+
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+# room for a "```json" fence before the object; anything longer is prose, not JSON
+MAX_PREAMBLE_CHARS = 16
+# previous output quoted back in a repair request
+REPAIR_EXCERPT_CHARS = 4000
+
+REPAIR_PROMPT_TEMPLATE = """你上一次的输出不是合法的 JSON，或部分字段不符合要求：
+{problems}
+
+已通过校验的字段（保持不变，无需重复输出）：
+{valid}
+
+上一次输出的相关片段：
+{excerpt}
+
+请只输出一个 JSON 对象，且只包含以下字段：{fields}。各字段格式：
+{formats}"""
+
+# the findings array as TASK_TEMPLATE (and the map-reduce prompt) describe it
+FINDINGS_FORMAT = (
+    "对象数组，每条包含 claim_text（一句话结论）、experiment_design（实验设计）、evidence_snippet（原文关键句）、"
+    "metrics（对象数组，字段包括 name/dataset/value/unit/baseline/delta/raw，缺失可置 null）"
+)
+
+
+class StreamAborted(ValueError):
+    """The streamed completion can no longer become a JSON object."""
+
+
+def _text(value: Any) -> str:
+    if not isinstance(value, str):
+        raise ValueError(f"expected a string, got {type(value).__name__}")
+    return value.strip()
+
+
+def _keywords(value: Any) -> list:
+    if not isinstance(value, list):
+        raise ValueError("expected an array of strings")
+    return [item for item in value if isinstance(item, str) and item.strip()]
+
+
+def _score(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError("expected a number between 0 and 1")
+    score = float(value)
+    if not 0.0 <= score <= 1.0:
+        raise ValueError(f"{score} is outside 0-1")
+    return score
+
+
+def _label(value: Any) -> bool:
+    if not isinstance(value, bool):
+        raise ValueError("expected true or false")
+    return value
+
+
+def _findings(value: Any) -> list:
+    if not isinstance(value, list):
+        raise ValueError("expected an array of findings")
+    kept = []
+    for item in value:
+        # a single malformed finding is dropped, not the whole array
+        if not isinstance(item, dict) or not isinstance(item.get("claim_text"), str) or not item["claim_text"].strip():
+            continue
+        metrics = item.get("metrics")
+        kept.append({**item, "metrics": [m for m in metrics if isinstance(m, dict)] if isinstance(metrics, list) else []})
+    if value and not kept:
+        raise ValueError("no finding has a claim_text")
+    return kept
+
+
+FIELD_VALIDATORS: Dict[str, Callable[[Any], Any]] = {
+    "problem": _text,
+    "solution": _text,
+    "effect": _text,
+    "summary": _text,
+    "breakthrough_reason": _text,
+    "keywords": _keywords,
+    "findings": _findings,
+    "breakthrough_score": _score,
+    "breakthrough_label": _label,
+}
+
+
+@dataclass(frozen=True)
+class OutputSchema:
+    required: Tuple[str, ...]
+    core: Tuple[str, ...]  # fields worth keeping on their own when the rest is broken
+    # field -> expected format, quoted in repair requests (which do not repeat the original task)
+    formats: Mapping[str, str] = field(default_factory=dict, compare=False)
+
+
+ANALYSIS_SCHEMA = OutputSchema(
+    required=(
+        "problem",
+        "solution",
+        "effect",
+        "findings",
+        "keywords",
+        "breakthrough_score",
+        "breakthrough_label",
+        "breakthrough_reason",
+    ),
+    core=("problem", "solution", "effect"),
+    formats={
+        "problem": "字符串，用 1-2 句话概述论文要解决的核心问题",
+        "solution": "字符串，用 1-2 句话提炼论文提出的主要方案或方法",
+        "effect": "字符串，描述主要效果/成果，尽量列出关键量化指标或相对提升",
+        "findings": FINDINGS_FORMAT + "，至少 1 条",
+        "keywords": "5-8 个关键词组成的字符串数组，全部小写，必要时可用连字符",
+        "breakthrough_score": "0-1 之间的浮点数",
+        "breakthrough_label": "true 或 false，当且仅当 breakthrough_score ≥ {threshold} 时为 true",
+        "breakthrough_reason": "字符串，不超过 30 个汉字的判定理由",
+    },
+)
+
+
+@dataclass
+class StructuredOutput:
+    """Validated fields of one (streamed) completion, plus why the others were rejected.
+
+    ``usage``/``model``/``system_fingerprint`` come from the stream's chunks, so the object
+    can stand in for a chat completion in usage accounting.
+    """
+
+    schema: OutputSchema
+    payload: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    text: str = ""
+    aborted: bool = False
+    usage: Any = None
+    model: Optional[str] = None
+    system_fingerprint: Optional[str] = None
+
+    @property
+    def complete(self) -> bool:
+        return all(key in self.payload for key in self.schema.required)
+
+    @property
+    def salvageable(self) -> bool:
+        return any(self.payload.get(key) for key in self.schema.core)
+
+    @property
+    def invalid_fields(self) -> list:
+        return [key for key in self.schema.required if key not in self.payload]
+
+    def merge(self, repair: "StructuredOutput") -> None:
+        """Fill the fields this output lacks from a repair answer; valid fields are never replaced."""
+        for key in self.invalid_fields:
+            if key in repair.payload:
+                self.payload[key] = repair.payload[key]
+        self.errors = {key: reason for key, reason in self.errors.items() if key not in self.payload}
+
+
+_MEMBER_KEY = re.compile(r'^\s*"((?:[^"\\]|\\.)*)"\s*:')
+
+
+def _member_key(raw: str) -> str:
+    match = _MEMBER_KEY.match(raw)
+    return match.group(1) if match else "?"
+
+
+class StreamingJSONObject:
+    """Splits a JSON object arriving in fragments into top-level members as each one closes.
+
+    Every completed member is validated right away, so a broken ``findings`` array does not
+    cost the valid ``problem``/``solution``/``effect`` before it. Output that cannot be a
+    JSON object raises :class:`StreamAborted` after a few characters.
+    """
+
+    def __init__(self, schema: OutputSchema) -> None:
+        self.output = StructuredOutput(schema=schema)
+        self.closed = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = -1  # set once the opening brace arrives
+
+    def observe(self, chunk) -> None:
+        """Consume one chat-completion stream chunk."""
+        self.output.model = getattr(chunk, "model", None) or self.output.model
+        self.output.system_fingerprint = getattr(chunk, "system_fingerprint", None) or self.output.system_fingerprint
+        if getattr(chunk, "usage", None) is not None:
+            self.output.usage = chunk.usage
+        if chunk.choices and chunk.choices[0].delta.content:
+            self.feed(chunk.choices[0].delta.content)
+
+    def feed(self, fragment: str) -> None:
+        self.output.text += fragment
+        if self.closed:
+            return
+        text = self.output.text
+        while self._pos < len(text):
+            char = text[self._pos]
+            if self._member_start < 0:
+                if char == "{":
+                    self._depth = 1
+                    self._member_start = self._pos + 1
+                elif self._pos >= MAX_PREAMBLE_CHARS:
+                    raise StreamAborted(f"no JSON object in {text[:40]!r}")
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._member(text[self._member_start : self._pos])
+                    self.closed = True
+                    return
+            elif char == "," and self._depth == 1:
+                self._member(text[self._member_start : self._pos])
+                self._member_start = self._pos + 1
+            self._pos += 1
+
+    def _member(self, raw: str) -> None:
+        if not raw.strip():
+            return
+        try:
+            [(key, value)] = json.loads("{" + raw + "}").items()
+        except (ValueError, TypeError):
+            self.output.errors[_member_key(raw)] = f"invalid JSON: {raw.strip()[:80]}"
+            return
+        validator = FIELD_VALIDATORS.get(key)
+        if validator is None:
+            return
+        try:
+            self.output.payload[key] = validator(value)
+        except ValueError as exc:
+            self.output.errors[key] = str(exc)
+
+    def finish(self, aborted: bool = False) -> StructuredOutput:
+        output = self.output
+        output.aborted = aborted
+        if self._member_start < 0:
+            output.errors["*"] = "no JSON object"
+        elif not self.closed:
+            output.errors[_member_key(output.text[self._member_start :])] = "truncated"
+        for key in output.schema.required:
+            if key not in output.payload:
+                output.errors.setdefault(key, "missing")
+        return output
+
+
+def read_stream(stream, schema: OutputSchema) -> StructuredOutput:
+    parser = StreamingJSONObject(schema)
+    try:
+        for chunk in stream:
+            parser.observe(chunk)
+    except StreamAborted as exc:
+        logger.warning("Abandoning streamed completion: %s", exc)
+        stream.close()
+        return parser.finish(aborted=True)
+    return parser.finish()
+
+
+async def aread_stream(stream, schema: OutputSchema) -> StructuredOutput:
+    parser = StreamingJSONObject(schema)
+    try:
+        async for chunk in stream:
+            parser.observe(chunk)
+    except StreamAborted as exc:
+        logger.warning("Abandoning streamed completion: %s", exc)
+        await stream.close()
+        return parser.finish(aborted=True)
+    return parser.finish()
+
+
+def parse_structured(content: str, schema: OutputSchema) -> StructuredOutput:
+    """Validate a complete (non-streamed) answer, e.g. the reply to a repair request."""
+    parser = StreamingJSONObject(schema)
+    try:
+        parser.feed(content)
+    except StreamAborted:
+        return parser.finish(aborted=True)
+    return parser.finish()
+
+
+def repair_prompt(output: StructuredOutput) -> str:
+    """A short follow-up asking only for the missing or invalid fields, without the paper again.
+
+    It is a fresh conversation, so the expected format of each field comes from the schema.
+    """
+    fields = output.invalid_fields
+    formats = "\n".join(
+        f"- {key}：{output.schema.formats.get(key, 'JSON 值')}".replace("{threshold}", str(settings.breakthrough_threshold))
+        for key in fields
+    )
+    problems = "\n".join(f"- {key}：{reason}" for key, reason in output.errors.items())
+    # quote the output from where the first broken field starts
+    positions = [output.text.find(f'"{key}"') for key in fields]
+    start = min((position for position in positions if position >= 0), default=0)
+    return REPAIR_PROMPT_TEMPLATE.format(
+        problems=problems or "- 输出不完整",
+        valid=json.dumps(output.payload, ensure_ascii=False),
+        excerpt=output.text[start : start + REPAIR_EXCERPT_CHARS] or "（空）",
+        fields=", ".join(fields),
+        formats=formats,
+    )
+
+
+def describe(output: StructuredOutput) -> str:
+    kept = ", ".join(sorted(output.payload)) or "none"
+    broken = ", ".join(f"{key} ({reason})" for key, reason in output.errors.items()) or "none"
+    return f"kept [{kept}]; invalid [{broken}]" + (" after abort" if output.aborted else "")
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence
+
+from app.db.session import session_scope, write_lock
+from app.models import LLMCall
+
+logger = logging.getLogger("llm")
+
+
+@dataclass
+class LLMCallRecord:
+    """Accounting for one paper analysis: a live LLM request, a cache hit, or a batch line."""
+
+    arxiv_id: str
+    model: str
+    mode: str = "sync"  # sync / async / batch
+    tier: str = "full"  # triage tier: full / lite
+    step: str = "single"  # single prompt, map / reduce for chunked long papers, or repair
+    prompt_layout: Optional[str] = None  # prefix (static instructions first) / legacy
+    endpoint: Optional[str] = None  # host/model that answered, when LLM_ENDPOINTS lists fallbacks
+    hedged: bool = False  # the request was also sent to a second endpoint after the primary's p95
+    llm_version: Optional[str] = None  # model id (and system fingerprint) reported by the API
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0  # prompt tokens served from the provider's prefix cache
+    latency_ms: Optional[float] = None  # wait from the first attempt to the answer; None for cache hits and batches
+    retries: int = 0
+    cache_hit: bool = False  # answered from the local LLM response cache
+    parse_ok: bool = False
+    error: Optional[str] = None
+
+    def observe(self, response) -> None:
+        """Copy token usage and the served model version from a chat completion."""
+        self.llm_version = served_version(response) or self.llm_version
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        self.prompt_tokens = usage.prompt_tokens or 0
+        self.completion_tokens = usage.completion_tokens or 0
+        self.cached_tokens = cached_prompt_tokens(usage)
+
+
+def served_version(response) -> Optional[str]:
+    model = getattr(response, "model", None)
+    if not model:
+        return None
+    fingerprint = getattr(response, "system_fingerprint", None)
+    return f"{model}:{fingerprint}" if fingerprint else model
+
+
+def cached_prompt_tokens(usage) -> int:
+    # DeepSeek reports prefix-cache hits as prompt_cache_hit_tokens, OpenAI as prompt_tokens_details.cached_tokens
+    extra = getattr(usage, "model_extra", None) or {}
+    if extra.get("prompt_cache_hit_tokens") is not None:
+        return int(extra["prompt_cache_hit_tokens"])
+    details = getattr(usage, "prompt_tokens_details", None)
+    return int(getattr(details, "cached_tokens", 0) or 0)
+
+
+def save_llm_calls(records: Iterable[LLMCallRecord]) -> None:
+    rows = [LLMCall(**record.__dict__) for record in records]
+    if not rows:
+        return
+    try:
+        with write_lock, session_scope() as session:
+            session.add_all(rows)
+    except Exception:  # noqa: BLE001
+        # accounting must never fail an analysis
+        logger.exception("Failed to record %d LLM calls", len(rows))
+
+
+def percentile(values: Sequence[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of ``values`` (``fraction`` in 0..1), or None when empty."""
+    if not values:
+        return None
+    ordered: List[float] = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
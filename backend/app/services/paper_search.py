@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import html
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlmodel import Session
+
+from app.models import Paper
+
+SEARCH_TABLE = "paper_fts"
+# bm25 weight of each column, in table order: a title hit outranks one buried in a finding
+COLUMN_WEIGHTS = {"title": 10.0, "abstract": 4.0, "problem": 2.0, "solution": 2.0, "effect": 2.0, "findings": 1.0}
+
+# unicode61 keeps a run of CJK characters as one token, so "推理" would only match a whole
+# sentence. Indexed and queried text gets a zero-width space between CJK characters instead:
+# every character becomes a token and a multi-character word is matched as a phrase.
+CJK = "\u2e80-\u9fff\uac00-\ud7af\uf900-\ufaff"
+TOKEN_SEPARATOR = "\u200b"
+_CJK_BOUNDARY = re.compile(f"(?<=[{CJK}])(?=\\S)|(?<=\\S)(?=[{CJK}])")
+
+CREATE_SEARCH_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+    + ", ".join(COLUMN_WEIGHTS)
+    + f", tokenize = \"porter unicode61 remove_diacritics 2 separators '{TOKEN_SEPARATOR}'\")"
+)
+
+# private-use markers survive html.escape, then become <mark> tags
+_HIGHLIGHT_OPEN, _HIGHLIGHT_CLOSE = "\ue000", "\ue001"
+SNIPPET_TOKENS = 32
+
+
+@dataclass
+class SearchHit:
+    paper_id: int
+    score: float  # negated BM25: higher is more relevant
+    snippet: str  # HTML-escaped, matches wrapped in <mark>
+
+
+def search_text(value: Optional[str]) -> str:
+    return _CJK_BOUNDARY.sub(TOKEN_SEPARATOR, value or "")
+
+
+def match_query(query: str) -> Optional[str]:
+    """FTS5 MATCH expression for free-text input: every term must match, as a quoted phrase.
+
+    Quoting keeps user input from being parsed as FTS5 syntax (AND/OR/NEAR, column filters, ``*``).
+    """
+    terms = [term.replace('"', "") for term in query.split()]
+    phrases = [f'"{search_text(term)}"' for term in terms if term.strip("\"'")]
+    return " ".join(phrases) or None
+
+
+def create_search_table(connection: Connection) -> None:
+    connection.execute(text(CREATE_SEARCH_TABLE))
+
+
+def _insert(connection: Connection, rows: List[dict]) -> None:
+    columns = ", ".join(COLUMN_WEIGHTS)
+    values = ", ".join(f":{name}" for name in COLUMN_WEIGHTS)
+    connection.execute(text(f"INSERT INTO {SEARCH_TABLE} (rowid, {columns}) VALUES (:id, {values})"), rows)
+
+
+def _document(paper_id: int, title, abstract, problem, solution, effect, claims: Iterable[str]) -> dict:
+    return {
+        "id": paper_id,
+        "title": search_text(title),
+        "abstract": search_text(abstract),
+        "problem": search_text(problem),
+        "solution": search_text(solution),
+        "effect": search_text(effect),
+        "findings": search_text("\n".join(claim for claim in claims if claim)),
+    }
+
+
+def index_paper(session: Session, paper: Paper, claims: Iterable[str]) -> None:
+    """(Re)index a stored paper inside the caller's transaction; ``paper.id`` must be flushed."""
+    remove_paper(session, paper.id)
+    _insert(
+        session.connection(),
+        [
+            _document(
+                paper.id,
+                paper.title,
+                paper.abstract,
+                paper.problem_summary,
+                paper.solution_summary,
+                paper.effect_summary,
+                claims,
+            )
+        ],
+    )
+
+
+def remove_paper(session: Session, paper_id: int) -> None:
+    session.connection().execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :id"), {"id": paper_id})
+
+
+def rebuild_search_index(connection: Connection, batch_size: int = 500) -> int:
+    """Re-index every paper and its findings from scratch; returns the number of papers indexed."""
+    connection.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+    statement = text(
+        "SELECT id, title, abstract, problem_summary, solution_summary, effect_summary, "
+        "(SELECT group_concat(claim_text, char(10)) FROM finding WHERE finding.paper_id = paper.id) "
+        "FROM paper WHERE id > :last ORDER BY id LIMIT :limit"
+    )
+    indexed, last = 0, 0
+    while True:
+        rows = connection.execute(statement, {"last": last, "limit": batch_size}).all()
+        if not rows:
+            break
+        _insert(connection, [_document(*row[:6], (row[6] or "").split("\n")) for row in rows])
+        indexed += len(rows)
+        last = rows[-1][0]
+    # merge the b-tree segments written batch by batch
+    connection.execute(text(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')"))
+    return indexed
+
+
+def _snippet_html(raw: str) -> str:
+    escaped = html.escape(raw.replace(TOKEN_SEPARATOR, ""))
+    return escaped.replace(_HIGHLIGHT_OPEN, "<mark>").replace(_HIGHLIGHT_CLOSE, "</mark>")
+
+
+def search(session: Session, query: str, limit: int = 20, offset: int = 0) -> List[SearchHit]:
+    """BM25-ranked papers matching ``query``, best first, with a highlighted snippet from the best column."""
+    expression = match_query(query)
+    if expression is None:
+        return []
+    weights = ", ".join(str(weight) for weight in COLUMN_WEIGHTS.values())
+    statement = text(
+        f"SELECT rowid, bm25({SEARCH_TABLE}, {weights}) AS score, "
+        f"snippet({SEARCH_TABLE}, -1, :open, :close, '…', {SNIPPET_TOKENS}) "
+        f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :query ORDER BY score LIMIT :limit OFFSET :offset"
+    )
+    rows = session.connection().execute(
+        statement,
+        {"open": _HIGHLIGHT_OPEN, "close": _HIGHLIGHT_CLOSE, "query": expression, "limit": limit, "offset": offset},
+    )
+    return [SearchHit(paper_id, -score, _snippet_html(snippet)) for paper_id, score, snippet in rows]
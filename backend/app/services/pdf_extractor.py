@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import fitz
+
+from app.core.config import settings
+
+# pages handed to one worker at a time; small enough to spread a long paper over the pool
+PAGES_PER_CHUNK = 8
+POLL_INTERVAL = 0.05  # seconds between checks for a free worker or the deadline
+
+logger = logging.getLogger("pdf_extractor")
+
+
+def _extract_pages(path: str, start: int, stop: int) -> str:
+    # runs in a worker process: reopen the file by path instead of pickling the document
+    with fitz.open(path) as doc:
+        return "\n".join(doc[index].get_text("text") for index in range(start, stop))
+
+
+def _ready() -> None:
+    # warm-up task: once it returns, the worker has imported this module and PyMuPDF
+    return None
+
+
+def _page_count(path: Path) -> int:
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+@dataclass
+class PdfText:
+    text: str
+    pages: int  # pages whose text made it into ``text``
+    total_pages: int
+    timed_out: bool = False
+
+
+class PdfExtractor:
+    """PyMuPDF text extraction in a process pool, bounded by a page cap and a timeout.
+
+    Page ranges are extracted in parallel and joined in order. A range is only submitted when
+    a worker is free, so a paper's timeout starts when its first range starts running, not
+    while it waits behind other papers. When the timeout expires the pages finished so far
+    are kept and the paper's unstarted ranges are dropped; a range still running retires the
+    pool: later ranges go to a fresh pool, and the old one's processes are terminated once the
+    other papers' ranges in it have finished. ``workers=0`` extracts inline, which is handy
+    for tests and debugging.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.workers = settings.pdf_workers if workers is None else workers
+        self.max_pages = settings.pdf_max_pages if max_pages is None else max_pages
+        self.timeout = settings.pdf_extract_timeout if timeout is None else timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = threading.Semaphore(max(1, self.workers))  # ranges running, in any pool
+        self._in_flight: Dict[ProcessPoolExecutor, int] = {}  # ranges still awaited, per pool
+        self._abandoned: Set[Future] = set()  # ranges that timed out; their pool is retired
+        self._retired: Set[ProcessPoolExecutor] = set()
+        self._lock = threading.Lock()
+
+    def _submit(self, path: Path, start: int, stop: int) -> Tuple[Future, ProcessPoolExecutor]:
+        """Run one range in the current pool; the caller holds a slot."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._start_pool()
+            executor = self._executor
+            self._in_flight[executor] = self._in_flight.get(executor, 0) + 1
+        try:
+            future = executor.submit(_extract_pages, str(path), start, stop)
+        except BaseException:
+            self._slots.release()
+            self._finish(executor, None)
+            raise
+        future.add_done_callback(lambda done: self._done(executor, done))
+        return future, executor
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        # spawn: the ingest process is multi-threaded, where fork() can deadlock
+        executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        # start every worker now, so no paper's timeout covers process startup
+        wait([executor.submit(_ready) for _ in range(self.workers)])
+        return executor
+
+    def _done(self, executor: ProcessPoolExecutor, future: Future) -> None:
+        self._slots.release()
+        self._finish(executor, future)
+
+    def _finish(self, executor: ProcessPoolExecutor, future: Optional[Future]) -> None:
+        with self._lock:
+            if future in self._abandoned:
+                self._abandoned.discard(future)  # already left the count when it timed out
+                return
+            self._in_flight[executor] -= 1
+            idle = self._idle_retired(executor)
+        if idle:
+            self._terminate_later(executor)
+
+    def _abandon(self, executor_of: Dict[Future, ProcessPoolExecutor]) -> None:
+        """Give up on timed-out ranges: retire their pools, to be terminated once otherwise idle."""
+        idle = []
+        with self._lock:
+            for future, executor in executor_of.items():
+                if future.done():
+                    continue  # finished meanwhile: its callback keeps the count
+                self._abandoned.add(future)
+                self._in_flight[executor] -= 1
+                self._retired.add(executor)
+                if self._executor is executor:
+                    self._executor = None
+            for executor in set(executor_of.values()):
+                if self._idle_retired(executor):
+                    idle.append(executor)
+        for executor in idle:
+            self._terminate_later(executor)
+
+    def _idle_retired(self, executor: ProcessPoolExecutor) -> bool:
+        # caller holds the lock
+        if executor not in self._retired or self._in_flight.get(executor, 0):
+            return False
+        self._retired.discard(executor)
+        self._in_flight.pop(executor, None)
+        return True
+
+    def _terminate_later(self, executor: ProcessPoolExecutor) -> None:
+        # may run in the executor's own management thread (a done callback): terminate from another
+        threading.Thread(target=self._terminate, args=(executor,), daemon=True).start()
+
+    @staticmethod
+    def _terminate(executor: ProcessPoolExecutor) -> None:
+        terminate = getattr(executor, "terminate_workers", None)  # Python 3.14+
+        if terminate is not None:
+            terminate()
+            return
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def chunks(self, total_pages: int) -> List[Tuple[int, int]]:
+        pages = min(total_pages, self.max_pages) if self.max_pages > 0 else total_pages
+        return [(start, min(start + PAGES_PER_CHUNK, pages)) for start in range(0, pages, PAGES_PER_CHUNK)]
+
+    def extract(self, path: Path) -> PdfText:
+        total_pages = _page_count(path)
+        ranges = self.chunks(total_pages)
+        capped = ranges[-1][1] if ranges else 0
+        if capped < total_pages:
+            logger.warning("Truncating %s to %d of %d pages (PDF_MAX_PAGES)", path.name, capped, total_pages)
+
+        if self.workers <= 0:
+            parts = [_extract_pages(str(path), start, stop) for start, stop in ranges]
+            return PdfText("\n".join(parts), sum(stop - start for start, stop in ranges), total_pages)
+
+        futures, timed_out = self._run(path, ranges)
+        finished = [future is not None and future.done() for future in futures]
+        if timed_out:
+            logger.warning(
+                "PDF extraction of %s exceeded %.0fs; keeping %d/%d page ranges",
+                path.name,
+                self.timeout,
+                sum(finished),
+                len(futures),
+            )
+
+        parts: List[str] = []
+        pages = 0
+        for (start, stop), future, done in zip(ranges, futures, finished):
+            if not done:
+                continue
+            try:
+                parts.append(future.result())
+            except Exception as exc:  # noqa: BLE001 - a bad page range should not lose the rest
+                logger.warning("Pages %d-%d of %s failed: %s", start, stop, path.name, exc)
+                continue
+            pages += stop - start
+        return PdfText("\n".join(parts), pages, total_pages, timed_out=timed_out)
+
+    def _run(self, path: Path, ranges: List[Tuple[int, int]]) -> Tuple[List[Optional[Future]], bool]:
+        """Run ``ranges`` as workers free up; returns their futures (None if never started) and
+        whether the timeout expired."""
+        futures: List[Optional[Future]] = [None] * len(ranges)
+        executor_of: Dict[Future, ProcessPoolExecutor] = {}
+        queued = list(range(len(ranges)))
+        deadline: Optional[float] = None
+        while True:
+            while queued and self._slots.acquire(blocking=False):
+                index = queued.pop(0)
+                future, executor = self._submit(path, *ranges[index])
+                futures[index], executor_of[future] = future, executor
+                if deadline is None and self.timeout > 0:
+                    deadline = time.monotonic() + self.timeout
+            running = [future for future in futures if future is not None and not future.done()]
+            if not running and not queued:
+                return futures, False
+            if deadline is not None and time.monotonic() >= deadline:
+                self._abandon({future: executor_of[future] for future in running})
+                return futures, True
+            if running:
+                wait(running, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            else:
+                time.sleep(POLL_INTERVAL)  # every worker is busy with other papers
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            retired, self._retired = list(self._retired), set()
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        for pool in retired:
+            self._terminate(pool)
+
+
+@lru_cache(maxsize=1)
+def get_pdf_extractor() -> PdfExtractor:
+    """Process-wide extractor so every fetcher shares one worker pool."""
+    return PdfExtractor()
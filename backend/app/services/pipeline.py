@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_SENTINEL = object()
+
+logger = logging.getLogger("pipeline")
+
+
+@dataclass
+class Stage:
+    """One step of a staged pipeline.
+
+    ``func`` receives the payload produced by the previous stage and returns the
+    payload for the next one. Returning ``None`` drops the item (e.g. skipped papers).
+    """
+
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+    queue_size: int = 8
+
+
+@dataclass
+class StageStats:
+    name: str
+    workers: int
+    queue_size: int
+    processed: int = 0
+    dropped: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    max_depth: int = 0
+    depth_samples: int = 0
+    depth_total: int = 0
+    first_started: Optional[float] = None
+    last_finished: Optional[float] = None
+
+    @property
+    def avg_depth(self) -> float:
+        return self.depth_total / self.depth_samples if self.depth_samples else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Items per second over the stage's active window."""
+        if self.first_started is None or self.last_finished is None:
+            return 0.0
+        elapsed = self.last_finished - self.first_started
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of worker time spent doing work (1.0 = saturated)."""
+        if self.first_started is None or self.last_finished is None:
+            return 0.0
+        elapsed = self.last_finished - self.first_started
+        return self.busy_seconds / (elapsed * self.workers) if elapsed > 0 else 0.0
+
+
+@dataclass
+class _StageRuntime:
+    stage: Stage
+    stats: StageStats
+    inbox: "queue.Queue[Any]"
+    threads: List[threading.Thread] = field(default_factory=list)
+    alive: int = 0
+
+
+class StagedPipeline(Generic[T]):
+    """Runs keyed items through stages connected by bounded queues.
+
+    Every stage has its own worker threads; a full queue blocks the upstream stage,
+    so a slow stage applies backpressure instead of letting work pile up in memory.
+    Items travel as ``(key, payload)`` so callbacks can report which item finished.
+    """
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        on_complete: Optional[Callable[[str], None]] = None,
+        on_error: Optional[Callable[[str, str, BaseException], None]] = None,
+    ) -> None:
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        self.on_complete = on_complete
+        self.on_error = on_error
+        self._lock = threading.Lock()
+        self._runtimes = [
+            _StageRuntime(
+                stage=stage,
+                stats=StageStats(name=stage.name, workers=max(1, stage.workers), queue_size=max(1, stage.queue_size)),
+                inbox=queue.Queue(maxsize=max(1, stage.queue_size)),
+            )
+            for stage in stages
+        ]
+
+    def depths(self) -> List[Tuple[str, int]]:
+        return [(rt.stage.name, rt.inbox.qsize()) for rt in self._runtimes]
+
+    def stats(self) -> List[StageStats]:
+        return [rt.stats for rt in self._runtimes]
+
+    def _put(self, index: int, item: Any) -> None:
+        runtime = self._runtimes[index]
+        runtime.inbox.put(item)
+        depth = runtime.inbox.qsize()
+        with self._lock:
+            stats = runtime.stats
+            stats.max_depth = max(stats.max_depth, depth)
+            stats.depth_samples += 1
+            stats.depth_total += depth
+
+    def _finish(self, key: str) -> None:
+        if self.on_complete:
+            self.on_complete(key)
+
+    def _worker(self, index: int) -> None:
+        runtime = self._runtimes[index]
+        stats = runtime.stats
+        is_last = index == len(self._runtimes) - 1
+        while True:
+            item = runtime.inbox.get()
+            if item is _SENTINEL:
+                break
+            key, payload = item
+            started = time.perf_counter()
+            with self._lock:
+                if stats.first_started is None:
+                    stats.first_started = started
+            try:
+                result = runtime.stage.func(payload)
+            except Exception as exc:  # noqa: BLE001
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    stats.failed += 1
+                    stats.busy_seconds += elapsed
+                    stats.last_finished = time.perf_counter()
+                logger.exception("Stage %s failed for %s", runtime.stage.name, key)
+                if self.on_error:
+                    self.on_error(key, runtime.stage.name, exc)
+                self._finish(key)
+                continue
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                stats.busy_seconds += elapsed
+                stats.last_finished = time.perf_counter()
+                if result is None:
+                    stats.dropped += 1
+                else:
+                    stats.processed += 1
+            if result is None or is_last:
+                self._finish(key)
+            else:
+                self._put(index + 1, (key, result))
+        with self._lock:
+            runtime.alive -= 1
+            last_out = runtime.alive == 0
+        if last_out and not is_last:
+            # propagate shutdown only after every worker of this stage has drained
+            downstream = self._runtimes[index + 1]
+            for _ in range(downstream.stats.workers):
+                downstream.inbox.put(_SENTINEL)
+
+    def run(self, items: Iterable[Tuple[str, T]]) -> List[StageStats]:
+        for index, runtime in enumerate(self._runtimes):
+            runtime.alive = runtime.stats.workers
+            for worker_id in range(runtime.stats.workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(index,),
+                    name=f"{runtime.stage.name}-{worker_id}",
+                    daemon=True,
+                )
+                runtime.threads.append(thread)
+                thread.start()
+        first = self._runtimes[0]
+        try:
+            for item in items:
+                self._put(0, item)
+        finally:
+            for _ in range(first.stats.workers):
+                first.inbox.put(_SENTINEL)
+            for runtime in self._runtimes:
+                for thread in runtime.threads:
+                    thread.join()
+        return self.stats()
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+from app.services.types import Section
+
+# Lower rank = kept first: abstract, introduction, method, experiments, results, conclusion.
+# Patterns are tried in this order, so tail sections are matched before "model"/"method"
+# can claim headings like "Related Work on Language Models".
+SECTION_PRIORITIES: Sequence[Tuple[int, re.Pattern]] = (
+    (9, re.compile(r"appendix|acknowledg|reference|bibliograph|supplementary", re.I)),
+    (8, re.compile(r"related work|background|preliminar", re.I)),
+    (0, re.compile(r"abstract|摘要", re.I)),
+    (1, re.compile(r"introduction|overview|引言", re.I)),
+    (2, re.compile(r"method|approach|model|architecture|framework|algorithm|方法", re.I)),
+    (3, re.compile(r"experiment|evaluation|setup|benchmark|实验", re.I)),
+    (4, re.compile(r"result|analysis|ablation|结果", re.I)),
+    (5, re.compile(r"conclusion|discussion|limitation|future work|总结|结论", re.I)),
+)
+DEFAULT_PRIORITY = 6  # unrecognised headings, including the single "Extracted" PDF section
+
+# don't bother squeezing in a truncated tail shorter than this
+MIN_PARTIAL_TOKENS = 200
+
+CJK_PATTERN = re.compile(r"[\u3000-\u303f\u3400-\u4dbf\u4e00-\u9fff\uff00-\uffef]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough BPE estimate without a tokenizer: ~4 chars per token for Latin text, ~0.6 per CJK char."""
+    if not text:
+        return 0
+    cjk = len(CJK_PATTERN.findall(text))
+    return math.ceil(cjk * 0.6 + (len(text) - cjk) / 4)
+
+
+def section_priority(heading: str) -> int:
+    for priority, pattern in SECTION_PRIORITIES:
+        if pattern.search(heading or ""):
+            return priority
+    return DEFAULT_PRIORITY
+
+
+def truncate_to_tokens(text: str, tokens: int) -> str:
+    if estimate_tokens(text) <= tokens:
+        return text
+    # shrink proportionally, then back off to the last line/sentence break
+    cut = text[: max(0, int(len(text) * tokens / estimate_tokens(text)))]
+    for separator in ("\n", ". ", "。"):
+        index = cut.rfind(separator)
+        if index > len(cut) // 2:
+            return cut[: index + len(separator)].rstrip()
+    return cut.rstrip()
+
+
+@dataclass
+class ChosenSection:
+    heading: str
+    tokens: int
+    truncated: bool = False
+
+
+@dataclass
+class PromptSelection:
+    texts: List[str] = field(default_factory=list)  # formatted sections, in document order
+    chosen: List[ChosenSection] = field(default_factory=list)
+    dropped: List[str] = field(default_factory=list)
+    tokens: int = 0
+    budget: int = 0
+
+    def summary(self) -> str:
+        kept = ", ".join(
+            f"{item.heading or '(untitled)'}={item.tokens}{'~' if item.truncated else ''}" for item in self.chosen
+        )
+        dropped = ", ".join(heading or "(untitled)" for heading in self.dropped) or "none"
+        return f"{self.tokens}/{self.budget} tokens; kept [{kept}]; dropped [{dropped}]"
+
+
+def _format(heading: str, content: str) -> str:
+    return f"[{heading}]\n{content}" if heading else f"\n{content}"
+
+
+def select_sections(
+    sections: Sequence[Section],
+    budget: int,
+    raw_text: Optional[str] = None,
+    reserved_tokens: int = 0,
+) -> PromptSelection:
+    """Fill ``budget`` tokens with the highest-priority sections, keeping document order.
+
+    Sections are taken whole in priority order; the first one that no longer fits is
+    truncated if at least :data:`MIN_PARTIAL_TOKENS` remain. ``reserved_tokens`` accounts
+    for extra context the caller appends itself.
+    """
+    candidates = section_candidates(sections, raw_text)
+    selection = PromptSelection(budget=budget)
+    remaining = max(0, budget - reserved_tokens)
+    picked: dict[int, Tuple[str, ChosenSection]] = {}
+    ranked = sorted(range(len(candidates)), key=lambda index: (section_priority(candidates[index][0]), index))
+    for index in ranked:
+        heading, content = candidates[index]
+        tokens = estimate_tokens(_format(heading, content))
+        if tokens <= remaining:
+            picked[index] = (content, ChosenSection(heading, tokens))
+            remaining -= tokens
+        elif remaining >= MIN_PARTIAL_TOKENS:
+            header_tokens = estimate_tokens(_format(heading, ""))
+            partial = truncate_to_tokens(content, remaining - header_tokens)
+            tokens = estimate_tokens(_format(heading, partial))
+            picked[index] = (partial, ChosenSection(heading, tokens, truncated=True))
+            remaining -= tokens
+        else:
+            selection.dropped.append(heading)
+
+    for index in sorted(picked):
+        content, chosen = picked[index]
+        selection.texts.append(_format(chosen.heading, content))
+        selection.chosen.append(chosen)
+        selection.tokens += chosen.tokens
+    # report drops in document order too
+    order = {heading: position for position, (heading, _) in enumerate(candidates)}
+    selection.dropped.sort(key=lambda heading: order.get(heading, 0))
+    return selection
+
+
+# reference lists and acknowledgements carry no findings; everything else is analysed when chunking
+SKIPPED_IN_CHUNKS = re.compile(r"acknowledg|reference|bibliograph", re.I)
+
+
+@dataclass
+class SectionChunk:
+    headings: List[str] = field(default_factory=list)
+    texts: List[str] = field(default_factory=list)  # formatted sections, in document order
+    tokens: int = 0
+
+
+def section_candidates(sections: Sequence[Section], raw_text: Optional[str] = None) -> List[Tuple[str, str]]:
+    candidates = [(section.heading, section.content.strip()) for section in sections if section.content.strip()]
+    if not candidates and raw_text and raw_text.strip():
+        candidates = [("Extracted", raw_text.strip())]
+    return candidates
+
+
+def paper_tokens(sections: Sequence[Section], raw_text: Optional[str] = None) -> int:
+    """Estimated tokens of every section :func:`chunk_sections` would analyse."""
+    return sum(
+        estimate_tokens(_format(heading, content))
+        for heading, content in section_candidates(sections, raw_text)
+        if not SKIPPED_IN_CHUNKS.search(heading or "")
+    )
+
+
+def split_to_tokens(text: str, tokens: int) -> List[str]:
+    """Cut ``text`` into consecutive pieces of at most ~``tokens``, preferring line/sentence breaks."""
+    parts: List[str] = []
+    rest = text.strip()
+    while rest:
+        part = truncate_to_tokens(rest, max(1, tokens))
+        if not part:
+            part = rest[: max(1, len(rest) * tokens // estimate_tokens(rest))]
+        parts.append(part)
+        rest = rest[len(part) :].lstrip()
+    return parts
+
+
+def _pack(pieces: Sequence[Tuple[str, str]], chunk_tokens: int) -> List[SectionChunk]:
+    chunks: List[SectionChunk] = []
+    current = SectionChunk()
+    for heading, content in pieces:
+        tokens = estimate_tokens(_format(heading, content))
+        if current.texts and current.tokens + tokens > chunk_tokens:
+            chunks.append(current)
+            current = SectionChunk()
+        current.headings.append(heading)
+        current.texts.append(_format(heading, content))
+        current.tokens += tokens
+    if current.texts:
+        chunks.append(current)
+    return chunks
+
+
+def chunk_sections(
+    sections: Sequence[Section],
+    chunk_tokens: int,
+    raw_text: Optional[str] = None,
+    max_chunks: int = 0,
+) -> Tuple[List[SectionChunk], List[str]]:
+    """Split a whole paper into chunks of about ``chunk_tokens``, keeping document order.
+
+    Unlike :func:`select_sections` nothing is dropped for lack of budget: oversized sections
+    (and a PDF "Extracted" blob) are split across chunks, and with ``max_chunks`` the chunk
+    size grows instead. Returns the chunks and the skipped reference/acknowledgement headings.
+    """
+    candidates = section_candidates(sections, raw_text)
+    skipped = [heading for heading, _ in candidates if SKIPPED_IN_CHUNKS.search(heading or "")]
+    kept = [(heading, content) for heading, content in candidates if not SKIPPED_IN_CHUNKS.search(heading or "")]
+    total = sum(estimate_tokens(_format(heading, content)) for heading, content in kept)
+    if max_chunks:
+        chunk_tokens = max(chunk_tokens, math.ceil(total / max_chunks))
+    while True:
+        pieces: List[Tuple[str, str]] = []
+        for heading, content in kept:
+            parts = split_to_tokens(content, chunk_tokens - estimate_tokens(_format(heading, "")))
+            if len(parts) == 1:
+                pieces.append((heading, parts[0]))
+            else:
+                pieces.extend((f"{heading} ({index}/{len(parts)})", part) for index, part in enumerate(parts, 1))
+        chunks = _pack(pieces, chunk_tokens)
+        if not max_chunks or len(chunks) <= max_chunks:
+            return chunks, skipped
+        # packing leaves gaps; grow the chunks until the cap holds
+        chunk_tokens = math.ceil(chunk_tokens * 1.25)
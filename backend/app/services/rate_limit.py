@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Mapping, Optional, Tuple, Type, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+logger = logging.getLogger("rate_limit")
+
+
+class TokenBucket:
+    """Thread-safe token bucket; callers reserve tokens and sleep off any debt.
+
+    Reserving ahead (tokens may go negative) queues callers fairly instead of letting
+    them race for the next refill.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` and return how long the caller must wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def pause(self, seconds: float) -> None:
+        """Block the bucket for ``seconds`` (e.g. after a 429 with Retry-After)."""
+        with self._lock:
+            self._tokens = min(self._tokens, -seconds * self.rate)
+            self._updated = time.monotonic()
+
+
+@dataclass
+class HostStats:
+    requests: int = 0
+    throttled: int = 0  # requests that had to wait for a token
+    throttle_seconds: float = 0.0
+    retried: int = 0
+    rate_limited: int = 0  # 429 responses
+
+    def summary(self) -> str:
+        return (
+            f"requests={self.requests} throttled={self.throttled} ({self.throttle_seconds:.1f}s) "
+            f"retried={self.retried} http429={self.rate_limited}"
+        )
+
+
+class RateLimiter:
+    """Per-host request budgets shared by every HTTP client in the process."""
+
+    def __init__(self, rates: Mapping[str, float]) -> None:
+        self._buckets: Dict[str, TokenBucket] = {host: TokenBucket(rate) for host, rate in rates.items() if rate > 0}
+        self.stats: Dict[str, HostStats] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url: str | httpx.URL) -> str:
+        return urlsplit(str(url)).hostname or ""
+
+    def _host_stats(self, host: str) -> HostStats:
+        with self._lock:
+            return self.stats.setdefault(host, HostStats())
+
+    def _reserve(self, url: str | httpx.URL) -> Tuple[HostStats, float]:
+        host = self.host_of(url)
+        stats = self._host_stats(host)
+        bucket = self._buckets.get(host)
+        wait = bucket.reserve() if bucket else 0.0
+        with self._lock:
+            stats.requests += 1
+            if wait > 0:
+                stats.throttled += 1
+                stats.throttle_seconds += wait
+        return stats, wait
+
+    def acquire(self, url: str | httpx.URL) -> None:
+        _, wait = self._reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, url: str | httpx.URL) -> None:
+        _, wait = self._reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    # httpx event hooks: every request sent by a hooked client is throttled per host
+    def throttle_request(self, request: httpx.Request) -> None:
+        self.acquire(request.url)
+
+    async def athrottle_request(self, request: httpx.Request) -> None:
+        await self.acquire_async(request.url)
+
+    def record_retry(self, url: str | httpx.URL, status: Optional[int], retry_after: Optional[float]) -> None:
+        host = self.host_of(url)
+        stats = self._host_stats(host)
+        with self._lock:
+            stats.retried += 1
+            if status == 429:
+                stats.rate_limited += 1
+        if retry_after and host in self._buckets:
+            # the server told us to back off: hold every request to this host, not just ours
+            self._buckets[host].pause(retry_after)
+
+    def summary(self) -> str:
+        with self._lock:
+            return "; ".join(f"{host}: {stats.summary()}" for host, stats in sorted(self.stats.items()))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Exponential backoff with full jitter; a server-provided Retry-After takes precedence."""
+    if retry_after is not None:
+        return min(retry_after, settings.retry_max_delay)
+    ceiling = min(settings.retry_max_delay, settings.retry_base_delay * (2**attempt))
+    return random.uniform(0, ceiling)
+
+
+def _retry_reason(
+    outcome: object, retry_exceptions: Tuple[Type[BaseException], ...]
+) -> Tuple[bool, Optional[int], Optional[float]]:
+    """Return (should_retry, status, retry_after) for a response or raised exception."""
+    if isinstance(outcome, httpx.Response):
+        if outcome.status_code in RETRYABLE_STATUS:
+            return True, outcome.status_code, parse_retry_after(outcome.headers.get("Retry-After"))
+        return False, outcome.status_code, None
+    if isinstance(outcome, (httpx.TransportError,) + retry_exceptions):
+        response = getattr(outcome, "response", None)
+        status = getattr(outcome, "status_code", None)
+        headers = getattr(response, "headers", None) or {}
+        return True, status, parse_retry_after(headers.get("Retry-After"))
+    return False, None, None
+
+
+def call_with_retry(
+    func: Callable[[], T],
+    url: str | httpx.URL,
+    retry_exceptions: Tuple[Type[BaseException], ...] = (),
+    max_attempts: Optional[int] = None,
+) -> T:
+    """Call ``func`` until it returns a non-retryable response or attempts run out.
+
+    Retryable responses (429/5xx) are returned as-is after the last attempt so callers keep
+    their own ``raise_for_status`` handling; retryable exceptions are re-raised.
+    """
+    limiter = get_rate_limiter()
+    attempts = max_attempts or settings.retry_max_attempts
+    for attempt in range(attempts):
+        try:
+            result = func()
+        except Exception as exc:  # noqa: BLE001
+            retry, status, retry_after = _retry_reason(exc, retry_exceptions)
+            if not retry or attempt == attempts - 1:
+                raise
+        else:
+            retry, status, retry_after = _retry_reason(result, retry_exceptions)
+            if not retry or attempt == attempts - 1:
+                return result
+        delay = backoff_delay(attempt, retry_after)
+        limiter.record_retry(url, status, retry_after)
+        logger.warning("Retrying %s in %.1fs (attempt %d/%d, status=%s)", url, delay, attempt + 2, attempts, status)
+        time.sleep(delay)
+    raise AssertionError("unreachable")  # pragma: no cover
+
+
+async def acall_with_retry(
+    func: Callable[[], Awaitable[T]],
+    url: str | httpx.URL,
+    retry_exceptions: Tuple[Type[BaseException], ...] = (),
+    max_attempts: Optional[int] = None,
+) -> T:
+    """Async variant of :func:`call_with_retry`."""
+    limiter = get_rate_limiter()
+    attempts = max_attempts or settings.retry_max_attempts
+    for attempt in range(attempts):
+        try:
+            result = await func()
+        except Exception as exc:  # noqa: BLE001
+            retry, status, retry_after = _retry_reason(exc, retry_exceptions)
+            if not retry or attempt == attempts - 1:
+                raise
+        else:
+            retry, status, retry_after = _retry_reason(result, retry_exceptions)
+            if not retry or attempt == attempts - 1:
+                return result
+        delay = backoff_delay(attempt, retry_after)
+        limiter.record_retry(url, status, retry_after)
+        logger.warning("Retrying %s in %.1fs (attempt %d/%d, status=%s)", url, delay, attempt + 2, attempts, status)
+        await asyncio.sleep(delay)
+    raise AssertionError("unreachable")  # pragma: no cover
+
+
+@lru_cache(maxsize=1)
+def get_rate_limiter() -> RateLimiter:
+    return RateLimiter(settings.rate_limits)
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl
+
+from sqlalchemy import update
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.session import engine
+from app.models import DataVersion
+
+# read-only dashboard routes whose output only changes when the ingest writes
+CACHED_PATHS = ("/api/papers", "/api/papers/calendar", "/api/papers/search", "/api/keywords/stats")
+CACHE_CONTROL = (b"cache-control", b"no-cache")  # browsers keep the body but revalidate with If-None-Match
+
+Headers = List[Tuple[bytes, bytes]]
+
+
+def bump_data_version(session: Session) -> None:
+    """Invalidate every worker's cached responses once ``session`` commits.
+
+    Call it inside the transaction that writes papers, findings or keyword stats, so readers
+    never see the new version without the new data.
+    """
+    bumped = session.exec(
+        update(DataVersion)
+        .where(DataVersion.id == 1)
+        .values(version=DataVersion.version + 1, updated_at=datetime.utcnow())
+    )
+    if not bumped.rowcount:
+        session.add(DataVersion(id=1, version=1))
+
+
+def read_data_version(bind: Engine) -> int:
+    with Session(bind) as session:
+        return session.exec(select(DataVersion.version).where(DataVersion.id == 1)).first() or 0
+
+
+@dataclass
+class CachedResponse:
+    version: int
+    etag: bytes
+    body: bytes
+    headers: Headers  # the route's headers (content type, X-Next-Cursor) minus content-length
+
+
+def make_etag(body: bytes) -> bytes:
+    """Strong validator: identical bytes get identical tags in every worker."""
+    return b'"' + hashlib.sha256(body).hexdigest()[:32].encode() + b'"'
+
+
+def etag_matches(if_none_match: Optional[bytes], etag: bytes) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(b",")]
+    return b"*" in tags or any(tag.removeprefix(b"W/") == etag for tag in tags)
+
+
+class ResponseCacheMiddleware:
+    """In-process cache of successful GET responses on :data:`CACHED_PATHS`.
+
+    Entries are keyed by path and query parameters and tagged with the ``dataversion`` counter
+    read before the route ran. The counter lives in the database, so each uvicorn worker keeps
+    its own LRU yet drops stale entries as soon as any ingest process commits. The LRU is bounded
+    by entry count and by total body bytes. A hit costs one primary-key lookup; a matching
+    ``If-None-Match`` gets a bodiless 304.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: Sequence[str] = CACHED_PATHS,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        bind: Optional[Engine] = None,
+    ) -> None:
+        self.app = app
+        self.paths = frozenset(paths)
+        self.max_entries = settings.response_cache_entries if max_entries is None else max_entries
+        self.max_bytes = int(settings.response_cache_max_mb * 1024 * 1024) if max_bytes is None else max_bytes
+        self.bind = bind or engine
+        self.entries: "OrderedDict[Tuple, CachedResponse]" = OrderedDict()
+        self.size = 0  # body bytes held in entries
+
+    def _read_version(self) -> int:
+        return read_data_version(self.bind)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or scope["path"] not in self.paths
+            or self.max_entries <= 0
+            or self.max_bytes <= 0
+        ):
+            await self.app(scope, receive, send)
+            return
+        key = (scope["path"], tuple(sorted(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True))))
+        if_none_match = dict(scope["headers"]).get(b"if-none-match")
+        # read before the route runs: an ingest committing in between is picked up by the next request
+        version = await run_in_threadpool(self._read_version)
+        entry = self.entries.get(key)
+        if entry is not None and entry.version == version:
+            self.entries.move_to_end(key)
+            await self._respond(entry, if_none_match, send)
+            return
+
+        messages: List[Message] = []
+
+        async def capture(message: Message) -> None:
+            messages.append(message)
+
+        await self.app(scope, receive, capture)
+        start = messages[0] if messages else None
+        if start is None or start["type"] != "http.response.start" or start["status"] != 200:
+            for message in messages:
+                await send(message)
+            return
+        body = b"".join(message.get("body", b"") for message in messages[1:])
+        headers = [(name, value) for name, value in start.get("headers", []) if name.lower() != b"content-length"]
+        entry = CachedResponse(version, make_etag(body), body, headers)
+        self._store(key, entry)
+        await self._respond(entry, if_none_match, send)
+
+    def _store(self, key: Tuple, entry: CachedResponse) -> None:
+        stale = self.entries.pop(key, None)
+        if stale is not None:
+            self.size -= len(stale.body)
+        if len(entry.body) > self.max_bytes:
+            return  # would evict everything else and still not fit
+        self.entries[key] = entry
+        self.size += len(entry.body)
+        while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted.body)
+
+    @staticmethod
+    async def _respond(entry: CachedResponse, if_none_match: Optional[bytes], send: Send) -> None:
+        validators = [(b"etag", entry.etag), CACHE_CONTROL]
+        if etag_matches(if_none_match, entry.etag):
+            await send({"type": "http.response.start", "status": 304, "headers": validators})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        headers = entry.headers + validators + [(b"content-length", str(len(entry.body)).encode())]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": entry.body})
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+from app.core.config import settings
+from app.services.types import ArxivPaper
+
+TIER_FULL = "full"  # ranked sections packed into LLM_PROMPT_TOKEN_BUDGET
+TIER_LITE = "lite"  # metadata and abstract only
+
+# (reason, pattern over title + abstract, weight); a paper earns each weight at most once
+ABSTRACT_FEATURES: Tuple[Tuple[str, Pattern[str], float], ...] = (
+    ("sota", re.compile(r"state[- ]of[- ]the[- ]art|\bsota\b|outperform|surpass", re.I), 0.15),
+    ("quantified", re.compile(r"\d+(?:\.\d+)?\s*(?:%|x\b|×|points?\b)", re.I), 0.1),
+    ("novelty", re.compile(r"\b(?:first|novel|we (?:introduce|propose|present))\b", re.I), 0.1),
+    ("release", re.compile(r"open[- ]source|publicly (?:available|release)|\bgithub\b|we release", re.I), 0.05),
+    ("survey", re.compile(r"\b(?:survey|position paper|we review|literature review)\b", re.I), -0.2),
+)
+INSTITUTION_WEIGHT = 0.4
+# the core areas the daily digest focuses on
+FOCUS_CATEGORIES = frozenset({"cs.CL", "cs.LG", "cs.AI", "cs.CV"})
+CATEGORY_WEIGHT = 0.1
+
+logger = logging.getLogger("triage")
+
+
+@dataclass
+class TriageScore:
+    score: float
+    reasons: List[str] = field(default_factory=list)
+
+
+def tracked_institutions(paper: ArxivPaper) -> List[str]:
+    affiliations = " | ".join(paper.institutions).lower()
+    return sorted(name for name in settings.tracked_institutions if name in affiliations)
+
+
+def triage_score(paper: ArxivPaper) -> TriageScore:
+    """Local, LLM-free estimate (0-1) of how likely a paper is to clear the breakthrough threshold."""
+    score = 0.0
+    reasons: List[str] = []
+    matched = tracked_institutions(paper)
+    if matched:
+        score += INSTITUTION_WEIGHT
+        reasons.append(f"institution:{matched[0]}")
+    if FOCUS_CATEGORIES.intersection(paper.categories):
+        score += CATEGORY_WEIGHT
+        reasons.append("category")
+    text = f"{paper.title}\n{paper.abstract or ''}"
+    for reason, pattern, weight in ABSTRACT_FEATURES:
+        if pattern.search(text):
+            score += weight
+            reasons.append(reason)
+    return TriageScore(score=round(min(1.0, max(0.0, score)), 3), reasons=reasons)
+
+
+class TriagePolicy:
+    """Decides which papers get the full-context LLM analysis and which only a lightweight one.
+
+    ``cutoff`` is a floor on :func:`triage_score`; ``top_k`` (0 = unlimited) caps how many
+    papers of a run get the full tier. A cap needs every score first, so callers must
+    :meth:`rank` the whole run before asking for tiers (see :attr:`needs_ranking`).
+    """
+
+    def __init__(self, cutoff: Optional[float] = None, top_k: Optional[int] = None) -> None:
+        self.cutoff = settings.triage_cutoff if cutoff is None else cutoff
+        self.top_k = max(0, settings.triage_top_k if top_k is None else top_k)
+        self.assigned: Dict[str, str] = {}  # arXiv id -> tier
+        self._ranked = False
+
+    @property
+    def needs_ranking(self) -> bool:
+        return self.top_k > 0
+
+    def _assign(self, paper: ArxivPaper, result: TriageScore, tier: str) -> None:
+        self.assigned[paper.arxiv_id] = tier
+        logger.info(
+            "Triage %s: score=%.2f tier=%s (%s)",
+            paper.arxiv_id,
+            result.score,
+            tier,
+            ", ".join(result.reasons) or "no signals",
+        )
+
+    def rank(self, papers: Iterable[ArxivPaper]) -> Dict[str, str]:
+        scored = [(paper, triage_score(paper)) for paper in papers]
+        eligible = sorted(
+            (pair for pair in scored if pair[1].score >= self.cutoff), key=lambda pair: pair[1].score, reverse=True
+        )
+        if self.top_k:
+            eligible = eligible[: self.top_k]
+        full = {paper.arxiv_id for paper, _ in eligible}
+        for paper, result in scored:
+            self._assign(paper, result, TIER_FULL if paper.arxiv_id in full else TIER_LITE)
+        self._ranked = True
+        return {paper.arxiv_id: self.assigned[paper.arxiv_id] for paper, _ in scored}
+
+    def tier(self, paper: ArxivPaper) -> str:
+        if self._ranked and paper.arxiv_id in self.assigned:
+            return self.assigned[paper.arxiv_id]
+        if self.needs_ranking:
+            raise RuntimeError(f"TriagePolicy.rank() must run before tiering {paper.arxiv_id} with top_k")
+        result = triage_score(paper)
+        tier = TIER_FULL if result.score >= self.cutoff else TIER_LITE
+        self._assign(paper, result, tier)
+        return tier
+
+    def summary(self) -> str:
+        tiers = list(self.assigned.values())
+        cap = f" top_k={self.top_k}" if self.top_k else ""
+        return f"full={tiers.count(TIER_FULL)} lite={tiers.count(TIER_LITE)} cutoff={self.cutoff:.2f}{cap}"
@@ -1,6 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 
 @dataclass
@@ -22,6 +23,23 @@ class ArxivPaper:
     raw_html: Optional[str]
     raw_text: Optional[str]
     source: str
+    table_captions: List[str] = field(default_factory=list)
+    bibliography: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ArxivDownload:
+    """Raw network payload for one paper, before any HTML/PDF parsing."""
+
+    arxiv_id: str
+    title: str
+    authors: List[str]
+    abstract: str
+    published_at: Optional[datetime]
+    categories: List[str]
+    html: Optional[str]
+    pdf_path: Optional[Path] = None  # streamed PDF when HTML is missing
+    pdf_temporary: bool = False  # temp file (cache disabled) rather than a pinned cache object; see release_pdf
 
 
 @dataclass
@@ -52,4 +70,39 @@ class LLMAnalysis:
     breakthrough_score: float
     breakthrough_label: bool
     breakthrough_reason: str
-    findings: List[FindingSummary]
\ No newline at end of file
+    findings: List[FindingSummary]
+    # set only when the analysis came from a parsed LLM response (None for the heuristic fallback)
+    llm_model: Optional[str] = None
+    llm_version: Optional[str] = None
+
+
+def paper_to_dict(paper: ArxivPaper) -> Dict[str, Any]:
+    data = asdict(paper)
+    data["published_at"] = paper.published_at.isoformat() if paper.published_at else None
+    return data
+
+
+def paper_from_dict(data: Dict[str, Any]) -> ArxivPaper:
+    values = dict(data)
+    published = values.get("published_at")
+    values["published_at"] = datetime.fromisoformat(published) if published else None
+    values["sections"] = [Section(**section) for section in values.get("sections", [])]
+    return ArxivPaper(**values)
+
+
+def analysis_to_dict(analysis: LLMAnalysis) -> Dict[str, Any]:
+    return asdict(analysis)
+
+
+def analysis_from_dict(data: Dict[str, Any]) -> LLMAnalysis:
+    values = dict(data)
+    values["findings"] = [
+        FindingSummary(
+            claim_text=finding["claim_text"],
+            experiment_design=finding.get("experiment_design"),
+            evidence_snippet=finding.get("evidence_snippet"),
+            metrics=[Metric(**metric) for metric in finding.get("metrics", [])],
+        )
+        for finding in values.get("findings", [])
+    ]
+    return LLMAnalysis(**values)
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import math
+import os
+import re
+import threading
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialised within one process
+    fcntl = None
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.paper_search import CJK
+
+# bump when the features change: vectors from another version are not comparable
+VECTORIZER_VERSION = 1
+
+_LATIN_WORD = re.compile(r"[a-z0-9][a-z0-9+\-]*[a-z0-9+]|[a-z]")
+_CJK_RUN = re.compile(f"[{CJK}]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or our that the their this to "
+    "we which with via using based than these those not can also both more most new paper propose show".split()
+)
+
+
+def paper_text(*fields: Optional[str]) -> str:
+    """The embedded text of a paper: title, abstract, problem/solution/effect summaries and keywords."""
+    return "\n".join(field for field in fields if field)
+
+
+def features(text: str) -> Counter:
+    """Word unigrams and bigrams for Latin text, character unigrams and bigrams for CJK runs."""
+    counts: Counter = Counter()
+    lowered = text.lower()
+    words = [word for word in _LATIN_WORD.findall(lowered) if word not in STOPWORDS]
+    counts.update(words)
+    counts.update(f"{left} {right}" for left, right in zip(words, words[1:]))
+    for run in _CJK_RUN.findall(lowered):
+        counts.update(run)
+        counts.update(run[index : index + 2] for index in range(len(run) - 1))
+    return counts
+
+
+def embed(text: str, dim: Optional[int] = None) -> np.ndarray:
+    """Signed feature hashing with sublinear term frequency, L2-normalised.
+
+    CRC32 is stable across processes (``hash()`` is salted), so ingest and API workers agree.
+    """
+    dim = dim or settings.vector_dim
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature, count in features(text).items():
+        digest = zlib.crc32(feature.encode("utf-8"))
+        vector[(digest >> 1) % dim] += (1.0 + math.log(count)) * (1.0 if digest & 1 else -1.0)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+def embed_paper(paper) -> np.ndarray:
+    """Embed a ``Paper`` or any row carrying the same summary attributes."""
+    return embed(
+        paper_text(
+            paper.title,
+            paper.abstract,
+            paper.problem_summary,
+            paper.solution_summary,
+            paper.effect_summary,
+            " ".join(paper.keywords or []),
+        )
+    )
+
+
+class VectorIndex:
+    """Paper vectors in one append-only float32 file, searched brute force through a memory map.
+
+    Each record is ``[paper id bits, v_0 .. v_dim-1]``, so a single ``write`` appends a paper and
+    a reader never pairs an id with another paper's vector. Readers size the map by whole
+    records and re-map when the file grows or is replaced; every API worker shares the same
+    page cache. A paper stored again (``--force-update``) appends a new record and the last
+    one wins; :meth:`rebuild` compacts the file.
+
+    Writers (the ingest's :meth:`add`, ``build_vector_index.py``'s :meth:`rebuild`) hold an
+    exclusive ``flock`` on a sidecar lock file, so an append made during a rebuild waits for the
+    swap and lands in the new file instead of the one being replaced.
+    """
+
+    def __init__(self, root: Path, dim: Optional[int] = None) -> None:
+        self.root = Path(root)
+        self.dim = dim or settings.vector_dim
+        self.path = self.root / f"papers-v{VECTORIZER_VERSION}-{self.dim}d.f32"
+        self.lock_path = self.path.with_suffix(".lock")
+        self.record_bytes = (self.dim + 1) * 4
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int32)
+        self._stale = np.zeros(0, dtype=bool)
+        self._rows: Dict[int, int] = {}  # paper id -> its latest record
+
+    def _record(self, paper_id: int, vector: np.ndarray) -> bytes:
+        record = np.empty(self.dim + 1, dtype=np.float32)
+        record[0] = np.array([paper_id], dtype=np.int32).view(np.float32)[0]
+        record[1:] = vector
+        return record.tobytes()
+
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._write_lock, open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)  # released when the file is closed
+            yield
+
+    def add(self, paper_id: int, vector: np.ndarray) -> None:
+        with self._writing(), open(self.path, "ab") as handle:
+            handle.write(self._record(paper_id, vector))
+
+    def rebuild(self, items: Iterable[Tuple[int, np.ndarray]]) -> int:
+        """Replace the index with ``items``; readers switch over on their next query.
+
+        Appends from a running ingest are held off until the new file is in place.
+        """
+        tmp_path = self.path.with_suffix(".tmp")
+        written = 0
+        with self._writing():
+            with open(tmp_path, "wb") as handle:
+                for paper_id, vector in items:
+                    handle.write(self._record(paper_id, vector))
+                    written += 1
+            os.replace(tmp_path, self.path)
+        return written
+
+    def _refresh(self) -> None:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            stat = None
+        signature = (stat.st_ino, stat.st_size) if stat else None
+        if signature == self._signature:
+            return
+        rows = stat.st_size // self.record_bytes if stat else 0
+        if rows:
+            # a record being appended right now is left out until it is complete
+            matrix = np.memmap(self.path, dtype=np.float32, mode="r", shape=(rows, self.dim + 1))
+            ids = np.ascontiguousarray(matrix[:, 0]).view(np.int32)
+            self._vectors = matrix[:, 1:]
+        else:
+            ids = np.zeros(0, dtype=np.int32)
+            self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+        # the last record of each paper wins
+        _, last_from_end = np.unique(ids[::-1], return_index=True)
+        latest = len(ids) - 1 - last_from_end
+        self._stale = np.ones(len(ids), dtype=bool)
+        self._stale[latest] = False
+        self._ids = ids
+        self._rows = {int(ids[row]): int(row) for row in latest}
+        self._signature = signature
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._rows)
+
+    def vector(self, paper_id: int) -> Optional[np.ndarray]:
+        with self._lock:
+            self._refresh()
+            row = self._rows.get(paper_id)
+            return None if row is None else np.array(self._vectors[row])
+
+    def nearest(self, query: np.ndarray, k: int, exclude: Sequence[int] = ()) -> List[Tuple[int, float]]:
+        """The ``k`` papers with the highest cosine similarity to ``query``, best first."""
+        with self._lock:
+            self._refresh()
+            vectors, ids, stale = self._vectors, self._ids, self._stale
+        if not len(ids) or not query.any():
+            return []
+        scores = vectors @ query.astype(np.float32)
+        scores[stale] = -np.inf
+        if len(exclude):
+            scores[np.isin(ids, exclude)] = -np.inf
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(ids[row]), float(scores[row])) for row in top if scores[row] > 0]
+
+
+@lru_cache(maxsize=1)
+def get_vector_index() -> VectorIndex:
+    return VectorIndex(settings.storage_dir / "vectors")
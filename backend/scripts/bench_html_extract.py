@@ -0,0 +1,157 @@
+"""Benchmark the single-pass arXiv HTML extractor against the previous per-field parsing.
+
+Both sides extract the same fields: the legacy side runs the pre-extractor section and
+affiliation functions verbatim, plus captions and bibliography entries parsed the same
+way (one ``HTMLParser`` per field), so the timings compare equivalent work.
+
+Point it at a directory of saved arXiv HTML pages (e.g. copied from the HTTP cache or
+downloaded with ``curl https://arxiv.org/html/<id> -o <id>.html``).
+
+Usage:
+    python bench_html_extract.py ./saved_html --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from rich.console import Console
+from rich.table import Table
+from selectolax.parser import HTMLParser
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.services.html_extractor import extract_arxiv_html  # noqa: E402
+
+console = Console()
+
+
+def legacy_sections(html: str) -> List[Tuple[str, str]]:
+    # verbatim copy of the pre-extractor ArxivFetcher.parse_sections_from_html
+    parser = HTMLParser(html)
+    sections = []
+    for section in parser.css("div.ltx_section"):
+        heading_node = section.css_first("h2, h3, h4, h5, h6")
+        heading = heading_node.text(strip=True) if heading_node else ""
+        paragraphs = [p.text(strip=True) for p in section.css("p") if p.text(strip=True)]
+        content = "\n".join(paragraphs)
+        if heading or content:
+            sections.append((heading, content))
+    if not sections:
+        paragraphs = [p.text(strip=True) for p in parser.css("p") if p.text(strip=True)]
+        if paragraphs:
+            sections.append(("Body", "\n".join(paragraphs)))
+    return sections
+
+
+def legacy_institutions(html: str) -> List[str]:
+    # verbatim copy of the pre-extractor ArxivFetcher.extract_institutions
+    parser = HTMLParser(html)
+    institutions = []
+    for node in parser.css("span.ltx_role_affiliation, span.ltx_affiliation"):
+        text = node.text(strip=True)
+        if text:
+            institutions.append(text)
+    if institutions:
+        return sorted(set(institutions))
+    raw_text = parser.text(separator="\n")
+    pattern = re.compile(r"\(([^)]+University[^)]*)\)")
+    guesses = pattern.findall(raw_text)
+    return sorted(set(guesses)) if guesses else []
+
+
+def legacy_table_captions(html: str) -> List[str]:
+    # the fields added with the extractor, parsed the way every other field used to be
+    parser = HTMLParser(html)
+    return [node.text(strip=True) for node in parser.css("figure.ltx_table figcaption") if node.text(strip=True)]
+
+
+def legacy_bibliography(html: str) -> List[str]:
+    parser = HTMLParser(html)
+    entries = [" ".join(node.text(separator=" ").split()) for node in parser.css("li.ltx_bibitem")]
+    return [entry for entry in entries if entry]
+
+
+def legacy(html: str):
+    return legacy_sections(html), legacy_institutions(html), legacy_table_captions(html), legacy_bibliography(html)
+
+
+def measure(func: Callable[[str], object], html: str, repeat: int) -> tuple[float, int]:
+    """Return (median seconds, peak Python heap bytes) for ``func(html)``."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(html)
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    func(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", type=Path, help="Directory of saved arXiv .html pages (or a single file)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per page (median is reported)")
+    args = parser.parse_args()
+
+    files = sorted(args.corpus.glob("*.html")) if args.corpus.is_dir() else [args.corpus]
+    if not files:
+        parser.error(f"No .html files found in {args.corpus}")
+
+    table = Table(title="arXiv HTML extraction")
+    for column in ("page", "size", "legacy ms", "single-pass ms", "speedup", "legacy peak", "single-pass peak", "same"):
+        table.add_column(column, justify="left" if column == "page" else "right")
+
+    totals = [0.0, 0.0]
+    for path in files:
+        html = path.read_text(encoding="utf-8", errors="replace")
+        legacy_time, legacy_peak = measure(legacy, html, args.repeat)
+        new_time, new_peak = measure(extract_arxiv_html, html, args.repeat)
+        totals[0] += legacy_time
+        totals[1] += new_time
+
+        old_sections, old_institutions, old_captions, old_bibliography = legacy(html)
+        extraction = extract_arxiv_html(html)
+        differences = [
+            name
+            for name, old, new in (
+                ("sections", old_sections, [(s.heading, s.content) for s in extraction.sections]),
+                ("institutions", old_institutions, extraction.institutions),
+                ("captions", old_captions, extraction.table_captions),
+                ("bibliography", old_bibliography, extraction.bibliography),
+            )
+            if old != new
+        ]
+        same = "no: " + ", ".join(differences) if differences else "yes"
+        table.add_row(
+            path.name,
+            f"{len(html) / 1e6:.2f}MB",
+            f"{legacy_time * 1000:.1f}",
+            f"{new_time * 1000:.1f}",
+            f"{legacy_time / new_time:.2f}x" if new_time else "-",
+            f"{legacy_peak / 1e6:.1f}MB",
+            f"{new_peak / 1e6:.1f}MB",
+            same,
+        )
+
+    console.print(table)
+    console.print(
+        f"Total: legacy {totals[0] * 1000:.0f} ms, single-pass {totals[1] * 1000:.0f} ms "
+        f"({totals[0] / totals[1]:.2f}x) over {len(files)} pages"
+    )
+    console.print("[dim]Peak is Python heap via tracemalloc; parser trees live in C memory.[/dim]")
+
+
+if __name__ == "__main__":
+    main()
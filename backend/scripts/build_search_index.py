@@ -0,0 +1,47 @@
+"""Build the paper_fts full-text index from the papers already stored.
+
+Papers ingested after the search index was introduced are indexed as they are stored;
+run this once to backfill older rows, or any time to rebuild the index from scratch.
+
+Usage:
+    python build_search_index.py [--batch-size 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from rich.console import Console
+from sqlmodel import Session
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.db.session import engine, init_db, write_lock  # noqa: E402
+from app.services.paper_search import rebuild_search_index  # noqa: E402
+from app.services.response_cache import bump_data_version  # noqa: E402
+
+console = Console()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500, help="papers read and indexed per statement")
+    args = parser.parse_args()
+
+    init_db()
+    started = time.perf_counter()
+    with write_lock, Session(engine) as session:
+        indexed = rebuild_search_index(session.connection(), batch_size=args.batch_size)
+        # cached /api/papers/search responses were built from the old index
+        bump_data_version(session)
+        session.commit()
+    console.print(f"[green]Indexed {indexed} papers in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
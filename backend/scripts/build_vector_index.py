@@ -0,0 +1,73 @@
+"""Rebuild the paper vector index (STORAGE_DIR/vectors) from the papers already stored.
+
+New papers get their vector as they are ingested; run this once to cover older rows,
+after changing VECTOR_DIM, or to compact the file after many force-updates.
+
+Usage:
+    python build_vector_index.py [--batch-size 1000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Iterator, Tuple
+
+import numpy as np
+from rich.console import Console
+from sqlmodel import Session, select
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.db.session import engine, init_db, session_scope  # noqa: E402
+from app.models import Paper  # noqa: E402
+from app.services.response_cache import bump_data_version  # noqa: E402
+from app.services.vector_index import embed_paper, get_vector_index  # noqa: E402
+
+console = Console()
+
+EMBEDDED_COLUMNS = (
+    Paper.id,
+    Paper.title,
+    Paper.abstract,
+    Paper.problem_summary,
+    Paper.solution_summary,
+    Paper.effect_summary,
+    Paper.keywords,
+)
+
+
+def paper_vectors(batch_size: int) -> Iterator[Tuple[int, np.ndarray]]:
+    last = 0
+    with Session(engine) as session:
+        while True:
+            statement = select(*EMBEDDED_COLUMNS).where(Paper.id > last).order_by(Paper.id).limit(batch_size)
+            rows = session.exec(statement).all()
+            if not rows:
+                return
+            for row in rows:
+                yield row.id, embed_paper(row)
+            last = rows[-1].id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000, help="papers read per query")
+    args = parser.parse_args()
+
+    init_db()
+    started = time.perf_counter()
+    index = get_vector_index()
+    written = index.rebuild(paper_vectors(args.batch_size))
+    # cached semantic search responses were ranked against the old vectors
+    with session_scope() as session:
+        bump_data_version(session)
+    console.print(f"[green]Embedded {written} papers into {index.path} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import argparse
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timedelta, date
 from pathlib import Path
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Optional, Sequence
 
 import sys
 
@@ -17,18 +18,56 @@ LOG_FILE = LOG_DIR / "daily_ingest.log"
 
 from rich.console import Console
 from rich.progress import Progress
+from rich.table import Table
 from sqlmodel import select
 
 from app.core.config import settings
-from app.db.session import init_db, session_scope
+from app.db.session import init_db, session_scope, write_lock
 from app.models import Finding, KeywordStat, Paper
-from app.services.arxiv_fetcher import ArxivFetcher
-from app.services.hf_client import fetch_daily_identifiers
-from app.services.llm_client import analyze_paper_with_llm
+from app.services.arxiv_fetcher import ArxivMetadata, AsyncArxivFetcher
+from app.services.async_http import AsyncHttpPool, BackgroundLoop
+from app.services.blob_store import get_blob_store
+from app.services.hf_client import fetch_daily_identifiers_async
+from app.services.ingest_journal import STAGE_STORED, IngestJournal
+from app.services.llm_batch import BatchError, analyze_papers_with_llm_batch
+from app.services.llm_cache import get_llm_cache
+from app.services.llm_client import AsyncLLMClient, analyze_paper_with_llm, analyze_paper_with_llm_async
+from app.services.llm_map_reduce import (
+    analyze_long_paper_with_llm,
+    analyze_long_paper_with_llm_async,
+    needs_map_reduce,
+)
+from app.services.paper_search import index_paper, remove_paper
+from app.services.pdf_extractor import get_pdf_extractor
+from app.services.pipeline import Stage, StagedPipeline, StageStats
+from app.services.rate_limit import get_rate_limiter
+from app.services.response_cache import bump_data_version
+from app.services.triage import TIER_FULL, TriagePolicy
+from app.services.types import ArxivDownload, ArxivPaper, LLMAnalysis
+from app.services.vector_index import embed_paper, get_vector_index
 
 console = Console()
 
 
+# Service loggers that share the ingest log file
+SERVICE_LOGGERS = (
+    "arxiv_fetcher",
+    "hf",
+    "llm",
+    "pipeline",
+    "http_cache",
+    "async_http",
+    "rate_limit",
+    "pdf_extractor",
+    "blob_store",
+    "llm_cache",
+    "llm_batch",
+    "triage",
+)
+
+PIPELINE_STAGES = ("fetch", "parse", "analyze", "store")
+
+
 def configure_logging(debug: bool = False) -> logging.Logger:
     LOG_DIR.mkdir(parents=True, exist_ok=True)
     logger = logging.getLogger("daily_ingest")
@@ -37,8 +76,8 @@ def configure_logging(debug: bool = False) -> logging.Logger:
         logger.setLevel(level)
         for handler in logger.handlers:
             handler.setLevel(level)
-        logging.getLogger("arxiv_fetcher").setLevel(level)
-        logging.getLogger("llm").setLevel(level)
+        for name in SERVICE_LOGGERS:
+            logging.getLogger(name).setLevel(level)
         return logger
 
     level = logging.DEBUG if debug else logging.INFO
@@ -50,15 +89,11 @@ def configure_logging(debug: bool = False) -> logging.Logger:
     logger.addHandler(handler)
     logger.propagate = False
 
-    arxiv_logger = logging.getLogger("arxiv_fetcher")
-    arxiv_logger.setLevel(level)
-    arxiv_logger.addHandler(handler)
-    arxiv_logger.propagate = False
-
-    llm_logger = logging.getLogger("llm")
-    llm_logger.setLevel(level)
-    llm_logger.addHandler(handler)
-    llm_logger.propagate = False
+    for name in SERVICE_LOGGERS:
+        service_logger = logging.getLogger(name)
+        service_logger.setLevel(level)
+        service_logger.addHandler(handler)
+        service_logger.propagate = False
     return logger
 
 
@@ -82,16 +117,15 @@ def upsert_keywords(session, keywords: Iterable[str]) -> None:
             session.add(KeywordStat(keyword=keyword, paper_count=1))
 
 
-def ingest_paper(arxiv_id: str, fetcher: ArxivFetcher, listing_date: date, force_update: bool = False) -> None:
-    #import pdb
-    #pdb.set_trace()
-    with session_scope() as session:
+def prepare_paper(arxiv_id: str, force_update: bool = False) -> bool:
+    """Apply skip/force semantics; returns False when the paper should not be ingested."""
+    with write_lock, session_scope() as session:
         existing = session.exec(select(Paper).where(Paper.arxiv_id == arxiv_id)).first()
         if existing:
             if not force_update:
                 console.print(f"[yellow]Skipping existing paper {arxiv_id}")
                 logger.info("Skipping existing paper %s", arxiv_id)
-                return
+                return False
             else:
                 # Delete existing paper and its findings for force update
                 console.print(f"[cyan]Force updating existing paper {arxiv_id}")
@@ -100,25 +134,53 @@ def ingest_paper(arxiv_id: str, fetcher: ArxivFetcher, listing_date: date, force
                 findings = session.exec(select(Finding).where(Finding.paper_id == existing.id)).all()
                 for finding in findings:
                     session.delete(finding)
+                remove_paper(session, existing.id)
                 session.delete(existing)
+                bump_data_version(session)
                 session.commit()
+    return True
+
 
-    paper_data = fetcher.fetch(arxiv_id)
+def analyze_paper(
+    paper_data: ArxivPaper,
+    use_llm_cache: bool = True,
+    llm_client: Optional[AsyncLLMClient] = None,
+    io_loop: Optional[BackgroundLoop] = None,
+    tier: str = TIER_FULL,
+) -> LLMAnalysis:
     logger.info(
         "Fetched arXiv content for %s (%s) via %s",
-        arxiv_id,
+        paper_data.arxiv_id,
         paper_data.title,
         paper_data.source,
     )
-    analysis = analyze_paper_with_llm(paper_data)
+    if tier == TIER_FULL and needs_map_reduce(paper_data):
+        # too long for one prompt: analyse every chunk, then merge
+        if llm_client is not None and io_loop is not None:
+            analysis = io_loop.run(analyze_long_paper_with_llm_async(paper_data, llm_client, use_cache=use_llm_cache))
+        else:
+            analysis = analyze_long_paper_with_llm(paper_data, use_cache=use_llm_cache)
+    elif llm_client is not None and io_loop is not None:
+        # analyze workers block on the shared loop, which multiplexes their requests over one client
+        analysis = io_loop.run(
+            analyze_paper_with_llm_async(paper_data, llm_client, use_cache=use_llm_cache, tier=tier)
+        )
+    else:
+        analysis = analyze_paper_with_llm(paper_data, use_cache=use_llm_cache, tier=tier)
     logger.info(
         "LLM analysis complete for %s | breakthrough=%s score=%.3f",
-        arxiv_id,
+        paper_data.arxiv_id,
         analysis.breakthrough_label,
         analysis.breakthrough_score,
     )
+    return analysis
+
 
-    with session_scope() as session:
+def store_paper(paper_data: ArxivPaper, analysis: LLMAnalysis, listing_date: date) -> None:
+    arxiv_id = paper_data.arxiv_id
+    # compress and write the raw HTML before taking the SQLite write lock
+    html_blob_key = get_blob_store().put(paper_data.raw_html) if paper_data.raw_html else None
+    with write_lock, session_scope() as session:
         db_paper = Paper(
             arxiv_id=paper_data.arxiv_id,
             title=paper_data.title,
@@ -128,7 +190,7 @@ def ingest_paper(arxiv_id: str, fetcher: ArxivFetcher, listing_date: date, force
             source_url=f"https://huggingface.co/papers/{paper_data.arxiv_id}",
             published_at=paper_data.published_at,
             hf_listing_date=listing_date.isoformat(),
-            html_source=paper_data.raw_html,
+            html_blob_key=html_blob_key,
             problem_summary=analysis.problem,
             solution_summary=analysis.solution,
             effect_summary=analysis.effect,
@@ -136,7 +198,8 @@ def ingest_paper(arxiv_id: str, fetcher: ArxivFetcher, listing_date: date, force
             breakthrough_score=analysis.breakthrough_score,
             breakthrough_label=analysis.breakthrough_label,
             breakthrough_reason=analysis.breakthrough_reason,
-            llm_model=settings.deepseek_model if settings.deepseek_api_key else None,
+            llm_model=analysis.llm_model,
+            llm_version=analysis.llm_version,
             updated_at=datetime.utcnow(),
         )
         session.add(db_paper)
@@ -154,23 +217,236 @@ def ingest_paper(arxiv_id: str, fetcher: ArxivFetcher, listing_date: date, force
             )
 
         upsert_keywords(session, analysis.keywords)
+        index_paper(session, db_paper, [finding.claim_text for finding in analysis.findings])
+        if settings.vector_index_enabled:
+            # appended before the commit so a stored paper always has a vector; the API skips
+            # ids whose transaction never committed, and the next record for an id replaces it
+            get_vector_index().add(db_paper.id, embed_paper(db_paper))
+        # committed with the paper, so API workers drop their cached listings
+        bump_data_version(session)
         console.print(
             f"[green]Stored {arxiv_id} | breakthrough={'yes' if analysis.breakthrough_label else 'no'}"
         )
         logger.info("Stored paper %s with %d findings", arxiv_id, len(analysis.findings))
 
 
-def run_ingest(limit: int | None = None, target_date: date | None = None, debug: bool = False, force_update: bool = False) -> None:
+@dataclass
+class IngestItem:
+    """Carrier passed between pipeline stages; stages skip work whose output is already set."""
+
+    arxiv_id: str
+    download: Optional[ArxivDownload] = None
+    paper: Optional[ArxivPaper] = None
+    analysis: Optional[LLMAnalysis] = None
+
+
+def build_pipeline(
+    fetcher: AsyncArxivFetcher,
+    io_loop: BackgroundLoop,
+    journal: IngestJournal,
+    listing_date: date,
+    force_update: bool,
+    workers: Dict[str, int],
+    queue_size: int,
+    on_complete,
+    on_error,
+    metadata: Optional[Dict[str, ArxivMetadata]] = None,
+    use_llm_cache: bool = True,
+    llm_client: Optional[AsyncLLMClient] = None,
+    stage_names: Sequence[str] = PIPELINE_STAGES,
+    triage: Optional[TriagePolicy] = None,
+) -> StagedPipeline:
+    """fetch (network) -> parse (HTML/PDF, CPU) -> analyze (LLM) -> store (SQLite, single writer).
+
+    ``stage_names`` picks a contiguous part of that chain, so a run can stop after parse
+    (batch analysis, top-K triage) and continue with analyze/store once every paper is parsed.
+    """
+
+    def fetch_stage(item: IngestItem) -> Optional[IngestItem]:
+        if not prepare_paper(item.arxiv_id, force_update=force_update):
+            return None
+        if item.paper is None:
+            # fetch workers block on the shared event loop, which multiplexes their requests
+            item.download = io_loop.run(fetcher.download(item.arxiv_id, (metadata or {}).get(item.arxiv_id)))
+        return item
+
+    def parse_stage(item: IngestItem) -> IngestItem:
+        if item.paper is None:
+            item.paper = fetcher.parse(item.download)
+            item.download = None
+            journal.record_fetched(item.paper)
+        return item
+
+    def analyze_stage(item: IngestItem) -> IngestItem:
+        if item.analysis is None:
+            tier = triage.tier(item.paper) if triage else TIER_FULL
+            item.analysis = analyze_paper(item.paper, use_llm_cache, llm_client, io_loop, tier)
+            journal.record_analyzed(item.arxiv_id, item.analysis)
+        return item
+
+    def store_stage(item: IngestItem) -> IngestItem:
+        store_paper(item.paper, item.analysis, listing_date)
+        journal.record_stored(item.arxiv_id)
+        return item
+
+    stages = {
+        "fetch": Stage("fetch", fetch_stage, workers=workers["fetch"], queue_size=queue_size),
+        "parse": Stage("parse", parse_stage, workers=workers["parse"], queue_size=queue_size),
+        "analyze": Stage("analyze", analyze_stage, workers=workers["analyze"], queue_size=queue_size),
+        "store": Stage("store", store_stage, workers=1, queue_size=queue_size),
+    }
+    return StagedPipeline([stages[name] for name in stage_names], on_complete=on_complete, on_error=on_error)
+
+
+def analyze_and_store_batch(
+    items: List[IngestItem],
+    journal: IngestJournal,
+    listing_date: date,
+    use_llm_cache: bool,
+    on_error,
+    tiers: Optional[Dict[str, str]] = None,
+) -> None:
+    """Analyse every parsed paper in one batch-API job, then store them (``--llm-batch``)."""
+    pending = [item.paper for item in items if item.analysis is None]
+    if pending:
+        console.print(f"[cyan]Submitting {len(pending)} papers to the LLM batch API; polling for results[/cyan]")
+        analyses = analyze_papers_with_llm_batch(pending, use_cache=use_llm_cache, tiers=tiers)
+        for item in items:
+            if item.analysis is None:
+                item.analysis = analyses[item.arxiv_id]
+                journal.record_analyzed(item.arxiv_id, item.analysis)
+    for item in items:
+        try:
+            store_paper(item.paper, item.analysis, listing_date)
+            journal.record_stored(item.arxiv_id)
+        except Exception as exc:  # noqa: BLE001
+            on_error(item.arxiv_id, "store", exc)
+
+
+def report_stage_stats(stats: List[StageStats]) -> None:
+    table = Table(title="Pipeline stages")
+    for column in ("stage", "workers", "done", "skipped", "failed", "items/s", "busy", "avg queue", "max queue"):
+        table.add_column(column, justify="right" if column != "stage" else "left")
+    for item in stats:
+        table.add_row(
+            item.name,
+            str(item.workers),
+            str(item.processed),
+            str(item.dropped),
+            str(item.failed),
+            f"{item.throughput:.2f}",
+            f"{item.utilization:.0%}",
+            f"{item.avg_depth:.1f}/{item.queue_size}",
+            str(item.max_depth),
+        )
+        logger.info(
+            "Stage %s: workers=%d done=%d skipped=%d failed=%d throughput=%.2f/s utilization=%.0f%% "
+            "avg_queue=%.1f max_queue=%d",
+            item.name,
+            item.workers,
+            item.processed,
+            item.dropped,
+            item.failed,
+            item.throughput,
+            item.utilization * 100,
+            item.avg_depth,
+            item.max_depth,
+        )
+    console.print(table)
+
+
+async def _new_llm_client() -> AsyncLLMClient:
+    return AsyncLLMClient()
+
+
+def run_ingest(
+    limit: int | None = None,
+    target_date: date | None = None,
+    debug: bool = False,
+    force_update: bool = False,
+    concurrency: int = 1,
+    fetch_workers: int | None = None,
+    parse_workers: int | None = None,
+    analyze_workers: int | None = None,
+    queue_size: int | None = None,
+    resume: bool = False,
+    use_llm_cache: bool = True,
+    llm_batch: bool = False,
+    triage: bool | None = None,
+    triage_cutoff: float | None = None,
+    triage_top_k: int | None = None,
+) -> None:
     configure_logging(debug=debug)
     init_db()
-    ensure_storage_dirs(Path("storage"))
+    ensure_storage_dirs(settings.storage_dir)
     if target_date is None:
         target_date = (datetime.utcnow() - timedelta(days=1)).date()
+    concurrency = max(1, concurrency)
+    workers = {
+        "fetch": max(1, fetch_workers or concurrency),
+        "parse": max(1, parse_workers or concurrency),
+        # analyze workers mostly wait on the LLM; AsyncLLMClient enforces the real limits
+        "analyze": max(1, analyze_workers or max(concurrency, settings.llm_max_concurrency)),
+    }
+    queue_size = max(1, queue_size or 2 * concurrency)
     console.print(f"[cyan]Fetching Hugging Face daily list for {target_date.isoformat()}[/cyan]")
     if force_update:
         console.print("[magenta]Force update mode enabled - will re-analyze existing papers[/magenta]")
-    logger.info("Starting ingest for %s (force_update=%s)", target_date.isoformat(), force_update)
-    identifiers = fetch_daily_identifiers(target_date)
+    logger.info(
+        "Starting ingest for %s (force_update=%s, workers=%s, queue_size=%d)",
+        target_date.isoformat(),
+        force_update,
+        workers,
+        queue_size,
+    )
+    io_loop = BackgroundLoop()
+    pool = AsyncHttpPool()
+    fetcher = AsyncArxivFetcher(pool=pool)
+    # built on the loop that will drive it, which owns its asyncio primitives and connections
+    llm_client = io_loop.run(_new_llm_client()) if settings.deepseek_api_key and not llm_batch else None
+    if triage is None:
+        # an explicit cutoff or cap implies triage
+        triage = settings.triage_enabled or triage_cutoff is not None or triage_top_k is not None
+    triage_policy = TriagePolicy(cutoff=triage_cutoff, top_k=triage_top_k) if triage else None
+    try:
+        _run_pipeline(
+            fetcher,
+            io_loop,
+            limit,
+            target_date,
+            force_update,
+            workers,
+            queue_size,
+            resume,
+            use_llm_cache,
+            llm_client,
+            llm_batch,
+            triage_policy,
+        )
+    finally:
+        io_loop.run(pool.aclose())
+        if llm_client is not None:
+            io_loop.run(llm_client.aclose())
+        io_loop.close()
+        get_pdf_extractor().close()
+        logger.info("Completed ingest for %s", target_date.isoformat())
+
+
+def _run_pipeline(
+    fetcher: AsyncArxivFetcher,
+    io_loop: BackgroundLoop,
+    limit: int | None,
+    target_date: date,
+    force_update: bool,
+    workers: Dict[str, int],
+    queue_size: int,
+    resume: bool,
+    use_llm_cache: bool = True,
+    llm_client: Optional[AsyncLLMClient] = None,
+    llm_batch: bool = False,
+    triage: Optional[TriagePolicy] = None,
+) -> None:
+    identifiers = io_loop.run(fetch_daily_identifiers_async(target_date, pool=fetcher.pool))
     if limit:
         identifiers = identifiers[:limit]
     if not identifiers:
@@ -178,21 +454,114 @@ def run_ingest(limit: int | None = None, target_date: date | None = None, debug:
         logger.warning("No identifiers found for %s", target_date.isoformat())
         return
 
-    fetcher = ArxivFetcher()
-    try:
+    journal = IngestJournal.start(target_date, resume=resume)
+    checkpoints = journal.load() if resume else {}
+    items: List[IngestItem] = []
+    for arxiv_id in identifiers:
+        checkpoint = checkpoints.get(arxiv_id)
+        if checkpoint and checkpoint.stage == STAGE_STORED:
+            logger.info("Resume: %s already stored in run %s", arxiv_id, journal.run_id)
+            continue
+        item = IngestItem(arxiv_id=arxiv_id)
+        if checkpoint:
+            item.paper = checkpoint.paper
+            item.analysis = checkpoint.analysis if item.paper else None
+            logger.info("Resume: %s continues after stage %s", arxiv_id, checkpoint.stage)
+        items.append(item)
+    if resume:
+        console.print(
+            f"[cyan]Resuming run {journal.run_id}: {len(identifiers) - len(items)} already stored, "
+            f"{sum(1 for item in items if item.paper)} with cached fetch results[/cyan]"
+        )
+
+    failures: List[str] = []
+
+    def on_error(arxiv_id: str, stage: str, exc: BaseException) -> None:
+        failures.append(arxiv_id)
+        console.print(f"[red]Failed to ingest {arxiv_id} ({stage}): {exc}")
+        logger.error("Failed to ingest %s during %s stage: %s", arxiv_id, stage, exc)
+        journal.record_error(arxiv_id, f"{stage}: {exc}")
+
+    to_fetch = [item.arxiv_id for item in items if item.paper is None]
+    if to_fetch and not force_update:
+        # papers already in the database are skipped by the fetch stage; don't look them up
+        with session_scope() as session:
+            stored = set(session.exec(select(Paper.arxiv_id).where(Paper.arxiv_id.in_(to_fetch))).all())
+        to_fetch = [arxiv_id for arxiv_id in to_fetch if arxiv_id not in stored]
+    metadata: Dict[str, ArxivMetadata] = {}
+    if to_fetch:
+        try:
+            metadata = io_loop.run(fetcher.fetch_metadata_batch(to_fetch))
+        except Exception:  # noqa: BLE001
+            logger.exception("Batched metadata fetch failed; falling back to per-paper queries")
+        console.print(f"[cyan]Resolved metadata for {len(metadata)}/{len(to_fetch)} papers in bulk[/cyan]")
+
+    def run_stages(stage_names: Sequence[str], work: List[IngestItem], description: str) -> List[StageStats]:
         with Progress() as progress:
-            task = progress.add_task("Ingesting papers", total=len(identifiers))
-            for arxiv_id in identifiers:
-                try:
-                    ingest_paper(arxiv_id, fetcher, listing_date=target_date, force_update=force_update)
-                except Exception as exc:  # noqa: BLE001
-                    console.print(f"[red]Failed to ingest {arxiv_id}: {exc}")
-                    logger.exception("Failed to ingest %s", arxiv_id)
-                finally:
-                    progress.advance(task)
-    finally:
-        fetcher.close()
-        logger.info("Completed ingest for %s", target_date.isoformat())
+            task = progress.add_task(description, total=len(work))
+            pipeline: StagedPipeline
+
+            def on_complete(_: str) -> None:
+                depths = " | ".join(f"{name} {depth}" for name, depth in pipeline.depths())
+                progress.update(task, advance=1, description=f"{description} [{depths}]")
+
+            pipeline = build_pipeline(
+                fetcher,
+                io_loop,
+                journal,
+                target_date,
+                force_update,
+                workers,
+                queue_size,
+                on_complete,
+                on_error,
+                metadata=metadata,
+                use_llm_cache=use_llm_cache,
+                llm_client=llm_client,
+                stage_names=stage_names,
+                triage=triage,
+            )
+            return pipeline.run((item.arxiv_id, item) for item in work)
+
+    # batch analysis and a top-K triage cap need every paper parsed before the first LLM call
+    split = llm_batch or (triage is not None and triage.needs_ranking)
+    if not split:
+        stats = run_stages(PIPELINE_STAGES, items, "Ingesting papers")
+    else:
+        stats = run_stages(PIPELINE_STAGES[:2], items, "Fetching papers")
+        failed = set(failures)
+        parsed = [item for item in items if item.paper is not None and item.arxiv_id not in failed]
+        tiers = triage.rank(item.paper for item in parsed if item.analysis is None) if triage else None
+        try:
+            if llm_batch:
+                analyze_and_store_batch(parsed, journal, target_date, use_llm_cache, on_error, tiers)
+        except BatchError as exc:
+            # nothing was stored yet; the per-paper stages pick up every paper still without an analysis
+            console.print(f"[red]LLM batch failed ({exc}); analysing papers one by one[/red]")
+            logger.error("LLM batch failed, falling back to per-paper analysis: %s", exc)
+            llm_batch = False
+        if not llm_batch:
+            stats += run_stages(PIPELINE_STAGES[2:], parsed, "Analysing papers")
+    report_stage_stats(stats)
+    if triage is not None:
+        console.print(f"[cyan]Triage: {triage.summary()}[/cyan]")
+        logger.info("Triage: %s", triage.summary())
+    if fetcher.cache:
+        console.print(f"[cyan]HTTP cache: {fetcher.cache.stats.summary()}[/cyan]")
+        logger.info("HTTP cache: %s", fetcher.cache.stats.summary())
+    if llm_client is not None:
+        console.print(f"[cyan]LLM client: {llm_client.stats.summary()}[/cyan]")
+        logger.info("LLM client: %s", llm_client.stats.summary())
+        if len(llm_client.endpoints) > 1:
+            console.print(f"[cyan]LLM endpoints: {llm_client.endpoint_summary()}[/cyan]")
+            logger.info("LLM endpoints: %s", llm_client.endpoint_summary())
+    llm_cache = get_llm_cache()
+    if llm_cache:
+        console.print(f"[cyan]LLM cache: {llm_cache.stats.summary()}[/cyan]")
+        logger.info("LLM cache: %s", llm_cache.stats.summary())
+    console.print(f"[cyan]Rate limits: {get_rate_limiter().summary()}[/cyan]")
+    logger.info("Rate limits: %s", get_rate_limiter().summary())
+    journal.finish(failed=len(failures))
 
 
 if __name__ == "__main__":
@@ -210,6 +579,54 @@ if __name__ == "__main__":
         action="store_true",
         help="Force re-analysis of existing papers (will delete and re-ingest)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Default worker count for the fetch/parse/analyze stages (default: 1)",
+    )
+    parser.add_argument("--fetch-workers", type=int, default=None, help="Workers for the network fetch stage")
+    parser.add_argument("--parse-workers", type=int, default=None, help="Workers for the HTML/PDF parse stage")
+    parser.add_argument("--analyze-workers", type=int, default=None, help="Workers for the LLM analysis stage")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the last unfinished run for this date, reusing fetched/analyzed papers",
+    )
+    parser.add_argument(
+        "--llm-batch",
+        action="store_true",
+        help="Analyse papers through the offline batch API (cheaper, results can take hours)",
+    )
+    parser.add_argument(
+        "--triage",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Score papers locally and send only the promising ones the full-section prompt (default: TRIAGE_ENABLED)",
+    )
+    parser.add_argument(
+        "--triage-cutoff",
+        type=float,
+        default=None,
+        help="Minimum triage score (0-1) for the full analysis (default: TRIAGE_CUTOFF)",
+    )
+    parser.add_argument(
+        "--triage-top-k",
+        type=int,
+        default=None,
+        help="At most this many papers get the full analysis; 0 = no cap (default: TRIAGE_TOP_K)",
+    )
+    parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Ignore cached LLM responses (fresh responses still refresh the cache)",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=None,
+        help="Bounded queue size between stages (default: 2 x concurrency)",
+    )
     args = parser.parse_args()
     target = None
     if args.date:
@@ -217,4 +634,22 @@ if __name__ == "__main__":
             target = datetime.strptime(args.date, "%Y-%m-%d").date()
         except ValueError:
             parser.error(f"Invalid date format: {args.date}. Use YYYY-MM-DD.")
-    run_ingest(limit=args.limit, target_date=target, debug=args.debug, force_update=args.force_update)
\ No newline at end of file
+    if args.concurrency < 1:
+        parser.error("--concurrency must be >= 1")
+    run_ingest(
+        limit=args.limit,
+        target_date=target,
+        debug=args.debug,
+        force_update=args.force_update,
+        concurrency=args.concurrency,
+        fetch_workers=args.fetch_workers,
+        parse_workers=args.parse_workers,
+        analyze_workers=args.analyze_workers,
+        queue_size=args.queue_size,
+        resume=args.resume,
+        use_llm_cache=not args.no_llm_cache,
+        llm_batch=args.llm_batch,
+        triage=args.triage,
+        triage_cutoff=args.triage_cutoff,
+        triage_top_k=args.triage_top_k,
+    )
\ No newline at end of file
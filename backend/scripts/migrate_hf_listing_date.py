@@ -22,6 +22,7 @@ if str(ROOT_DIR) not in sys.path:
 
 from app.db.session import engine  # noqa: E402
 from app.models import Paper  # noqa: E402
+from app.services.response_cache import bump_data_version  # noqa: E402
 
 console = Console()
 
@@ -68,6 +69,8 @@ def migrate() -> None:
                     f"[cyan]{paper.arxiv_id}[/cyan] {paper.hf_listing_date!r} -> {normalized}")
                 paper.hf_listing_date = normalized
                 updated += 1
+        if updated:
+            bump_data_version(session)
         session.commit()
     console.print(f"[green]Migration complete. Updated {updated} papers; skipped {skipped}.")
 
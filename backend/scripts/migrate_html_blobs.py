@@ -0,0 +1,120 @@
+"""Move paper.html_source into the compressed blob store.
+
+Copies every inline HTML source to STORAGE_DIR/blobs, points paper.html_blob_key at it,
+then drops the old column and VACUUMs so the database file actually shrinks.
+Safe to re-run: rows that already have a blob key are skipped.
+
+Usage:
+    python migrate_html_blobs.py [--batch-size 50] [--no-vacuum] [--prune]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from rich.console import Console
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from app.db.session import engine, init_db  # noqa: E402
+from app.services.blob_store import get_blob_store  # noqa: E402
+
+console = Console()
+
+
+def database_size() -> int | None:
+    path = engine.url.database
+    if engine.url.get_backend_name() != "sqlite" or not path or path == ":memory:":
+        return None
+    return Path(path).stat().st_size
+
+
+def move_sources(batch_size: int) -> int:
+    store = get_blob_store()
+    moved = 0
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(
+                text(
+                    "SELECT id, arxiv_id, html_source FROM paper "
+                    "WHERE html_source IS NOT NULL AND html_blob_key IS NULL LIMIT :limit"
+                ),
+                {"limit": batch_size},
+            ).all()
+            if not rows:
+                return moved
+            for paper_id, arxiv_id, html in rows:
+                key = store.put(html)
+                connection.execute(
+                    text("UPDATE paper SET html_blob_key = :key, html_source = NULL WHERE id = :id"),
+                    {"key": key, "id": paper_id},
+                )
+                console.print(f"[cyan]{arxiv_id}[/cyan] {len(html) / 1e6:.2f}MB -> {key[:12]}")
+            moved += len(rows)
+
+
+def drop_column() -> None:
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("ALTER TABLE paper DROP COLUMN html_source"))
+    except OperationalError as exc:  # SQLite < 3.35 cannot drop columns
+        console.print(f"[yellow]Kept empty html_source column: {exc}")
+    else:
+        console.print("[green]Dropped paper.html_source")
+
+
+def prune_orphans() -> int:
+    store = get_blob_store()
+    with engine.connect() as connection:
+        referenced = {
+            key for (key,) in connection.execute(text("SELECT html_blob_key FROM paper WHERE html_blob_key IS NOT NULL"))
+        }
+        # papers fetched by an unfinished ingest run are journaled with a blob key but not stored yet
+        referenced.update(
+            key
+            for (key,) in connection.execute(
+                text("SELECT json_extract(paper_payload, '$.html_blob_key') FROM ingestcheckpoint")
+            )
+            if key
+        )
+    removed = 0
+    for key in list(store.keys()):
+        if key not in referenced:
+            store.delete(key)
+            removed += 1
+    return removed
+
+
+def migrate(batch_size: int = 50, vacuum: bool = True, prune: bool = False) -> None:
+    init_db()  # adds paper.html_blob_key to older databases
+    before = database_size()
+    columns = {column["name"] for column in inspect(engine).get_columns("paper")}
+    if "html_source" in columns:
+        moved = move_sources(batch_size)
+        console.print(f"[green]Moved {moved} HTML sources to {get_blob_store().root}")
+        drop_column()
+    else:
+        console.print("[yellow]paper.html_source not present; nothing to move")
+    if prune:
+        console.print(f"[green]Pruned {prune_orphans()} unreferenced blobs")
+    if vacuum and engine.url.get_backend_name() == "sqlite":
+        with engine.connect() as connection:
+            connection.exec_driver_sql("VACUUM")
+    after = database_size()
+    if before is not None and after is not None:
+        console.print(f"[green]Database size: {before / 1e6:.1f}MB -> {after / 1e6:.1f}MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move inline paper HTML into the compressed blob store")
+    parser.add_argument("--batch-size", type=int, default=50, help="Rows converted per transaction")
+    parser.add_argument("--no-vacuum", action="store_true", help="Skip VACUUM after the move")
+    parser.add_argument("--prune", action="store_true", help="Delete blobs no paper references")
+    args = parser.parse_args()
+    migrate(batch_size=args.batch_size, vacuum=not args.no_vacuum, prune=args.prune)
@@ -0,0 +1 @@
+# Test API routes package
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+Query-count and pagination tests for the papers routes.
+"""
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.api.routes.papers import NEXT_CURSOR_HEADER, SUMMARY_COLUMNS, get_paper, list_papers, page_rows
+from app.models import Finding, Paper
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'papers.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        for index in range(60):
+            paper = Paper(
+                arxiv_id=f"2401.{index:05d}",
+                title=f"Paper {index}",
+                authors=["A"],
+                institutions=[],
+                keywords=["llm"],
+                hf_listing_date=f"2024-01-{index % 3 + 1:02d}",
+                html_blob_key=f"blob-{index}",
+            )
+            paper.findings = [Finding(claim_text=f"claim {index}.{n}", metrics=[]) for n in range(2)]
+            session.add(paper)
+        session.commit()
+    return engine
+
+
+def _list(session, limit, cursor=None, response=None):
+    return list_papers(
+        db=session,
+        response=response or Response(),
+        target_date=None,
+        breakthrough_only=False,
+        limit=limit,
+        cursor=cursor,
+    )
+
+
+def _count_queries(engine, statements):
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    return lambda: event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.mark.parametrize("limit", [1, 20, 100])
+def test_listing_uses_two_queries_whatever_the_limit(engine, limit):
+    statements = []
+    with Session(engine) as session:
+        stop = _count_queries(engine, statements)
+        papers = _list(session, limit)
+        stop()
+    assert len(papers) == min(limit, 60)
+    for paper in papers:
+        index = int(paper.arxiv_id.split(".")[1])
+        assert [finding.claim_text for finding in paper.findings] == [f"claim {index}.0", f"claim {index}.1"]
+    assert len(statements) == 2
+    assert not any("html_blob_key" in statement for statement in statements)
+
+
+def test_detail_uses_two_queries(engine):
+    statements = []
+    with Session(engine) as session:
+        stop = _count_queries(engine, statements)
+        paper = get_paper(paper_id=5, db=session)
+        stop()
+    assert paper.arxiv_id == "2401.00004"
+    assert [finding.claim_text for finding in paper.findings] == ["claim 4.0", "claim 4.1"]
+    assert len(statements) == 2
+
+
+def test_cursor_pages_cover_every_paper_once(engine):
+    with Session(engine) as session:
+        # papers without a listing date sort after all dated ones
+        session.add_all(
+            Paper(arxiv_id=f"2301.{index:05d}", title="Undated", authors=[], institutions=[], keywords=[])
+            for index in range(5)
+        )
+        session.commit()
+        expected = [row.arxiv_id for row in page_rows(session, select(*SUMMARY_COLUMNS), None, 1000)]
+
+        seen, cursor, queries = [], None, []
+        while True:
+            statements = []
+            response = Response()
+            stop = _count_queries(engine, statements)
+            page = _list(session, 25, cursor, response)
+            stop()
+            queries.append(len(statements))
+            seen += [paper.arxiv_id for paper in page]
+            cursor = response.headers.get(NEXT_CURSOR_HEADER)
+            if cursor is None:
+                break
+
+    assert seen == expected and len(seen) == 65
+    assert expected[-5:] == [f"2301.{index:05d}" for index in range(4, -1, -1)]
+    # rows + findings, plus one more seek on the page that reaches the undated papers
+    assert queries == [2, 2, 3]
+
+
+def test_cursor_is_a_range_seek_and_rejects_garbage(engine):
+    with Session(engine) as session:
+        response = Response()
+        _list(session, 10, response=response)
+        statements = []
+        stop = _count_queries(engine, statements)
+        _list(session, 10, response.headers[NEXT_CURSOR_HEADER])
+        stop()
+        with engine.connect() as connection:
+            plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statements[0]}", ("2024-01-03", 1, 11, 0)).all()
+        with pytest.raises(HTTPException) as error:
+            _list(session, 10, "bm90IGpzb24")
+    assert any("SEARCH" in str(step) for step in plan)
+    assert error.value.status_code == 400
@@ -0,0 +1,124 @@
+"""
+Tests for the data-versioned API response cache and its ETag/304 handling.
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.api.deps import get_db
+from app.api.routes import keywords, papers
+from app.models import KeywordStat, Paper
+from app.services.response_cache import ResponseCacheMiddleware, bump_data_version
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'papers.db'}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        for index in range(30):
+            session.add(
+                Paper(
+                    arxiv_id=f"2401.{index:05d}",
+                    title=f"Paper {index}",
+                    authors=["A"],
+                    institutions=[],
+                    keywords=["llm"],
+                    hf_listing_date=f"2024-01-{index % 3 + 1:02d}",
+                )
+            )
+        session.add(KeywordStat(keyword="llm", paper_count=30))
+        session.commit()
+    return engine
+
+
+def _app(engine) -> FastAPI:
+    app = FastAPI()
+    app.include_router(papers.router, prefix="/api")
+    app.include_router(keywords.router, prefix="/api")
+
+    def db():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_db] = db
+    return app
+
+
+def _worker(engine) -> TestClient:
+    """One API process: its own app and in-memory cache over the shared database."""
+    app = _app(engine)
+    app.add_middleware(ResponseCacheMiddleware, max_entries=8, bind=engine)
+    return TestClient(app)
+
+
+def test_repeat_loads_skip_the_route_and_revalidate_with_304(engine):
+    client = _worker(engine)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    first = client.get("/api/papers", params={"limit": 5})
+    misses = len(statements)
+    statements.clear()
+    again = client.get("/api/papers", params={"limit": 5})
+    event.remove(engine, "before_cursor_execute", record)
+
+    assert first.status_code == again.status_code == 200
+    assert again.content == first.content and again.headers["etag"] == first.headers["etag"]
+    assert again.headers[papers.NEXT_CURSOR_HEADER] == first.headers[papers.NEXT_CURSOR_HEADER]
+    assert misses >= 3 and len(statements) == 1  # only the data-version lookup
+
+    etag = first.headers["etag"]
+    assert etag.startswith('"')  # strong validator
+    not_modified = client.get("/api/papers", params={"limit": 5}, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert client.get("/api/papers", params={"limit": 6}, headers={"If-None-Match": etag}).status_code == 200
+    assert client.get("/api/papers", params={"cursor": "%%%"}).status_code == 400
+
+
+def test_ingest_bump_invalidates_every_worker(engine):
+    workers = [_worker(engine), _worker(engine)]
+    before = [worker.get("/api/papers/calendar") for worker in workers]
+    stats = workers[0].get("/api/keywords/stats")
+    assert before[0].json() == ["2024-01-03", "2024-01-02", "2024-01-01"]
+
+    # what daily_ingest.store_paper commits for a new day
+    with Session(engine) as session:
+        session.add(Paper(arxiv_id="2401.99999", title="New", authors=[], institutions=[], keywords=[],
+                          hf_listing_date="2024-01-04"))
+        session.add(KeywordStat(keyword="agents", paper_count=1))
+        bump_data_version(session)
+        session.commit()
+
+    for worker, old in zip(workers, before):
+        fresh = worker.get("/api/papers/calendar", headers={"If-None-Match": old.headers["etag"]})
+        assert fresh.status_code == 200 and fresh.json()[0] == "2024-01-04"
+        assert fresh.headers["etag"] != old.headers["etag"]
+    assert len(workers[0].get("/api/keywords/stats").json()) == len(stats.json()) + 1
+
+
+def test_byte_budget_evicts_least_recently_used_bodies(engine):
+    uncached = TestClient(_app(engine))
+    sizes = {limit: len(uncached.get("/api/papers", params={"limit": limit}).content) for limit in (2, 3)}
+    cache = ResponseCacheMiddleware(_app(engine), max_entries=8, max_bytes=sizes[2] + sizes[3], bind=engine)
+    client = TestClient(cache)
+
+    def cached():
+        return [dict(query)["limit"] for _, query in cache.entries]
+
+    client.get("/api/papers", params={"limit": 2})
+    client.get("/api/papers", params={"limit": 3})
+    assert cached() == ["2", "3"] and cache.size == sizes[2] + sizes[3]
+
+    client.get("/api/papers", params={"limit": 2})  # a hit refreshes its place in the LRU
+    client.get("/api/papers", params={"limit": 1})
+    assert cached() == ["2", "1"] and cache.size <= cache.max_bytes
+
+    # larger than the whole budget: served, but not cached and nothing evicted for it
+    assert len(client.get("/api/papers", params={"limit": 20}).json()) == 20
+    assert cached() == ["2", "1"]
@@ -0,0 +1,127 @@
+"""
+Tests for the FTS5 paper search index and the /papers/search route.
+"""
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.api.routes import papers
+from app.api.routes.papers import search_papers, similar_papers
+from app.core.config import settings
+from app.models import Finding, Paper
+from app.services.paper_search import create_search_table, index_paper, rebuild_search_index, remove_paper
+from app.services.vector_index import VectorIndex, embed_paper
+
+PAPERS = [
+    ("Sparse Attention Models for Long Context", "稀疏注意力让长文本推理提速 3 倍", ["Speeds up decoding"]),
+    ("Reward Modeling at Scale", "研究奖励模型的对齐效果", ["Sparse <b>rewards</b> hurt alignment"]),
+    ("Video Diffusion", "视频生成", ["推理成本下降一半"]),
+]
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'papers.db'}")
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as connection:
+        create_search_table(connection)
+    with Session(engine) as session:
+        for index, (title, problem, claims) in enumerate(PAPERS):
+            paper = Paper(
+                arxiv_id=f"2401.{index:05d}",
+                title=title,
+                authors=["A"],
+                institutions=[],
+                keywords=[],
+                problem_summary=problem,
+            )
+            paper.findings = [Finding(claim_text=claim, metrics=[]) for claim in claims]
+            session.add(paper)
+            session.flush()
+            index_paper(session, paper, claims)
+        session.commit()
+    return engine
+
+
+def _search(session, q, limit=20):
+    return search_papers(db=session, q=q, mode="keyword", limit=limit, offset=0)
+
+
+def test_search_ranks_highlights_and_matches_chinese_words(engine):
+    with Session(engine) as session:
+        sparse = _search(session, "sparse")
+        # stemmed English terms, title hits ranked above finding hits
+        assert [hit.arxiv_id for hit in sparse] == ["2401.00000", "2401.00001"]
+        assert sparse[0].score > sparse[1].score
+        assert "<mark>Sparse</mark>" in sparse[0].snippet
+        assert "&lt;b&gt;" in sparse[1].snippet and sparse[1].findings[0].claim_text.startswith("Sparse")
+        assert {hit.arxiv_id for hit in _search(session, "model")} == {"2401.00000", "2401.00001"}
+
+        # a Chinese word matches as a phrase of characters, not as a whole sentence
+        reasoning = _search(session, "推理")
+        assert {hit.arxiv_id for hit in reasoning} == {"2401.00000", "2401.00002"}
+        assert "<mark>推理</mark>" in reasoning[0].snippet and "\u200b" not in reasoning[0].snippet
+        assert [hit.arxiv_id for hit in _search(session, "推理 sparse")] == ["2401.00000"]
+        assert _search(session, "理提速倍") == []
+
+        # FTS5 syntax in the input is searched literally, never parsed
+        for query in ['"', "NEAR(", "title:video", "a OR", "*", "-"]:
+            assert isinstance(_search(session, query), list)
+
+
+def test_reindex_remove_and_rebuild(engine):
+    with Session(engine) as session:
+        paper = session.get(Paper, 3)
+        paper.title = "Video Diffusion Transformers"
+        index_paper(session, paper, ["Fewer sampling steps"])
+        session.commit()
+        assert [hit.id for hit in _search(session, "transformers")] == [3]
+        assert _search(session, "推理成本") == []  # the old findings were replaced, not appended
+
+        remove_paper(session, 1)
+        session.commit()
+        assert _search(session, "attention") == []
+
+        indexed = rebuild_search_index(session.connection())
+        session.commit()
+        assert indexed == 3
+        assert [hit.id for hit in _search(session, "attention")] == [1]
+        assert [hit.id for hit in _search(session, "推理成本")] == [3]  # rebuilt from the finding table
+
+
+def test_similar_papers_and_semantic_mode(engine, tmp_path, monkeypatch):
+    index = VectorIndex(tmp_path / "vectors", dim=256)
+    monkeypatch.setattr(papers, "get_vector_index", lambda: index)
+    monkeypatch.setattr(settings, "vector_dim", 256)
+    abstracts = {
+        1: "Sparse attention makes long-context inference faster.",
+        2: "Reward models trained for preference alignment.",
+        3: "Sparse attention also speeds up long-context video diffusion inference.",
+    }
+    with Session(engine) as session:
+        for paper in session.exec(select(Paper)).all():
+            paper.abstract = abstracts[paper.id]
+            session.add(paper)
+            if paper.id != 1:  # paper 1 predates the index and is embedded on the fly
+                index.add(paper.id, embed_paper(paper))
+        session.commit()
+        index.add(99, embed_paper(session.get(Paper, 3)))  # a paper whose transaction never committed
+
+        similar = similar_papers(paper_id=1, limit=5, db=session)
+        assert [hit.id for hit in similar] == [3]
+        assert similar[0].score > 0.3 and similar[0].snippet is None
+        for missing in [42, 99]:  # never stored, and indexed but never committed
+            with pytest.raises(HTTPException):
+                similar_papers(paper_id=missing, limit=5, db=session)
+
+        # keyword mode needs every word; semantic mode ranks partial matches
+        assert _search(session, "reward preference video") == []
+        semantic = search_papers(db=session, q="reward preference video", mode="semantic", limit=1, offset=0)
+        assert [hit.id for hit in semantic] == [2]
+
+        # the stale id 99 ties with paper 3 in the index but must not shorten a page
+        pages = [
+            search_papers(db=session, q="video diffusion reward", mode="semantic", limit=1, offset=offset)
+            for offset in range(3)
+        ]
+        assert [[hit.id for hit in page] for page in pages] == [[3], [2], []]
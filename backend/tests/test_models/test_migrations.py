@@ -0,0 +1,45 @@
+"""
+Tests for the startup schema migration that every API worker runs.
+"""
+from sqlalchemy import inspect, text
+from sqlmodel import create_engine
+
+from app.db import session as db_session
+
+
+def _columns(engine, table):
+    return {column["name"] for column in inspect(engine).get_columns(table)}
+
+
+def test_init_db_tolerates_a_worker_adding_the_same_column_first(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'papers.db'}")
+    monkeypatch.setattr(db_session, "engine", engine)
+    db_session.init_db()
+    # an older database, from before llm_version existed
+    with engine.begin() as connection:
+        connection.execute(text('ALTER TABLE "paper" DROP COLUMN "llm_version"'))
+
+    class StaleInspector:
+        """What this worker saw at startup, before another worker added the column."""
+
+        def __init__(self, bind):
+            self.schema = {name: inspect(bind).get_columns(name) for name in inspect(bind).get_table_names()}
+            with engine.begin() as connection:
+                connection.execute(text('ALTER TABLE "paper" ADD COLUMN "llm_version" VARCHAR'))
+
+        def has_table(self, name):
+            return name in self.schema
+
+        def get_columns(self, name):
+            return self.schema[name]
+
+    inspectors = iter([StaleInspector])
+
+    def stale_inspect(bind):
+        return next(inspectors, inspect)(bind)
+
+    monkeypatch.setattr(db_session, "inspect", stale_inspect)
+    db_session.init_db()
+
+    assert "llm_version" in _columns(engine, "paper")
+    db_session.init_db()  # and again on an up-to-date schema
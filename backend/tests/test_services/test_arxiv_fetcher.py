@@ -0,0 +1,187 @@
+"""
+Unit tests for arXiv Atom feed parsing and the fetchers' network paths.
+"""
+import asyncio
+from datetime import datetime
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from app.services import arxiv_fetcher, rate_limit
+from app.services.arxiv_fetcher import ArxivFetcher, ArxivFetchError, ArxivParser, AsyncArxivFetcher
+from app.services.async_http import AsyncHttpPool
+from app.services.http_cache import HttpCache
+from app.services.pdf_extractor import PdfText
+from app.services.rate_limit import RateLimiter
+
+ENTRY = """
+  <entry>
+    <id>http://arxiv.org/abs/{identifier}</id>
+    <published>2024-01-02T18:59:59Z</published>
+    <title>{title}
+      spanning two lines</title>
+    <summary>  Abstract of {title}.  </summary>
+    <author><name>Ada Lovelace</name></author>
+    <author><name> Alan Turing </name></author>
+    <category term="cs.CL" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>"""
+
+# what export.arxiv.org returns for an id_list query with one malformed id
+ERROR_ENTRY = """
+  <entry>
+    <id>http://arxiv.org/api/errors#incorrect_id_format_for_9999.bad</id>
+    <title>Error</title>
+    <summary>incorrect id format for 9999.bad</summary>
+    <author><name>arXiv api core</name></author>
+  </entry>"""
+
+
+def feed(*entries: str) -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom">\n'
+        "  <title>arXiv Query</title>" + "".join(entries) + "\n</feed>\n"
+    )
+
+
+@pytest.fixture
+def parser():
+    return ArxivParser(pdf_extractor=object())
+
+
+def test_batch_feed_strips_versions_and_skips_errors_and_missing_ids(parser):
+    text = feed(
+        ENTRY.format(identifier="2401.00001v2", title="Sparse Attention"),
+        ERROR_ENTRY,
+        ENTRY.format(identifier="2401.00002v10", title="Reward Models"),
+        # an entry nobody asked for is ignored rather than trusted
+        ENTRY.format(identifier="2401.00009v1", title="Unrelated"),
+    )
+    results = parser._parse_batch_feed(["2401.00001", "2401.00002", "9999.bad", "2401.00003"], text)
+
+    # 9999.bad came back as an error entry and 2401.00003 not at all: both are left to the per-paper fallback
+    assert sorted(results) == ["2401.00001", "2401.00002"]
+    title, authors, summary, published, categories = results["2401.00001"]
+    assert title.startswith("Sparse Attention") and "spanning two lines" in title
+    assert authors == ["Ada Lovelace", "Alan Turing"]
+    assert summary == "Abstract of Sparse Attention."
+    assert published == datetime(2024, 1, 2, 18, 59, 59)
+    assert categories == ["cs.CL", "cs.LG"]
+
+
+def test_batch_feed_keeps_old_style_identifiers(parser):
+    text = feed(ENTRY.format(identifier="hep-th/9901001v3", title="Old Style"))
+    assert list(parser._parse_batch_feed(["hep-th/9901001"], text)) == ["hep-th/9901001"]
+
+
+def test_single_feed_without_entries_raises(parser):
+    assert parser._parse_single_feed("2401.00001", feed(ENTRY.format(identifier="2401.00001v1", title="T")))[0]
+    with pytest.raises(ArxivFetchError):
+        parser._parse_single_feed("2401.00001", feed())
+
+
+class FakeArxiv:
+    """export.arxiv.org plus arxiv.org: 2401.00001 has an HTML version, 2401.00002 only a PDF."""
+
+    def __init__(self):
+        self.paths = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.paths.append(request.url.path)
+        if request.url.host == "export.arxiv.org":
+            query = parse_qs(request.url.query.decode())
+            if "id_list" in query:
+                ids = query["id_list"][0].split(",")
+            else:
+                ids = [query["search_query"][0].removeprefix("id:")]
+            entries = [ENTRY.format(identifier=f"{arxiv_id}v1", title=f"Paper {arxiv_id}") for arxiv_id in ids]
+            return httpx.Response(200, text=feed(*entries))
+        if request.url.path == "/html/2401.00001":
+            body = '<html><body><div class="ltx_section"><h2>1 Intro</h2><p>Hello.</p></div></body></html>'
+            return httpx.Response(200, text=body)
+        if request.url.path == "/pdf/2401.00002":
+            return httpx.Response(200, content=b"%PDF-1.7 fake")
+        return httpx.Response(404, text="not found")
+
+
+class FakePdfExtractor:
+    def __init__(self):
+        self.seen = []
+
+    def extract(self, path):
+        self.seen.append(path.read_bytes())
+        return PdfText("Extracted PDF text.", 1, 1)
+
+
+@pytest.fixture
+def no_throttle(monkeypatch):
+    limiter = RateLimiter({})
+    monkeypatch.setattr(rate_limit, "get_rate_limiter", lambda: limiter)
+    monkeypatch.setattr(arxiv_fetcher, "get_rate_limiter", lambda: limiter)
+
+
+def _async_fetcher(arxiv, cache, pdf_extractor) -> AsyncArxivFetcher:
+    pool = AsyncHttpPool()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(arxiv.handler))
+    pool.client_for = lambda url: client
+    return AsyncArxivFetcher(pool=pool, cache=cache, pdf_extractor=pdf_extractor)
+
+
+def test_async_fetch_uses_html_then_falls_back_to_the_pdf(tmp_path, no_throttle):
+    arxiv, pdfs = FakeArxiv(), FakePdfExtractor()
+    cache = HttpCache(tmp_path / "cache", max_bytes=1 << 20, ttl_seconds=3600)
+
+    async def run():
+        fetcher = _async_fetcher(arxiv, cache, pdfs)
+        try:
+            metadata = await fetcher.fetch_metadata_batch(["2401.00001", "2401.00002", "2401.00001"])
+            html_paper = await fetcher.fetch("2401.00001")
+            pdf_paper = fetcher.parse(await fetcher.download("2401.00002", metadata["2401.00002"]))
+            return metadata, html_paper, pdf_paper
+        finally:
+            await fetcher.pool.client_for("").aclose()
+
+    metadata, html_paper, pdf_paper = asyncio.run(run())
+    assert sorted(metadata) == ["2401.00001", "2401.00002"]
+    assert html_paper.source == "https://arxiv.org/html/2401.00001"
+    assert html_paper.title.startswith("Paper 2401.00001") and html_paper.authors == ["Ada Lovelace", "Alan Turing"]
+    assert [(s.heading, s.content) for s in html_paper.sections] == [("1 Intro", "Hello.")]
+    assert pdf_paper.source == "https://arxiv.org/pdf/2401.00002"
+    assert pdf_paper.sections[0].content == "Extracted PDF text." and pdfs.seen == [b"%PDF-1.7 fake"]
+    # one id_list query for both papers; the second paper's metadata came from the batch
+    assert arxiv.paths.count("/api/query") == 2
+    assert cache.stats.misses == 3  # HTML, missing HTML, PDF
+    assert not cache._pins  # parsing released the cached PDF for eviction
+
+
+def test_sync_and_async_fetchers_share_batching_and_temp_pdfs(monkeypatch, no_throttle):
+    monkeypatch.setattr(arxiv_fetcher, "METADATA_BATCH_SIZE", 2)
+    # no HTTP cache: PDFs land in temp files the caller deletes
+    monkeypatch.setattr(arxiv_fetcher, "get_http_cache", lambda: None)
+    arxiv = FakeArxiv()
+    ids = [f"2401.0000{i}" for i in range(1, 6)]
+
+    sync_fetcher = ArxivFetcher(pdf_extractor=FakePdfExtractor())
+    sync_fetcher.client = httpx.Client(transport=httpx.MockTransport(arxiv.handler))
+    try:
+        assert sorted(sync_fetcher.fetch_metadata_batch(ids + ids[:1])) == ids
+        path, temporary = sync_fetcher.fetch_pdf_file("2401.00002")
+        assert temporary and path.read_bytes() == b"%PDF-1.7 fake"
+        path.unlink()
+    finally:
+        sync_fetcher.close()
+    assert arxiv.paths.count("/api/query") == 3  # five ids, two per query
+
+    async def run():
+        fetcher = _async_fetcher(arxiv, None, FakePdfExtractor())
+        try:
+            return await fetcher.fetch_metadata_batch(ids), await fetcher.fetch("2401.00002")
+        finally:
+            await fetcher.pool.client_for("").aclose()
+
+    metadata, paper = asyncio.run(run())
+    assert sorted(metadata) == ids
+    assert paper.raw_text == "Extracted PDF text."
+    assert arxiv.paths.count("/api/query") == 7  # three batches, then the single-paper query
@@ -0,0 +1,21 @@
+"""
+Unit tests for the compressed blob store.
+"""
+from app.services.blob_store import BlobStore
+
+
+def test_put_get_roundtrip_and_dedupe(tmp_path):
+    store = BlobStore(tmp_path)
+    html = "<html>" + "paragraph " * 10_000 + "</html>"
+    key = store.put(html)
+    assert store.put(html) == key
+    assert store.get(key) == html
+    assert list(store.keys()) == [key]
+    # compressed on disk
+    assert store.path_for(key).stat().st_size < len(html) // 10
+
+
+def test_missing_blob_returns_none(tmp_path):
+    store = BlobStore(tmp_path)
+    assert store.get(None) is None
+    assert store.get("0" * 64) is None
@@ -0,0 +1,63 @@
+"""
+Unit tests for the Hugging Face daily-papers clients.
+"""
+import asyncio
+from datetime import date
+
+import httpx
+import pytest
+
+from app.services import hf_client, rate_limit
+from app.services.async_http import AsyncHttpPool
+from app.services.rate_limit import RateLimiter
+
+DAILY_PAGE = """<html><body>
+<a href="/papers/2401.00002">Reward Models</a>
+<a href="/papers/2401.00001v3#community">Sparse Attention</a>
+<a href="https://huggingface.co/papers/2401.00001">Sparse Attention (again)</a>
+<a href="/papers/trending">Trending</a>
+<a>no href</a>
+</body></html>"""
+
+
+@pytest.fixture(autouse=True)
+def no_throttle(monkeypatch):
+    limiter = RateLimiter({})
+    monkeypatch.setattr(rate_limit, "get_rate_limiter", lambda: limiter)
+    monkeypatch.setattr(hf_client.settings, "hf_daily_url", "https://huggingface.test/papers/date")
+
+
+def _pool(handler) -> AsyncHttpPool:
+    pool = AsyncHttpPool()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True)
+    pool.client_for = lambda url: client
+    return pool
+
+
+def test_async_daily_identifiers_are_deduplicated_and_sorted():
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        return httpx.Response(200, text=DAILY_PAGE)
+
+    async def run():
+        pool = _pool(handler)
+        try:
+            return await hf_client.fetch_daily_identifiers_async(date(2024, 1, 2), pool=pool)
+        finally:
+            await pool.client_for("").aclose()
+
+    assert asyncio.run(run()) == ["2401.00001", "2401.00002"]
+    assert requested == ["https://huggingface.test/papers/date/2024-01-02"]
+
+
+def test_missing_daily_page_yields_no_identifiers():
+    async def run():
+        pool = _pool(lambda request: httpx.Response(404, text="not found"))
+        try:
+            return await hf_client.fetch_daily_identifiers_async(date(2024, 1, 2), pool=pool)
+        finally:
+            await pool.client_for("").aclose()
+
+    assert asyncio.run(run()) == []
@@ -0,0 +1,70 @@
+"""
+Unit tests for the single-pass arXiv (ar5iv / LaTeXML) HTML extractor.
+"""
+from app.services.html_extractor import extract_arxiv_html
+from app.services.types import Section
+
+AR5IV_PAGE = """<!DOCTYPE html>
+<html><head><title>Sparse Attention (University of Nowhere)</title></head>
+<body><article class="ltx_document">
+<h1 class="ltx_title ltx_title_document">Sparse Attention for Long Context</h1>
+<div class="ltx_authors">
+  <span class="ltx_creator ltx_role_author"><span class="ltx_personname">Ada Lovelace</span>
+    <span class="ltx_author_notes"><span class="ltx_contact ltx_role_affiliation">Tsinghua University</span></span></span>
+  <span class="ltx_creator ltx_role_author"><span class="ltx_personname">Alan Turing</span>
+    <span class="ltx_author_notes"><span class="ltx_contact ltx_role_affiliation">DeepMind</span></span></span>
+  <span class="ltx_creator ltx_role_author"><span class="ltx_personname">Grace Hopper</span>
+    <span class="ltx_author_notes"><span class="ltx_contact ltx_role_affiliation">Tsinghua University</span></span></span>
+</div>
+<div class="ltx_abstract"><h6 class="ltx_title">Abstract</h6><p class="ltx_p">Not a section.</p></div>
+<section class="ltx_section" id="S1">
+<div class="ltx_section">
+  <h2 class="ltx_title ltx_title_section">1 Introduction</h2>
+  <div class="ltx_para"><p class="ltx_p">Long contexts are <em>slow</em>.</p></div>
+  <div class="ltx_para"><p class="ltx_p">  </p><p class="ltx_p">We make them fast.</p></div>
+</div>
+<div class="ltx_section">
+  <h2 class="ltx_title ltx_title_section">2 Results</h2>
+  <figure class="ltx_table"><figcaption class="ltx_caption">Table 1: Speedup on <b>LongBench</b>.</figcaption></figure>
+  <p class="ltx_p">3x faster decoding.</p>
+</div>
+</section>
+<section class="ltx_bibliography"><ul class="ltx_biblist">
+  <li class="ltx_bibitem"><span class="ltx_tag">[1]</span> <span class="ltx_bibblock">Vaswani et al. Attention is all you need.</span></li>
+  <li class="ltx_bibitem"> </li>
+</ul></section>
+</article></body></html>
+"""
+
+# older conversions: no affiliation markup, universities in parentheses after the authors
+PLAIN_PAGE = """<html><body>
+<div class="ltx_authors"><span class="ltx_personname">Ada Lovelace (Stanford University)</span></div>
+<div class="ltx_para"><p>Intro paragraph.</p></div>
+<p>Second paragraph.</p>
+<div class="ltx_acknowledgements">Work done while visiting (Peking University).</div>
+</body></html>
+"""
+
+
+def test_extracts_sections_affiliations_captions_and_bibliography():
+    extraction = extract_arxiv_html(AR5IV_PAGE)
+
+    # text(strip=True) strips every text node, so inline markup loses its surrounding spaces
+    # exactly as in the original per-field parser
+    assert extraction.sections == [
+        Section(heading="1 Introduction", content="Long contexts areslow.\nWe make them fast."),
+        Section(heading="2 Results", content="3x faster decoding."),
+    ]
+    # deduplicated and sorted; the title's parenthesised University is ignored when affiliations exist
+    assert extraction.institutions == ["DeepMind", "Tsinghua University"]
+    assert extraction.table_captions == ["Table 1: Speedup onLongBench."]
+    assert extraction.bibliography == ["[1] Vaswani et al. Attention is all you need."]
+
+
+def test_falls_back_to_body_paragraphs_and_parenthesised_universities():
+    extraction = extract_arxiv_html(PLAIN_PAGE)
+
+    assert extraction.sections == [Section(heading="Body", content="Intro paragraph.\nSecond paragraph.")]
+    # the whole document is searched, not just the author block
+    assert extraction.institutions == ["Peking University", "Stanford University"]
+    assert extraction.table_captions == [] and extraction.bibliography == []
@@ -0,0 +1,122 @@
+"""
+Unit tests for the on-disk HTTP cache: TTL hits, conditional revalidation and LRU eviction.
+"""
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.services import http_cache
+from app.services.http_cache import HttpCache
+
+
+class Origin:
+    """Serves fixed bodies with validators and answers conditional requests with 304."""
+
+    def __init__(self, bodies):
+        self.bodies = bodies
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        body = self.bodies[request.url.path]
+        etag = f'"{len(body)}-{request.url.path}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        headers = {"ETag": etag, "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT", "Content-Type": "text/html"}
+        return httpx.Response(200, content=body, headers=headers)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(http_cache, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def _client(origin: Origin) -> httpx.Client:
+    return httpx.Client(base_url="https://arxiv.test", transport=httpx.MockTransport(origin.handler))
+
+
+def test_fresh_entries_are_served_without_the_network(tmp_path, clock):
+    origin = Origin({"/abs/1": b"<html>one</html>"})
+    cache = HttpCache(tmp_path, max_bytes=1 << 20, ttl_seconds=60)
+    with _client(origin) as client:
+        first = cache.get(client, "https://arxiv.test/abs/1")
+        clock[0] += 30
+        second = cache.get(client, "https://arxiv.test/abs/1")
+
+    assert first.content == second.content == b"<html>one</html>"
+    assert second.headers["Content-Type"] == "text/html"
+    assert len(origin.requests) == 1
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.revalidated) == (1, 1, 0)
+    assert cache.stats.bytes_downloaded == cache.stats.bytes_served == len(b"<html>one</html>")
+
+
+def test_stale_entries_are_revalidated_and_304_reuses_the_body(tmp_path, clock):
+    origin = Origin({"/abs/1": b"<html>one</html>", "/pdf/1": b"%PDF-1.7 body"})
+    cache = HttpCache(tmp_path, max_bytes=1 << 20, ttl_seconds=60)
+    with _client(origin) as client:
+        cache.get(client, "https://arxiv.test/abs/1")
+        cache.get_file(client, "https://arxiv.test/pdf/1")
+        clock[0] += 120
+        page = cache.get(client, "https://arxiv.test/abs/1")
+        pdf = cache.get_file(client, "https://arxiv.test/pdf/1")
+        # the 304 restarted the TTL
+        clock[0] += 30
+        cache.get(client, "https://arxiv.test/abs/1")
+
+    conditional = origin.requests[2]
+    assert conditional.headers["If-None-Match"] == '"16-/abs/1"'
+    assert conditional.headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert page.status_code == 200 and page.content == b"<html>one</html>"
+    assert pdf.extensions["path"].read_bytes() == b"%PDF-1.7 body"
+    assert len(origin.requests) == 4
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.revalidated) == (1, 2, 2)
+    assert cache.stats.hit_rate == pytest.approx(3 / 5)
+
+
+def test_least_recently_used_entries_are_evicted_over_the_byte_budget(tmp_path, clock):
+    origin = Origin({"/a": b"a" * 400, "/b": b"b" * 400, "/c": b"c" * 400, "/d": b"a" * 400})
+    cache = HttpCache(tmp_path, max_bytes=1000, ttl_seconds=60)
+    with _client(origin) as client:
+        for path in ["/a", "/b"]:
+            clock[0] += 1
+            cache.get(client, f"https://arxiv.test{path}")
+        clock[0] += 1
+        cache.get(client, "https://arxiv.test/a")  # /a is now more recent than /b
+        clock[0] += 1
+        cache.get(client, "https://arxiv.test/c")
+
+        assert cache.lookup("https://arxiv.test/b") is None
+        assert cache.lookup("https://arxiv.test/a") and cache.lookup("https://arxiv.test/c")
+        assert cache.stats.evictions == 1
+
+        # /d has the same body as /a: one object on disk, kept until no URL uses it
+        clock[0] += 1
+        cache.get(client, "https://arxiv.test/d")
+        shared = cache.object_path(cache.lookup("https://arxiv.test/d").digest)
+        assert cache.lookup("https://arxiv.test/a") is None and shared.exists()
+        assert cache.stats.evictions == 2
+
+
+def test_paths_handed_out_are_pinned_until_released(tmp_path, clock):
+    origin = Origin({"/pdf/big": b"%" * 1500, "/pdf/small": b"s" * 400})
+    cache = HttpCache(tmp_path, max_bytes=1000, ttl_seconds=60)
+    with _client(origin) as client:
+        # over the whole budget on its own, yet still there for the parse stage
+        big = cache.get_file(client, "https://arxiv.test/pdf/big").extensions["path"]
+        assert big.exists()
+        clock[0] += 1
+        small = cache.get_file(client, "https://arxiv.test/pdf/small").extensions["path"]
+        clock[0] += 1
+        assert cache.get_file(client, "https://arxiv.test/pdf/small").extensions["path"] == small  # a hit pins too
+        assert big.exists() and small.exists() and cache.stats.evictions == 0
+
+        cache.release(big)
+        assert not big.exists() and cache.lookup("https://arxiv.test/pdf/big") is None
+        assert cache.stats.evictions == 1
+
+        cache.release(small)
+        cache.release(small)
+        assert small.exists()  # within budget, so it stays cached
@@ -0,0 +1,176 @@
+"""
+Resuming an interrupted ingest run from its per-paper journal (``daily_ingest --resume``).
+"""
+from datetime import date
+
+import pytest
+from sqlmodel import create_engine, select
+
+from app.db import session as db_session
+from app.db.session import init_db, session_scope
+from app.models import IngestCheckpoint, IngestRun, Paper
+from app.services.async_http import BackgroundLoop
+from app.services import ingest_journal
+from app.services.blob_store import BlobStore
+from app.services.ingest_journal import STAGE_ANALYZED, STAGE_FETCHED, STAGE_STORED, IngestJournal
+from app.services.llm_batch import BatchError
+from app.services.types import ArxivPaper, FindingSummary, LLMAnalysis, Section
+from scripts import daily_ingest
+
+LISTING_DATE = date(2024, 1, 2)
+
+
+def _paper(arxiv_id: str) -> ArxivPaper:
+    return ArxivPaper(
+        arxiv_id=arxiv_id,
+        title=f"Paper {arxiv_id}",
+        authors=["A"],
+        institutions=["Lab"],
+        abstract="Abstract.",
+        published_at=None,
+        categories=["cs.CL"],
+        sections=[Section(heading="1 Introduction", content="Intro.")],
+        raw_html=None,
+        raw_text=None,
+        source="html",
+    )
+
+
+def _analysis(problem: str) -> LLMAnalysis:
+    return LLMAnalysis(
+        problem=problem,
+        solution="solution",
+        effect="effect",
+        keywords=["resume"],
+        breakthrough_score=0.1,
+        breakthrough_label=False,
+        breakthrough_reason="",
+        findings=[FindingSummary(claim_text="claim", experiment_design="", evidence_snippet="", metrics=[])],
+        llm_model="deepseek-chat",
+    )
+
+
+class NoNetworkFetcher:
+    """Stands in for AsyncArxivFetcher; any fetch means a checkpoint was not reused."""
+
+    cache = None
+    pool = None
+
+    async def fetch_metadata_batch(self, arxiv_ids):
+        raise AssertionError(f"metadata fetched again for {arxiv_ids}")
+
+    async def download(self, arxiv_id, metadata=None):
+        raise AssertionError(f"{arxiv_id} downloaded again")
+
+    def parse(self, download):
+        raise AssertionError("parsed again")
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_session, "engine", create_engine(f"sqlite:///{tmp_path / 'papers.db'}"))
+    monkeypatch.setattr(daily_ingest.settings, "vector_index_enabled", False)
+    monkeypatch.setattr(daily_ingest, "get_llm_cache", lambda: None)
+    blobs = BlobStore(tmp_path / "blobs")
+    monkeypatch.setattr(ingest_journal, "get_blob_store", lambda: blobs)
+    monkeypatch.setattr(daily_ingest, "get_blob_store", lambda: blobs)
+    init_db()
+
+
+def test_resume_skips_stored_papers_and_reuses_checkpoints(database, monkeypatch):
+    # an interrupted run: 0001 stored, 0002 analysed, 0003 only fetched
+    journal = IngestJournal.start(LISTING_DATE)
+    for arxiv_id in ["2401.00001", "2401.00002", "2401.00003"]:
+        journal.record_fetched(_paper(arxiv_id))
+    for arxiv_id in ["2401.00001", "2401.00002"]:
+        journal.record_analyzed(arxiv_id, _analysis(f"journaled {arxiv_id}"))
+    daily_ingest.store_paper(_paper("2401.00001"), _analysis("journaled 2401.00001"), LISTING_DATE)
+    journal.record_stored("2401.00001")
+
+    async def identifiers(target_date, pool=None):
+        return ["2401.00001", "2401.00002", "2401.00003"]
+
+    analysed = []
+
+    def analyze(paper, use_cache=True, tier=None):
+        analysed.append(paper.arxiv_id)
+        return _analysis(f"fresh {paper.arxiv_id}")
+
+    monkeypatch.setattr(daily_ingest, "fetch_daily_identifiers_async", identifiers)
+    monkeypatch.setattr(daily_ingest, "analyze_paper_with_llm", analyze)
+
+    io_loop = BackgroundLoop()
+    try:
+        workers = {"fetch": 1, "parse": 1, "analyze": 1}
+        daily_ingest._run_pipeline(NoNetworkFetcher(), io_loop, None, LISTING_DATE, False, workers, 2, resume=True)
+    finally:
+        io_loop.close()
+
+    # only the paper without a journaled analysis reached the LLM; nothing was fetched again
+    assert analysed == ["2401.00003"]
+    resumed = IngestJournal(journal.run_id).load()
+    assert {checkpoint.stage for checkpoint in resumed.values()} == {STAGE_STORED}
+    with session_scope() as session:
+        problems = dict(session.exec(select(Paper.arxiv_id, Paper.problem_summary)).all())
+        runs = session.exec(select(IngestRun)).all()
+        assert problems == {
+            "2401.00001": "journaled 2401.00001",
+            "2401.00002": "journaled 2401.00002",
+            "2401.00003": "fresh 2401.00003",
+        }
+        # the interrupted run was continued, not a new one started
+        assert [(run.id, run.status) for run in runs] == [(journal.run_id, "completed")]
+
+
+def test_failed_llm_batch_falls_back_to_per_paper_analysis(database, monkeypatch):
+    journal = IngestJournal.start(LISTING_DATE)
+    for arxiv_id in ["2401.00004", "2401.00005"]:
+        journal.record_fetched(_paper(arxiv_id))
+
+    async def identifiers(target_date, pool=None):
+        return ["2401.00004", "2401.00005"]
+
+    def batch(papers, use_cache=True, tiers=None):
+        raise BatchError("Batch b-1 still in_progress after 86400s")
+
+    def analyze(paper, use_cache=True, tier=None):
+        return _analysis("solo")
+
+    monkeypatch.setattr(daily_ingest, "fetch_daily_identifiers_async", identifiers)
+    monkeypatch.setattr(daily_ingest, "analyze_papers_with_llm_batch", batch)
+    monkeypatch.setattr(daily_ingest, "analyze_paper_with_llm", analyze)
+
+    io_loop = BackgroundLoop()
+    try:
+        workers = {"fetch": 1, "parse": 1, "analyze": 1}
+        daily_ingest._run_pipeline(
+            NoNetworkFetcher(), io_loop, None, LISTING_DATE, False, workers, 2, resume=True, llm_batch=True
+        )
+    finally:
+        io_loop.close()
+
+    assert {checkpoint.stage for checkpoint in IngestJournal(journal.run_id).load().values()} == {STAGE_STORED}
+    with session_scope() as session:
+        assert set(session.exec(select(Paper.problem_summary)).all()) == {"solo"}
+        # the run was finished rather than left "running"
+        assert session.get(IngestRun, journal.run_id).status == "completed"
+
+
+def test_journal_round_trips_stage_payloads(database):
+    journal = IngestJournal.start(LISTING_DATE)
+    paper = _paper("2401.00009")
+    paper.raw_html = "<html>" + "markup " * 1000 + "</html>"
+    journal.record_fetched(paper)
+    assert journal.load()["2401.00009"].stage == STAGE_FETCHED
+    with session_scope() as session:
+        payload = session.exec(select(IngestCheckpoint.paper_payload)).one()
+    # the raw HTML is referenced by blob key, not copied into the checkpoint row
+    assert "raw_html" not in payload and ingest_journal.get_blob_store().get(payload["html_blob_key"]) == paper.raw_html
+    journal.record_analyzed("2401.00009", _analysis("p"))
+    checkpoint = journal.load()["2401.00009"]
+    assert checkpoint.stage == STAGE_ANALYZED
+    assert checkpoint.paper == paper and checkpoint.analysis == _analysis("p")
+
+    # a finished run is not resumed
+    journal.finish(failed=0)
+    assert IngestJournal.start(LISTING_DATE, resume=True).run_id != journal.run_id
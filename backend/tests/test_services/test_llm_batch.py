@@ -0,0 +1,130 @@
+"""
+Batch-mode analysis against a local stub of the OpenAI-compatible files/batches API.
+"""
+import json
+
+import httpx
+from openai import OpenAI
+
+from app.services import llm_batch, llm_client
+from app.services.llm_batch import BatchAnalyzer
+from app.services.types import ArxivPaper, Section
+
+
+class StubBatchServer:
+    """Implements just enough of /files and /batches for one batch round trip."""
+
+    def __init__(self, fail_ids=()):
+        self.fail_ids = set(fail_ids)
+        self.input_lines = []
+        self.polls = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if request.method == "POST" and path.endswith("/files"):
+            body = request.content.decode("utf-8", errors="replace")
+            self.input_lines = [json.loads(line) for line in body.splitlines() if line.startswith('{"custom_id"')]
+            return httpx.Response(200, json=self._file("file-in", "batch"))
+        if request.method == "POST" and path.endswith("/batches"):
+            return httpx.Response(200, json=self._batch("in_progress"))
+        if path.endswith("/batches/batch-1"):
+            self.polls += 1
+            status = "completed" if self.polls > 1 else "in_progress"
+            return httpx.Response(200, json=self._batch(status, output="file-out" if status == "completed" else None))
+        if path.endswith("/files/file-out/content"):
+            return httpx.Response(200, content="\n".join(self._output_line(line) for line in self.input_lines))
+        return httpx.Response(404, json={"error": {"message": f"unexpected {request.method} {path}"}})
+
+    @staticmethod
+    def _file(file_id, purpose):
+        return {
+            "id": file_id,
+            "object": "file",
+            "bytes": 1,
+            "created_at": 0,
+            "filename": "input.jsonl",
+            "purpose": purpose,
+            "status": "processed",
+        }
+
+    def _batch(self, status, output=None):
+        total = len(self.input_lines)
+        return {
+            "id": "batch-1",
+            "object": "batch",
+            "endpoint": "/v1/chat/completions",
+            "input_file_id": "file-in",
+            "completion_window": "24h",
+            "status": status,
+            "created_at": 0,
+            "output_file_id": output,
+            "request_counts": {"total": total, "completed": total if output else 0, "failed": 0},
+        }
+
+    def _output_line(self, line):
+        custom_id = line["custom_id"]
+        if custom_id in self.fail_ids:
+            return json.dumps({"custom_id": custom_id, "response": {"status_code": 500, "body": {}}})
+        content = json.dumps(
+            {
+                "problem": f"problem of {custom_id}",
+                "solution": "s",
+                "effect": "e",
+                "findings": [],
+                "keywords": ["Batch"],
+                "breakthrough_score": 0.9,
+                "breakthrough_label": True,
+                "breakthrough_reason": "r",
+            }
+        )
+        body = {
+            "id": f"cmpl-{custom_id}",
+            "object": "chat.completion",
+            "created": 0,
+            "model": line["body"]["model"],
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        }
+        return json.dumps({"custom_id": custom_id, "response": {"status_code": 200, "body": body}})
+
+
+def _paper(arxiv_id):
+    return ArxivPaper(
+        arxiv_id=arxiv_id,
+        title=f"Paper {arxiv_id}",
+        authors=["A"],
+        institutions=[],
+        abstract="We study things. We improve them.",
+        published_at=None,
+        categories=["cs.CL"],
+        sections=[Section(heading="1 Introduction", content="Intro.")],
+        raw_html=None,
+        raw_text=None,
+        source="test",
+    )
+
+
+def test_batch_round_trip_maps_results_by_custom_id(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_client, "get_llm_cache", lambda: None)
+    saved = []
+    monkeypatch.setattr(llm_batch, "save_llm_calls", lambda calls: saved.extend(calls))
+    server = StubBatchServer(fail_ids={"2401.00002"})
+    client = OpenAI(
+        api_key="sk-test",
+        base_url="http://batch.stub/v1",
+        http_client=httpx.Client(transport=httpx.MockTransport(server.handler)),
+    )
+    analyzer = BatchAnalyzer(client=client, model="stub-model", workdir=tmp_path, poll_interval=0, timeout=5)
+
+    results = analyzer.analyze([_paper("2401.00001"), _paper("2401.00002")])
+
+    assert [line["custom_id"] for line in server.input_lines] == ["2401.00001", "2401.00002"]
+    assert server.input_lines[0]["body"]["model"] == "stub-model"
+    assert results["2401.00001"].problem == "problem of 2401.00001"
+    assert results["2401.00001"].keywords == ["batch"]
+    # a failed batch line falls back to the heuristic instead of failing the whole batch
+    assert results["2401.00002"].breakthrough_reason == "Automated fallback: verify manually"
+    assert server.polls == 2
+    assert list(tmp_path.glob("*.output.jsonl"))
+    calls = {call.arxiv_id: call for call in saved}
+    assert calls["2401.00001"].parse_ok and calls["2401.00001"].mode == "batch"
+    assert calls["2401.00002"].error == "batch line status 500"
@@ -0,0 +1,56 @@
+"""
+Unit tests for the persistent LLM response cache.
+"""
+import json
+from types import SimpleNamespace
+
+from app.services import llm_client
+from app.services.llm_cache import LLMCache, cache_key
+
+
+def test_hit_miss_bypass_and_ttl(tmp_path):
+    cache = LLMCache(tmp_path / "llm.sqlite", max_bytes=1 << 20, ttl_seconds=3600)
+    key = cache_key("deepseek-chat", "system", "prompt", 0.2)
+    assert key != cache_key("deepseek-chat", "system", "prompt", 0.7)
+    assert cache.get(key) is None
+    cache.put(key, "deepseek-chat", '{"problem": "x"}', tokens=120)
+    assert cache.get(key) == '{"problem": "x"}'
+    assert cache.get(key, bypass=True) is None
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.bypassed) == (1, 1, 1)
+    assert cache.stats.tokens_saved == 120
+
+    cache.ttl_seconds = 0
+    assert cache.get(key) is None
+
+
+def test_size_eviction_drops_least_recently_used(tmp_path):
+    cache = LLMCache(tmp_path / "llm.sqlite", max_bytes=250, ttl_seconds=3600)
+    for name in ("a", "b", "c"):
+        cache.put(name, "m", name * 100)
+    assert cache.get("a") is None
+    assert cache.get("c") == "c" * 100
+    assert cache.stats.evictions == 1
+
+
+def test_call_deepseek_reuses_cached_response(tmp_path, monkeypatch):
+    calls = []
+
+    class FakeOpenAI:
+        def __init__(self, **_):
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+        def create(self, **kwargs):
+            calls.append(kwargs)
+            message = SimpleNamespace(content=json.dumps({"problem": "p"}))
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+    cache = LLMCache(tmp_path / "llm.sqlite", max_bytes=1 << 20, ttl_seconds=3600)
+    monkeypatch.setattr(llm_client, "_sync_client", FakeOpenAI)
+    monkeypatch.setattr(llm_client, "get_llm_cache", lambda: cache)
+    monkeypatch.setattr(llm_client.settings, "deepseek_api_key", "sk-test")
+
+    assert llm_client.call_deepseek("same prompt") == {"problem": "p"}
+    assert llm_client.call_deepseek("same prompt") == {"problem": "p"}
+    assert len(calls) == 1
+    llm_client.call_deepseek("same prompt", use_cache=False)
+    assert len(calls) == 2
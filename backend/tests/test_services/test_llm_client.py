@@ -0,0 +1,112 @@
+"""
+Unit tests for the shared async LLM client.
+"""
+import asyncio
+import json
+from os.path import commonprefix
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.services import llm_client
+from app.services.llm_client import AsyncLLMClient
+from app.services.types import ArxivPaper, Section
+
+
+def _completion(content: dict) -> dict:
+    return {
+        "id": "cmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "deepseek-chat",
+        "choices": [
+            {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": json.dumps(content)}}
+        ],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150},
+    }
+
+
+def _client(handler, **limits) -> AsyncLLMClient:
+    client = AsyncLLMClient(**limits)
+    client.client = AsyncOpenAI(
+        api_key="sk-test",
+        base_url="https://api.deepseek.test",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    return client
+
+
+def test_concurrency_cap_and_usage(monkeypatch):
+    monkeypatch.setattr(llm_client.settings, "deepseek_api_key", "sk-test")
+    monkeypatch.setattr(llm_client, "get_llm_cache", lambda: None)
+
+    async def handler(request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=_completion({"problem": "p"}))
+
+    async def run():
+        client = _client(handler, max_concurrency=3, requests_per_minute=0, tokens_per_minute=0)
+        try:
+            return client, await asyncio.gather(
+                *(llm_client.acall_deepseek(f"prompt {i}", client) for i in range(9))
+            )
+        finally:
+            await client.aclose()
+
+    client, payloads = asyncio.run(run())
+    assert payloads == [{"problem": "p"}] * 9
+    assert client.stats.requests == 9
+    assert client.stats.max_in_flight == 3
+    assert client.stats.prompt_tokens == 900
+
+
+def test_requests_per_minute_budget_spaces_requests(monkeypatch):
+    monkeypatch.setattr(llm_client.settings, "deepseek_api_key", "sk-test")
+    monkeypatch.setattr(llm_client, "get_llm_cache", lambda: None)
+
+    async def handler(request):
+        return httpx.Response(200, json=_completion({"problem": "p"}))
+
+    async def run():
+        # 600 rpm = 10 per second with a burst of 10: the last two of 12 requests must wait
+        client = _client(handler, max_concurrency=12, requests_per_minute=600, tokens_per_minute=0)
+        try:
+            await asyncio.gather(*(llm_client.acall_deepseek(f"prompt {i}", client) for i in range(12)))
+        finally:
+            await client.aclose()
+        return client
+
+    client = asyncio.run(run())
+    assert client.stats.requests == 12
+    assert client.stats.rpm_wait > 0
+
+
+def test_prefix_layout_shares_static_prefix_across_papers():
+    def paper(arxiv_id, title):
+        return ArxivPaper(
+            arxiv_id=arxiv_id,
+            title=title,
+            authors=["A"],
+            institutions=[],
+            abstract="Abstract.",
+            published_at=None,
+            categories=["cs.CL"],
+            sections=[Section(heading="1 Introduction", content=f"Intro of {title}.")],
+            raw_html=None,
+            raw_text=None,
+            source="test",
+        )
+
+    first, second = paper("2401.00001", "First"), paper("2401.00002", "Second")
+    shared = commonprefix(
+        [llm_client.build_prompt(first, layout="prefix"), llm_client.build_prompt(second, layout="prefix")]
+    )
+    # everything up to the paper metadata is identical, including the JSON schema
+    assert '"breakthrough_reason": "……"' in shared
+    assert "arXiv ID" in shared and "First" not in shared
+
+    legacy = llm_client.build_prompt(first, layout="legacy")
+    assert legacy.index("2401.00001") < legacy.index("任务要求")
+    # the legacy layout stays the default, so upgrading does not change (or un-cache) any prompt
+    assert llm_client.build_prompt(first) == legacy
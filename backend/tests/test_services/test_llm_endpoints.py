@@ -0,0 +1,187 @@
+"""
+Unit tests for hedged LLM requests, endpoint failover and the circuit breaker.
+"""
+import asyncio
+import json
+import time
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.services import llm_client, rate_limit
+from app.services.llm_client import AsyncLLMClient
+from app.services.llm_endpoints import CircuitBreaker
+from app.services.llm_usage import LLMCallRecord
+from app.services.rate_limit import RateLimiter
+
+BACKUP = {"base_url": "https://backup.test/v1", "model": "backup-model", "api_key": "sk-backup"}
+
+
+def _completion(model: str) -> dict:
+    return {
+        "id": "cmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": model,
+        "choices": [
+            {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": json.dumps({"problem": model})}}
+        ],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150},
+    }
+
+
+def _mock(handler) -> AsyncOpenAI:
+    return AsyncOpenAI(
+        api_key="sk-test",
+        base_url="https://mock.test",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+def _setup(monkeypatch):
+    monkeypatch.setattr(llm_client.settings, "deepseek_api_key", "sk-test")
+    monkeypatch.setattr(llm_client.settings, "llm_endpoints", [BACKUP])
+    monkeypatch.setattr(llm_client, "get_llm_cache", lambda: None)
+    # a fresh host budget: earlier tests may have spent the shared DeepSeek one
+    limiter = RateLimiter({})
+    monkeypatch.setattr(llm_client, "get_rate_limiter", lambda: limiter)
+    monkeypatch.setattr(rate_limit, "get_rate_limiter", lambda: limiter)
+
+
+def test_breaker_opens_then_lets_one_trial_through():
+    now = [0.0]
+    breaker = CircuitBreaker("primary", failures=2, cooldown=30, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    now[0] = 31
+    assert breaker.allow() and not breaker.allow()  # a single trial while half-open
+    breaker.record_failure()
+    assert breaker.state == "open"
+    now[0] = 62
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+class _DictCache:
+    def __init__(self):
+        self.entries = {}
+
+    def lookup(self, key, bypass=False):
+        return None if bypass else self.entries.get(key)
+
+    def put(self, key, version, content, tokens=0):
+        self.entries[key] = (content, version)
+
+
+def test_slow_primary_is_hedged_to_the_backup(monkeypatch):
+    _setup(monkeypatch)
+    monkeypatch.setattr(llm_client.settings, "llm_hedge_delay", 0.05)
+    cache = _DictCache()
+    monkeypatch.setattr(llm_client, "get_llm_cache", lambda: cache)
+
+    async def slow(request):
+        await asyncio.sleep(2)
+        return httpx.Response(200, json=_completion("deepseek-chat"))
+
+    async def fast(request):
+        assert json.loads(request.content)["model"] == "backup-model"
+        return httpx.Response(200, json=_completion("backup-model"))
+
+    async def run():
+        client = AsyncLLMClient(requests_per_minute=0, tokens_per_minute=0)
+        client.client = _mock(slow)
+        client._fallback_clients[1] = _mock(fast)
+        call = LLMCallRecord(arxiv_id="2401.00001", model="deepseek-chat")
+        started = time.perf_counter()
+        try:
+            payload = await llm_client.acall_deepseek("prompt", client, call=call)
+        finally:
+            await client.aclose()
+        return client, call, payload, time.perf_counter() - started
+
+    client, call, payload, elapsed = asyncio.run(run())
+    assert payload == {"problem": "backup-model"}
+    assert elapsed < 1
+    assert call.hedged and call.endpoint == "backup.test/backup-model" and call.model == "backup-model"
+    assert client.stats.hedged == 1 and client.endpoints[1].wins == 1
+    # the paper waited for the hedge delay too, and the abandoned primary still feeds its p95
+    assert call.latency_ms >= 50
+    assert len(client.endpoints[0].latencies) == 1 and client.endpoints[0].latencies[0] >= 0.05
+    # the backup's answer is not served later as the primary model's output
+    assert list(cache.entries) == [llm_client.analysis_cache_key("prompt", "backup-model")]
+
+
+def test_cancelled_half_open_trial_lets_the_endpoint_be_tried_again(monkeypatch):
+    _setup(monkeypatch)
+    monkeypatch.setattr(llm_client.settings, "llm_hedge_delay", 0.05)
+    primary = []
+
+    async def slow(request):
+        primary.append(request)
+        await asyncio.sleep(2)
+        return httpx.Response(200, json=_completion("deepseek-chat"))
+
+    def fast(request):
+        return httpx.Response(200, json=_completion("backup-model"))
+
+    async def run():
+        client = AsyncLLMClient(requests_per_minute=0, tokens_per_minute=0)
+        client.client = _mock(slow)
+        client._fallback_clients[1] = _mock(fast)
+        breaker = client.endpoints[0].breaker
+        breaker.opened_at = time.monotonic() - breaker.cooldown - 1  # cooled down: one trial allowed
+        try:
+            for _ in range(2):
+                assert await llm_client.acall_deepseek("prompt", client) == {"problem": "backup-model"}
+        finally:
+            await client.aclose()
+        return breaker
+
+    breaker = asyncio.run(run())
+    # both trials were cut short by the hedge, and neither left the breaker waiting on a verdict
+    assert len(primary) == 2
+    assert breaker.state == "half-open" and breaker.allow()
+
+
+def test_hedge_delay_is_clamped_to_the_minimum(monkeypatch):
+    _setup(monkeypatch)
+    monkeypatch.setattr(llm_client.settings, "llm_hedge_min_delay", 5.0)
+    client = AsyncLLMClient(requests_per_minute=0, tokens_per_minute=0)
+    health = client.endpoints[0]
+    for _ in range(50):
+        health.record_success(0.5)
+    assert health.hedge_delay() == 5.0
+
+
+def test_failing_primary_is_routed_around_once_its_breaker_opens(monkeypatch):
+    _setup(monkeypatch)
+    monkeypatch.setattr(llm_client.settings, "retry_max_attempts", 1)
+    monkeypatch.setattr(llm_client.settings, "llm_breaker_failures", 2)
+    primary_requests = []
+
+    def broken(request):
+        primary_requests.append(request)
+        return httpx.Response(503, json={"error": {"message": "overloaded"}})
+
+    def backup(request):
+        return httpx.Response(200, json=_completion("backup-model"))
+
+    async def run():
+        client = AsyncLLMClient(requests_per_minute=0, tokens_per_minute=0)
+        client.client = _mock(broken)
+        client._fallback_clients[1] = _mock(backup)
+        try:
+            return client, [await llm_client.acall_deepseek(f"prompt {i}", client) for i in range(4)]
+        finally:
+            await client.aclose()
+
+    client, payloads = asyncio.run(run())
+    assert payloads == [{"problem": "backup-model"}] * 4
+    # two failures open the primary's breaker; later requests skip it
+    assert len(primary_requests) == 2
+    assert client.stats.failovers == 2
+    assert client.endpoints[0].breaker.state == "open"
@@ -0,0 +1,113 @@
+"""
+Unit tests for map-reduce analysis of long papers.
+"""
+import asyncio
+import json
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.services import llm_client, llm_map_reduce
+from app.services.llm_client import AsyncLLMClient
+from app.services.prompt_budget import chunk_sections
+from app.services.types import ArxivPaper, Section
+
+HEADINGS = ["1 Introduction", "2 Method", "3 Experiments", "4 Results", "5 Conclusion", "References"]
+
+
+def _paper() -> ArxivPaper:
+    return ArxivPaper(
+        arxiv_id="2401.00001",
+        title="A Long Paper",
+        authors=["A"],
+        institutions=[],
+        abstract="We study things.",
+        published_at=None,
+        categories=["cs.CL"],
+        sections=[Section(heading=heading, content=f"{heading} text line.\n" * 600) for heading in HEADINGS],
+        raw_html=None,
+        raw_text=None,
+        source="test",
+    )
+
+
+def _completion(content: dict) -> dict:
+    return {
+        "id": "cmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "deepseek-chat",
+        "choices": [
+            {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": json.dumps(content)}}
+        ],
+        "usage": {"prompt_tokens": 100, "completion_tokens": 50, "total_tokens": 150},
+    }
+
+
+def test_chunks_cover_every_section_but_references():
+    paper = _paper()
+    chunks, skipped = chunk_sections(paper.sections, 2500, max_chunks=3)
+    assert skipped == ["References"]
+    assert len(chunks) <= 3
+    covered = " ".join(" ".join(chunk.headings) for chunk in chunks)
+    for heading in HEADINGS[:-1]:
+        assert heading in covered
+    # nothing is truncated away: every line of the experiments section is still there
+    text = "".join("".join(chunk.texts) for chunk in chunks)
+    assert text.count("3 Experiments text line.") == 600
+
+
+def test_map_reduce_merges_chunk_findings(monkeypatch):
+    monkeypatch.setattr(llm_client.settings, "deepseek_api_key", "sk-test")
+    monkeypatch.setattr(llm_client.settings, "llm_map_reduce", True)
+    monkeypatch.setattr(llm_client.settings, "llm_map_chunk_tokens", 3000)
+    monkeypatch.setattr(llm_client.settings, "llm_map_max_chunks", 8)
+    monkeypatch.setattr(llm_client, "get_llm_cache", lambda: None)
+    saved = []
+    monkeypatch.setattr(llm_client, "save_llm_calls", lambda calls: saved.extend(calls))
+    prompts = []
+
+    def handler(request):
+        prompt = json.loads(request.content)["messages"][-1]["content"]
+        prompts.append(prompt)
+        if "正文过长" in prompt:
+            # the reduce step forgets the findings; the mapped ones must survive
+            return httpx.Response(200, json=_completion({"problem": "merged", "keywords": ["x"], "findings": []}))
+        if "3 Experiments text line." in prompt:
+            finding = {"claim_text": "Accuracy improves", "metrics": [{"name": "acc", "value": 91.2}]}
+            return httpx.Response(200, json=_completion({"summary": "experiments", "findings": [finding]}))
+        if "5 Conclusion text line." in prompt:
+            return httpx.Response(500, json={"error": {"message": "boom"}})
+        return httpx.Response(200, json=_completion({"summary": "other", "findings": []}))
+
+    async def run():
+        client = AsyncLLMClient(max_concurrency=4, requests_per_minute=0, tokens_per_minute=0)
+        client.client = AsyncOpenAI(
+            api_key="sk-test",
+            base_url="https://api.deepseek.test",
+            max_retries=0,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        try:
+            return await llm_map_reduce.analyze_long_paper_with_llm_async(_paper(), client)
+        finally:
+            await client.aclose()
+
+    paper = _paper()
+    assert llm_map_reduce.needs_map_reduce(paper)
+    analysis = asyncio.run(run())
+
+    assert analysis.problem == "merged"
+    assert [finding.claim_text for finding in analysis.findings] == ["Accuracy improves"]
+    assert analysis.findings[0].metrics[0].value == 91.2
+    steps = [call.step for call in saved]
+    assert steps.count("reduce") == 1 and steps[-1] == "reduce"
+    # the failing chunk is retried before giving up
+    assert steps.count("map") == len(set(prompts)) - 1 > 1
+    failed = [call for call in saved if call.error]
+    assert len(failed) == 1 and not failed[0].parse_ok
+    # a failed chunk is passed to the reduce step as raw text rather than dropped
+    assert "5 Conclusion text line." in prompts[-1]
+    assert not any("References text line." in prompt for prompt in prompts)
+    # the map prompts are concatenated, not formatted: the JSON example must be plain JSON
+    assert all('{"summary": ' in prompt and "{{" not in prompt for prompt in prompts[:-1])
@@ -0,0 +1,124 @@
+"""
+Unit tests for streamed, schema-validated LLM output and the repair request.
+"""
+import json
+
+import httpx
+from openai import OpenAI
+
+from app.services import llm_client
+from app.services.llm_structured import ANALYSIS_SCHEMA, StreamingJSONObject, parse_structured
+from app.services.types import ArxivPaper
+
+VALID_HEAD = '{"problem": "长文本推理慢", "solution": "稀疏注意力", "effect": "提速 3 倍", '
+BROKEN_FINDINGS = '"findings": [{"claim_text": "提速", "metrics": [{"name": "speed", "value": 3x}]}], '
+VALID_TAIL = (
+    '"keywords": ["Sparse-Attention"], "breakthrough_score": 0.7, '
+    '"breakthrough_label": true, "breakthrough_reason": "显著提速"}'
+)
+
+
+def _paper() -> ArxivPaper:
+    return ArxivPaper(
+        arxiv_id="2401.00001",
+        title="Paper",
+        authors=["A"],
+        institutions=[],
+        abstract="A distinctive abstract sentence.",
+        published_at=None,
+        categories=["cs.CL"],
+        sections=[],
+        raw_html=None,
+        raw_text=None,
+        source="test",
+    )
+
+
+def test_broken_findings_keep_the_valid_fields():
+    parser = StreamingJSONObject(ANALYSIS_SCHEMA)
+    text = VALID_HEAD + BROKEN_FINDINGS + VALID_TAIL
+    for index in range(0, len(text), 7):
+        parser.feed(text[index : index + 7])
+    output = parser.finish()
+    assert not output.complete and output.salvageable
+    assert output.invalid_fields == ["findings"]
+    assert output.payload["problem"] == "长文本推理慢"
+    assert output.payload["breakthrough_score"] == 0.7
+    assert output.errors["findings"].startswith("invalid JSON")
+
+
+def test_prose_answer_is_abandoned_early():
+    output = parse_structured("Sure! Here is a summary of the paper: it studies ...", ANALYSIS_SCHEMA)
+    assert output.aborted and not output.salvageable
+    assert set(output.invalid_fields) == set(ANALYSIS_SCHEMA.required)
+
+
+def _sse(content: str) -> bytes:
+    chunks = [
+        {"choices": [{"index": 0, "delta": {"role": "assistant", "content": content[i : i + 20]}}]}
+        for i in range(0, len(content), 20)
+    ]
+    chunks.append(
+        {"choices": [], "usage": {"prompt_tokens": 900, "completion_tokens": 120, "total_tokens": 1020}}
+    )
+    events = []
+    for chunk in chunks:
+        chunk.update(id="cmpl-1", object="chat.completion.chunk", created=0, model="deepseek-chat")
+        events.append(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n")
+    events.append("data: [DONE]\n\n")
+    return "".join(events).encode()
+
+
+def test_stream_repairs_only_the_broken_field(monkeypatch):
+    requests = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append(body)
+        assert body["response_format"] == {"type": "json_object"}
+        if body.get("stream"):
+            return httpx.Response(
+                200, content=_sse(VALID_HEAD + BROKEN_FINDINGS + VALID_TAIL), headers={"content-type": "text/event-stream"}
+            )
+        repaired = {"findings": [{"claim_text": "推理提速 3 倍", "metrics": [{"name": "speedup", "value": 3}]}]}
+        return httpx.Response(
+            200,
+            json={
+                "id": "cmpl-2",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "deepseek-chat",
+                "choices": [
+                    {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": json.dumps(repaired)}}
+                ],
+                "usage": {"prompt_tokens": 200, "completion_tokens": 40, "total_tokens": 240},
+            },
+        )
+
+    client = OpenAI(
+        api_key="sk-test",
+        base_url="https://api.deepseek.test",
+        max_retries=0,
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+    saved = []
+    monkeypatch.setattr(llm_client, "_sync_client", lambda: client)
+    monkeypatch.setattr(llm_client, "get_llm_cache", lambda: None)
+    monkeypatch.setattr(llm_client, "save_llm_calls", lambda calls: saved.extend(calls))
+    monkeypatch.setattr(llm_client.settings, "deepseek_api_key", "sk-test")
+    monkeypatch.setattr(llm_client.settings, "llm_structured_output", True)
+
+    analysis = llm_client.analyze_paper_with_llm(_paper())
+
+    assert analysis.problem == "长文本推理慢"
+    assert analysis.keywords == ["sparse-attention"]
+    assert [finding.claim_text for finding in analysis.findings] == ["推理提速 3 倍"]
+    # the repair request quotes the broken output but not the paper again
+    repair = requests[1]["messages"][-1]["content"]
+    assert len(requests) == 2 and "findings" in repair and "3x" in repair
+    assert _paper().abstract not in repair
+    # ...so it spells out the expected format of the requested field itself
+    assert "claim_text" in repair and "baseline/delta/raw" in repair and "breakthrough" not in repair.split("各字段格式")[1]
+    steps = {call.step: call for call in saved}
+    assert steps["single"].parse_ok and steps["single"].prompt_tokens == 900
+    assert steps["repair"].parse_ok and steps["repair"].prompt_tokens == 200
@@ -0,0 +1,112 @@
+"""
+Unit tests for per-call LLM usage accounting and the usage endpoint.
+"""
+import json
+from datetime import datetime, timedelta
+
+import httpx
+from openai import OpenAI
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.api.routes.llm import llm_usage
+from app.models import LLMCall
+from app.services import llm_client
+from app.services.types import ArxivPaper
+
+
+def _paper() -> ArxivPaper:
+    return ArxivPaper(
+        arxiv_id="2401.00001",
+        title="Paper",
+        authors=["A"],
+        institutions=[],
+        abstract="We study things. We improve them.",
+        published_at=None,
+        categories=["cs.CL"],
+        sections=[],
+        raw_html=None,
+        raw_text=None,
+        source="test",
+    )
+
+
+def test_analysis_records_tokens_retries_and_version(monkeypatch):
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        if len(attempts) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"}, json={"error": {"message": "slow down"}})
+        content = json.dumps({"problem": "p", "keywords": ["X"], "breakthrough_score": 0.5})
+        return httpx.Response(
+            200,
+            json={
+                "id": "cmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "deepseek-chat",
+                "system_fingerprint": "fp_test",
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+                "usage": {
+                    "prompt_tokens": 1000,
+                    "completion_tokens": 200,
+                    "total_tokens": 1200,
+                    "prompt_cache_hit_tokens": 640,
+                    "prompt_cache_miss_tokens": 360,
+                },
+            },
+        )
+
+    client = OpenAI(
+        api_key="sk-test",
+        base_url="https://api.deepseek.test",
+        max_retries=0,
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+    saved = []
+    monkeypatch.setattr(llm_client, "_sync_client", lambda: client)
+    monkeypatch.setattr(llm_client, "get_llm_cache", lambda: None)
+    monkeypatch.setattr(llm_client, "save_llm_calls", lambda calls: saved.extend(calls))
+    monkeypatch.setattr(llm_client.settings, "deepseek_api_key", "sk-test")
+
+    analysis = llm_client.analyze_paper_with_llm(_paper())
+
+    assert analysis.llm_version == "deepseek-chat:fp_test"
+    assert analysis.llm_model == llm_client.settings.deepseek_model
+    [call] = saved
+    assert (call.prompt_tokens, call.completion_tokens, call.cached_tokens) == (1000, 200, 640)
+    assert call.retries == 1
+    assert call.parse_ok and not call.cache_hit
+    assert call.latency_ms is not None
+
+
+def test_usage_endpoint_aggregates_per_day_and_model(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'usage.db'}")
+    SQLModel.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        for index, latency in enumerate([100.0, 200.0, 300.0, 400.0]):
+            session.add(
+                LLMCall(
+                    arxiv_id=f"2401.0000{index}",
+                    model="deepseek-chat",
+                    prompt_tokens=10,
+                    completion_tokens=5,
+                    cached_tokens=2,
+                    latency_ms=latency,
+                    retries=index % 2,
+                    parse_ok=index != 3,
+                    created_at=now,
+                )
+            )
+        # cache hits count towards calls but not latency; old rows fall outside the window
+        session.add(LLMCall(arxiv_id="2401.00009", model="deepseek-chat", cache_hit=True, parse_ok=True, created_at=now))
+        session.add(LLMCall(arxiv_id="2301.00001", model="deepseek-chat", latency_ms=9999.0, created_at=now - timedelta(days=60)))
+        session.commit()
+
+        [usage] = llm_usage(db=session, days=30)
+
+    assert usage.day == now.date().isoformat()
+    assert (usage.calls, usage.cache_hits, usage.failures, usage.retries) == (5, 1, 1, 2)
+    assert (usage.prompt_tokens, usage.completion_tokens, usage.cached_tokens) == (40, 20, 8)
+    assert (usage.latency_p50_ms, usage.latency_p95_ms) == (200.0, 400.0)
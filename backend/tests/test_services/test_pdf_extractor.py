@@ -0,0 +1,96 @@
+"""
+Unit tests for process-pool PDF text extraction.
+"""
+import os
+import threading
+import time
+
+import fitz
+import pytest
+
+from app.services import pdf_extractor
+from app.services.pdf_extractor import PAGES_PER_CHUNK, PdfExtractor
+
+
+def _pdf(path, pages):
+    doc = fitz.open()
+    for number in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"page-{number}")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    return _pdf(tmp_path / "paper.pdf", PAGES_PER_CHUNK * 2 + 3)
+
+
+def test_page_cap_stops_extraction(pdf_path):
+    extractor = PdfExtractor(workers=0, max_pages=3)
+    result = extractor.extract(pdf_path)
+    assert result.total_pages == PAGES_PER_CHUNK * 2 + 3
+    assert result.pages == 3
+    assert "page-2" in result.text
+    assert "page-3" not in result.text
+
+
+def test_process_pool_keeps_page_order(pdf_path):
+    extractor = PdfExtractor(workers=2, max_pages=0, timeout=60)
+    try:
+        result = extractor.extract(pdf_path)
+    finally:
+        extractor.close()
+    assert not result.timed_out
+    assert result.pages == result.total_pages
+    positions = [result.text.index(f"page-{number}\n") for number in range(result.total_pages)]
+    assert positions == sorted(positions)
+
+
+def slow_pages(path, start, stop):
+    # runs in the spawned workers, which import it from this module
+    name = os.path.basename(path)
+    time.sleep(60 if name == "stuck.pdf" else 1.0 if name == "long.pdf" else 0.2)
+    return pdf_extractor._extract_pages(path, start, stop)
+
+
+def _extract_concurrently(extractor, first, second):
+    results = {}
+    worker = threading.Thread(target=lambda: results.setdefault("first", extractor.extract(first)))
+    worker.start()
+    time.sleep(0.2)  # the first paper's ranges are submitted first
+    results["second"] = extractor.extract(second)
+    worker.join()
+    return results["first"], results["second"]
+
+
+def test_timeout_does_not_count_time_queued_behind_another_paper(pdf_path, monkeypatch):
+    monkeypatch.setattr(pdf_extractor, "_extract_pages", slow_pages)
+    long_path = _pdf(pdf_path.with_name("long.pdf"), 1)
+    extractor = PdfExtractor(workers=1, max_pages=0, timeout=30)
+    try:
+        extractor.extract(long_path)  # the worker imports this module on its first range
+        extractor.timeout = 1.3
+        # one worker: the 3-range paper waits ~0.8s for the long page, then runs for ~0.6s
+        first, second = _extract_concurrently(extractor, long_path, pdf_path)
+    finally:
+        extractor.close()
+    assert not first.timed_out and not second.timed_out
+    assert second.pages == second.total_pages
+
+
+def test_stuck_paper_does_not_break_other_extractions(pdf_path, monkeypatch):
+    monkeypatch.setattr(pdf_extractor, "_extract_pages", slow_pages)
+    stuck_path = _pdf(pdf_path.with_name("stuck.pdf"), PAGES_PER_CHUNK * 3)
+    # generous: the timeout also covers starting the fresh pool's processes
+    extractor = PdfExtractor(workers=2, max_pages=0, timeout=4)
+    try:
+        # the stuck paper holds both workers until it times out; the other paper then runs in a fresh pool
+        stuck, result = _extract_concurrently(extractor, stuck_path, pdf_path)
+        retired = set(extractor._retired)
+    finally:
+        extractor.close()
+    assert stuck.timed_out and stuck.pages == 0
+    assert not result.timed_out and result.pages == result.total_pages
+    assert not retired  # the old pool was terminated as soon as nothing else ran in it
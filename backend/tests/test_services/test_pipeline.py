@@ -0,0 +1,57 @@
+"""
+Unit tests for the staged ingest pipeline.
+"""
+import threading
+
+from app.services.pipeline import Stage, StagedPipeline
+
+
+def test_items_flow_through_all_stages():
+    stored = []
+    completed = []
+
+    pipeline = StagedPipeline(
+        [
+            Stage("double", lambda x: x * 2, workers=3, queue_size=2),
+            Stage("skip_odd_input", lambda x: None if x % 4 else x, workers=2, queue_size=2),
+            Stage("store", lambda x: stored.append(x) or True, workers=1, queue_size=1),
+        ],
+        on_complete=completed.append,
+    )
+    stats = pipeline.run((str(i), i) for i in range(20))
+
+    assert sorted(stored) == [i * 2 for i in range(20) if (i * 2) % 4 == 0]
+    assert sorted(completed, key=int) == [str(i) for i in range(20)]
+    assert [s.name for s in stats] == ["double", "skip_odd_input", "store"]
+    assert stats[0].processed == 20
+    assert stats[1].dropped == 10
+    assert stats[2].processed == 10
+    assert all(s.max_depth <= s.queue_size for s in stats)
+
+
+def test_failures_are_isolated_per_item():
+    errors = []
+    lock = threading.Lock()
+
+    def flaky(x):
+        if x == 3:
+            raise RuntimeError("boom")
+        return x
+
+    def record_error(key, stage, exc):
+        with lock:
+            errors.append((key, stage, str(exc)))
+
+    results = []
+    pipeline = StagedPipeline(
+        [
+            Stage("flaky", flaky, workers=2),
+            Stage("collect", lambda x: results.append(x) or True),
+        ],
+        on_error=record_error,
+    )
+    stats = pipeline.run((str(i), i) for i in range(6))
+
+    assert errors == [("3", "flaky", "boom")]
+    assert sorted(results) == [0, 1, 2, 4, 5]
+    assert stats[0].failed == 1
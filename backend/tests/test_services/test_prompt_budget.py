@@ -0,0 +1,33 @@
+"""
+Unit tests for token-budgeted prompt section selection.
+"""
+from app.services.prompt_budget import estimate_tokens, section_priority, select_sections
+from app.services.types import Section
+
+
+def _section(heading: str, tokens: int) -> Section:
+    return Section(heading=heading, content="word " * (tokens * 4 // 5))
+
+
+def test_priorities_follow_paper_structure():
+    headings = ["1 Introduction", "3 Method", "4 Experiments", "5 Results", "6 Conclusion"]
+    assert [section_priority(h) for h in headings] == sorted(section_priority(h) for h in headings)
+    assert section_priority("2 Related Work on Language Models") > section_priority("Extracted")
+    assert section_priority("Appendix A: Model details") > section_priority("2 Related Work")
+
+
+def test_experiments_survive_beyond_twelfth_section():
+    sections = [_section(f"2.{i} Related Work", 300) for i in range(12)]
+    sections += [_section("1 Introduction", 300), _section("4 Experiments", 300)]
+    selection = select_sections(sections, budget=800)
+    kept = [item.heading for item in selection.chosen]
+    assert "4 Experiments" in kept and "1 Introduction" in kept
+    assert selection.tokens <= 800
+    assert len(selection.dropped) + len(selection.chosen) == len(sections)
+
+
+def test_oversized_pdf_text_is_truncated_to_budget():
+    raw_text = "A sentence about results. " * 20_000
+    selection = select_sections([], budget=1000, raw_text=raw_text)
+    assert len(selection.chosen) == 1 and selection.chosen[0].truncated
+    assert estimate_tokens(selection.texts[0]) <= 1000
@@ -0,0 +1,65 @@
+"""
+Unit tests for the per-host rate limiter and retry helpers.
+"""
+import time
+
+import httpx
+import pytest
+
+from app.services import rate_limit
+from app.services.rate_limit import RateLimiter, TokenBucket, call_with_retry, parse_retry_after
+
+
+def test_token_bucket_spaces_out_requests():
+    bucket = TokenBucket(rate=10, capacity=1)
+    assert bucket.reserve() == 0.0
+    # the second and third callers queue behind the first
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.02)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.02)
+
+
+def test_unlisted_hosts_are_not_throttled():
+    limiter = RateLimiter({"arxiv.org": 1})
+    for _ in range(5):
+        limiter.acquire("https://example.com/a")
+    assert limiter.stats["example.com"].throttled == 0
+    limiter.acquire("https://arxiv.org/html/1")
+    limiter._reserve("https://arxiv.org/html/2")
+    assert limiter.stats["arxiv.org"].throttled == 1
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_call_with_retry_honours_retry_after(monkeypatch):
+    limiter = RateLimiter({})
+    monkeypatch.setattr(rate_limit, "get_rate_limiter", lambda: limiter)
+    sleeps = []
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+    responses = iter(
+        [
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(503),
+            httpx.Response(200, text="ok"),
+        ]
+    )
+
+    result = call_with_retry(lambda: next(responses), "https://export.arxiv.org/api/query", max_attempts=4)
+
+    assert result.status_code == 200
+    assert sleeps[0] == 2.0
+    assert len(sleeps) == 2
+    stats = limiter.stats["export.arxiv.org"]
+    assert stats.retried == 2
+    assert stats.rate_limited == 1
+
+
+def test_call_with_retry_returns_last_response_when_exhausted(monkeypatch):
+    monkeypatch.setattr(rate_limit, "get_rate_limiter", lambda: RateLimiter({}))
+    monkeypatch.setattr(time, "sleep", lambda _: None)
+    result = call_with_retry(lambda: httpx.Response(500), "https://arxiv.org/pdf/1", max_attempts=2)
+    assert result.status_code == 500
@@ -0,0 +1,72 @@
+"""
+Unit tests for local triage scoring and tier selection.
+"""
+import pytest
+
+from app.services.llm_client import NO_SECTIONS_NOTE, build_prompt
+from app.services.triage import TIER_FULL, TIER_LITE, TriagePolicy, triage_score
+from app.services.types import ArxivPaper, Section
+
+
+def _paper(arxiv_id, abstract="We study a task.", institutions=(), categories=("cs.CL",)):
+    return ArxivPaper(
+        arxiv_id=arxiv_id,
+        title=f"Paper {arxiv_id}",
+        authors=["A"],
+        institutions=list(institutions),
+        abstract=abstract,
+        published_at=None,
+        categories=list(categories),
+        sections=[Section(heading="1 Introduction", content="Intro text. " * 200)],
+        raw_html=None,
+        raw_text=None,
+        source="test",
+    )
+
+
+def test_score_combines_institution_abstract_and_category_signals():
+    strong = triage_score(
+        _paper(
+            "2401.00001",
+            abstract="We propose a novel method that outperforms the state of the art by 12.5%.",
+            institutions=["Google DeepMind, London"],
+        )
+    )
+    weak = triage_score(_paper("2401.00002", abstract="A survey of methods.", categories=("math.OC",)))
+    assert strong.score == pytest.approx(0.85)
+    assert strong.reasons[0] == "institution:google deepmind"
+    assert {"sota", "quantified", "novelty"} <= set(strong.reasons)
+    assert weak.score == 0.0
+
+
+def test_top_k_caps_full_tier_and_cutoff_is_a_floor():
+    papers = [
+        _paper("2401.00001", abstract="We outperform prior work by 3 points.", institutions=["OpenAI"]),
+        _paper("2401.00002", abstract="We propose a new loss and outperform baselines."),
+        _paper("2401.00003", institutions=["Anthropic"]),
+        _paper("2401.00004"),
+    ]
+    policy = TriagePolicy(cutoff=0.3, top_k=2)
+    with pytest.raises(RuntimeError):
+        policy.tier(papers[0])
+    tiers = policy.rank(papers)
+    assert tiers == {
+        "2401.00001": TIER_FULL,
+        "2401.00002": TIER_LITE,
+        "2401.00003": TIER_FULL,
+        "2401.00004": TIER_LITE,
+    }
+    assert policy.summary() == "full=2 lite=2 cutoff=0.30 top_k=2"
+
+    streaming = TriagePolicy(cutoff=0.3, top_k=0)
+    assert [streaming.tier(paper) for paper in papers] == [TIER_FULL, TIER_FULL, TIER_FULL, TIER_LITE]
+
+
+def test_lite_prompt_sends_abstract_only():
+    paper = _paper("2401.00001")
+    full = build_prompt(paper)
+    lite = build_prompt(paper, tier=TIER_LITE)
+    assert "Intro text." in full
+    assert "Intro text." not in lite and NO_SECTIONS_NOTE in lite
+    assert paper.abstract in lite
+    assert len(lite) < len(full) / 2
@@ -0,0 +1,76 @@
+"""
+Unit tests for the hashed paper vectors and the memory-mapped vector index.
+"""
+import threading
+
+import numpy as np
+
+from app.services.vector_index import VectorIndex, embed
+
+SPARSE = "Sparse attention for long-context transformers. 稀疏注意力让长文本推理提速 3 倍。"
+SPARSE_TOO = "Block-sparse attention kernels speed up long-context inference. 长文本推理的稀疏注意力。"
+DIFFUSION = "Video diffusion models generate coherent clips. 视频扩散模型生成连贯片段。"
+
+
+def test_embeddings_are_deterministic_and_topical():
+    first = embed(SPARSE, dim=256)
+    assert first.dtype == np.float32 and np.isclose(np.linalg.norm(first), 1.0)
+    assert np.array_equal(first, embed(SPARSE, dim=256))  # stable hashing, not the salted hash()
+    assert float(first @ embed(SPARSE_TOO, dim=256)) > float(first @ embed(DIFFUSION, dim=256)) + 0.2
+    assert float(embed("稀疏注意力", dim=256) @ first) > 0.3
+    assert not embed("the of and", dim=256).any()
+
+
+def test_index_appends_replaces_and_rebuilds(tmp_path):
+    writer = VectorIndex(tmp_path, dim=64)
+    reader = VectorIndex(tmp_path, dim=64)  # another API worker mapping the same file
+    assert reader.nearest(embed(SPARSE, dim=64), 5) == []
+
+    for paper_id, text in [(1, SPARSE), (2, SPARSE_TOO), (3, DIFFUSION)]:
+        writer.add(paper_id, embed(text, dim=64))
+    query = embed(SPARSE, dim=64)
+    assert [paper_id for paper_id, _ in reader.nearest(query, 3, exclude=[1])][0] == 2
+
+    # a paper stored again: the newer record wins, the old one is never returned
+    writer.add(2, embed(DIFFUSION, dim=64))
+    assert len(reader) == 3
+    assert np.allclose(reader.vector(2), embed(DIFFUSION, dim=64))
+    assert [paper_id for paper_id, _ in reader.nearest(embed(DIFFUSION, dim=64), 3)][:2] in ([2, 3], [3, 2])
+
+    # a record still being written is ignored until complete
+    with open(writer.path, "ab") as handle:
+        handle.write(b"\0" * 10)
+    assert len(reader) == 3
+
+    assert writer.rebuild([(7, query)]) == 1
+    assert [paper_id for paper_id, _ in reader.nearest(query, 5)] == [7]
+    assert reader.vector(2) is None
+
+
+def test_append_during_rebuild_waits_and_lands_in_the_new_file(tmp_path):
+    ingest = VectorIndex(tmp_path, dim=64)
+    rebuilder = VectorIndex(tmp_path, dim=64)  # build_vector_index.py, a separate writer
+    ingest.add(1, embed(SPARSE, dim=64))
+    reading, added = threading.Event(), threading.Event()
+    blocked = []
+
+    def papers():
+        yield 1, embed(SPARSE, dim=64)
+        reading.set()
+        blocked.append(not added.wait(0.5))
+
+    def store():
+        ingest.add(2, embed(DIFFUSION, dim=64))
+        added.set()
+
+    rebuild = threading.Thread(target=rebuilder.rebuild, args=(papers(),))
+    rebuild.start()
+    assert reading.wait(5)
+    append = threading.Thread(target=store)
+    append.start()
+    rebuild.join(5)
+    append.join(5)
+
+    assert blocked == [True]
+    reader = VectorIndex(tmp_path, dim=64)
+    assert len(reader) == 2 and np.allclose(reader.vector(2), embed(DIFFUSION, dim=64))
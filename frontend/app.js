@@ -18,6 +18,15 @@ async function fetchJSON(path) {
   return response.json();
 }
 
+// /papers is keyset-paginated: X-Next-Cursor is only present when another page follows
+async function fetchPage(path) {
+  const response = await fetch(`${API_BASE}${path}`);
+  if (!response.ok) {
+    throw new Error(`Request failed: ${response.status}`);
+  }
+  return { items: await response.json(), nextCursor: response.headers.get('X-Next-Cursor') };
+}
+
 const datePicker = document.getElementById('date-picker');
 const prevButton = document.getElementById('prev-day');
 const nextButton = document.getElementById('next-day');
@@ -29,12 +38,15 @@ const calendarGrid = document.getElementById('calendar-grid');
 const calendarMonthYear = document.getElementById('calendar-month-year');
 const calendarPrevMonth = document.getElementById('calendar-prev-month');
 const calendarNextMonth = document.getElementById('calendar-next-month');
+const loadMoreButton = document.getElementById('load-more');
 
 let currentDate = null; // YYYY-MM-DD
 let availableDates = [];
 let calendarVisible = false;
 let calendarYear = new Date().getFullYear();
 let calendarMonth = new Date().getMonth(); // 0-11
+let nextCursor = null; // cursor for the page after the papers shown
+let dashboardRequest = 0; // drops pages that arrive after the date changed
 
 function toISODate(date) {
   return date.toISOString().slice(0, 10);
@@ -45,10 +57,11 @@ function getTodayISO() {
   return toISODate(now);
 }
 
-function buildPaperQuery({ limit = 12, breakthroughOnly = false, targetDate }) {
+function buildPaperQuery({ limit = 12, breakthroughOnly = false, targetDate, cursor }) {
   const params = new URLSearchParams({ limit: String(limit) });
   if (breakthroughOnly) params.set('breakthrough_only', 'true');
   if (targetDate) params.set('target_date', normalizeDateString(targetDate));
+  if (cursor) params.set('cursor', cursor);
   return `/papers?${params.toString()}`;
 }
 
@@ -102,11 +115,13 @@ function renderPaper(paper) {
   return card;
 }
 
-function populatePaperLists(papers) {
+function populatePaperLists(papers, append = false) {
   const paperContainer = document.getElementById('papers-list');
-  paperContainer.textContent = '';
+  if (!append) {
+    paperContainer.textContent = '';
+  }
 
-  if (papers.length === 0) {
+  if (papers.length === 0 && !append) {
     const empty = document.createElement('p');
     empty.className = 'meta';
     empty.textContent = '该日期暂无论文摘要。';
@@ -153,13 +168,25 @@ function renderKeywordStats(stats) {
   });
 }
 
+function setNextCursor(cursor) {
+  nextCursor = cursor;
+  if (loadMoreButton) {
+    loadMoreButton.hidden = !cursor;
+    loadMoreButton.disabled = false;
+  }
+}
+
 async function loadDashboard() {
+  const request = ++dashboardRequest;
+  setNextCursor(null);
   try {
-    const [papers, keywordStats] = await Promise.all([
-      fetchJSON(buildPaperQuery({ limit: 12, targetDate: currentDate || undefined })),
+    const [page, keywordStats] = await Promise.all([
+      fetchPage(buildPaperQuery({ limit: 12, targetDate: currentDate || undefined })),
       fetchJSON('/keywords/stats'),
     ]);
-    populatePaperLists(papers);
+    if (request !== dashboardRequest) return;
+    populatePaperLists(page.items);
+    setNextCursor(page.nextCursor);
     renderKeywordStats(keywordStats);
     updateNavigationState();
   } catch (error) {
@@ -167,6 +194,23 @@ async function loadDashboard() {
   }
 }
 
+async function loadMorePapers() {
+  if (!nextCursor) return;
+  const request = dashboardRequest;
+  loadMoreButton.disabled = true;
+  try {
+    const page = await fetchPage(
+      buildPaperQuery({ limit: 12, targetDate: currentDate || undefined, cursor: nextCursor }),
+    );
+    if (request !== dashboardRequest) return;
+    populatePaperLists(page.items, true);
+    setNextCursor(page.nextCursor);
+  } catch (error) {
+    console.error('Failed to load more papers', error);
+    loadMoreButton.disabled = false;
+  }
+}
+
 function initSubscriptionForm() {
   const form = document.getElementById('subscribe-form');
   const feedback = document.getElementById('subscribe-feedback');
@@ -443,6 +487,9 @@ function initControls() {
       shiftDate(-1);
     });
   }
+  if (loadMoreButton) {
+    loadMoreButton.addEventListener('click', loadMorePapers);
+  }
   if (todayButton) {
     todayButton.addEventListener('click', () => {
       if (availableDates.length) {